@@ -1,7 +1,12 @@
 # app/api/routes/analytics.py
-from fastapi import APIRouter
-from typing import Dict, Any
+import asyncio
+from fastapi import APIRouter, Query
+from typing import Dict, Any, Optional
 from datetime import datetime
+from app.services.ai_service import ai_service
+from app.services.prompt_compiler import prompt_registry
+from app.middleware import prazo_middleware
+from app.core.config import settings
 
 router = APIRouter(prefix="/analytics")  # ← ADICIONAR ESTA LINHA
 
@@ -48,4 +53,119 @@ async def get_analytics_status():
         "versao": "1.0.0",
         "banco_dados": "mock_data",
         "ultima_coleta": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
+
+@router.get("/cache-ia")
+async def get_cache_ia_stats():
+    """Hit/miss do cache de respostas da IA e estado do Redis"""
+    return {
+        **ai_service.estatisticas_cache(),
+        "single_flight": ai_service.single_flight.stats,
+        "redis": await ai_service.cache.get_cache_stats(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/provedor-ia")
+async def get_provedor_ia_stats():
+    """Concorrência adaptativa, retentativas, uso de RPM/TPM por modelo e utilização por chave de API"""
+    return {
+        **ai_service.gateway.estatisticas(),
+        "pool_chaves": ai_service.provedor.estatisticas_chaves(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/fila")
+async def get_fila_stats():
+    """Profundidade da fila e tempo de espera por vaga do provedor, por escritório e classe"""
+    return {
+        **ai_service.gateway.limitador.fila.estatisticas(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/roteamento")
+async def get_roteamento_stats():
+    """Decisões do roteador de modelos e resultados (latência, tokens, custo) por método/modelo"""
+    return {
+        **ai_service.roteador.estatisticas(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/hedging")
+async def get_hedging_stats():
+    """Taxa de hedge, vitórias (original x hedge) e custo extra estimado"""
+    return {
+        **ai_service.resiliencia.hedge.estatisticas(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/telemetria")
+async def get_telemetria(janela: Optional[float] = Query(None, gt=0, description="Janela em segundos (padrão TELEMETRIA_JANELA_SEGUNDOS)")):
+    """p50/p95/p99 de fila, primeiro token, latência, tokens e tokens/s por método"""
+    return {
+        **ai_service.telemetria.resumo(janela),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/similares")
+async def get_similares_stats():
+    """Índice de perguntas similares: itens, reaproveitamentos e latência da busca"""
+    return {
+        **ai_service.similares.estatisticas(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/sessoes")
+async def get_sessoes_stats():
+    """Sessões de consulta: turnos, compactações em resumo e turnos cortados pelo orçamento"""
+    return {
+        **ai_service.sessoes.stats,
+        "orcamento_tokens": settings.sessao_orcamento_tokens,
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/saida")
+async def get_saida_stats():
+    """Distribuição do tamanho das respostas, max_tokens dinâmico e latência economizada pela parada antecipada"""
+    return {
+        **ai_service.saida.estatisticas(),
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/prazos")
+async def get_prazos_stats():
+    """Requisições canceladas por desconexão ou prazo e max_tokens reduzidos pelo prazo"""
+    return {
+        "requisicoes": prazo_middleware.stats,
+        "ia": ai_service.resiliencia.prazo_stats,
+        "prazos_endpoint": settings.prazo_endpoints,
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/consumo")
+async def get_consumo_ia(
+    firm_name: Optional[str] = None,
+    periodo: str = Query("mes", pattern="^(dia|mes)$"),
+    historico_dias: int = Query(0, ge=0, le=366, description="Dias de histórico gravado no Postgres")
+):
+    """Tokens, chamadas e custo por escritório/endpoint/modelo, com orçamento e consumo do período"""
+    resultado = await ai_service.medidor.consumo(firm_name, periodo)
+    if historico_dias:
+        try:
+            resultado["historico"] = await asyncio.to_thread(ai_service.medidor.historico, historico_dias, firm_name)
+        except Exception as e:
+            resultado["historico_erro"] = str(e)
+    return {
+        **resultado,
+        "medicao": ai_service.medidor.stats,
+        "ultima_coleta": datetime.now().isoformat()
+    }
+
+@router.get("/prompts")
+async def get_prompt_tokens():
+    """Tokens estáticos por template de prompt compilado e por seção"""
+    relatorio = prompt_registry.relatorio_tokens()
+    return {
+        "templates": relatorio,
+        "total_templates": len(relatorio),
+        "ultima_coleta": datetime.now().isoformat()
+    }
@@ -2,10 +2,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import datetime
 from app.core.database import get_db
 from app.core.dependencies import get_ai_service
 from app.schemas.consulta import ConsultaCreate, ConsultaResponse
-from app.models.consulta import Consulta
+from app.models.consulta import Consulta, AreaJuridica
 from app.services.ai_service import AIService
 
 router = APIRouter()
@@ -18,17 +19,25 @@ async def criar_consulta(
 ):
     """Criar uma nova consulta jurídica"""
     try:
-        # Fazer consulta com IA
+        area_juridica = AreaJuridica(consulta.area)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Área jurídica inválida: {consulta.area}"
+        )
+    
+    try:
+        # Fazer consulta com IA (perguntas similares já respondidas não chamam o provedor)
         resultado_ia = await ai_service.fazer_consulta_juridica(
             consulta.pergunta, 
-            consulta.area_juridica.value
+            area_juridica.value
         )
         
         # Salvar no banco
         db_consulta = Consulta(
             pergunta=consulta.pergunta,
             resposta=resultado_ia.get("resposta", ""),
-            area_juridica=consulta.area_juridica,
+            area_juridica=area_juridica,
             tempo_resposta=resultado_ia.get("tokens_usados", 0)
         )
         
@@ -36,7 +45,21 @@ async def criar_consulta(
         db.commit()
         db.refresh(db_consulta)
         
-        return db_consulta
+        if resultado_ia.get("status") == "sucesso":
+            # Índice de similares passa a apontar para a linha salva
+            ai_service.similares.adicionar(
+                area_juridica.value, None, db_consulta.pergunta, db_consulta.resposta,
+                db_consulta.id, resultado_ia.get("modelo")
+            )
+        
+        return ConsultaResponse(
+            id=db_consulta.id,
+            pergunta=db_consulta.pergunta,
+            resposta=db_consulta.resposta,
+            area=area_juridica.value,
+            timestamp=db_consulta.created_at or datetime.now(),
+            similaridade=resultado_ia.get("similaridade")
+        )
         
     except Exception as e:
         db.rollback()
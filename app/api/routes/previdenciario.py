@@ -2,20 +2,50 @@
 # app/api/routes/previdenciario.py - VERSÃO COMPLETA
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from app.modules.previdenciario.schemas import DadosPrevidenciarios, PeticaoPrevidenciaria
+from app.modules.previdenciario.schemas import DadosPrevidenciarios, PeticaoPrevidenciaria, PedidoPeticoesMultiplas
 from app.modules.previdenciario.service import PrevidenciarioService
 from app.core.ethics import EthicsService
 from app.services.pdf_service import PDFService
+from app.utils.sse import resposta_sse
 import io
 from datetime import date
 
 router = APIRouter()
 previdenciario_service = PrevidenciarioService()
 
+def _resposta_stream(tipo: str, dados: DadosPrevidenciarios):
+    """Petição em SSE: tokens já com placeholders preenchidos; o evento final traz os mesmos metadados da rota normal"""
+    eventos = previdenciario_service.gerar_peticao_stream(tipo, dados)
+    return resposta_sse(eventos, EthicsService.add_ethics_metadata({
+        "tipo": f"peticao_{tipo}",
+        "area": "previdenciario",
+        "dados_utilizados": dados.dict()
+    }))
+
+async def _resposta_modelo_padrao(tipo: str, dados: DadosPrevidenciarios, refinar: bool):
+    """Petição pelo modelo padrão versionado (sem IA; com refinar, a IA revisa a redação)"""
+    try:
+        resultado = await previdenciario_service.gerar_peticao_modelo_padrao(tipo, dados, refinar)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return EthicsService.add_ethics_metadata({
+        "tipo": f"peticao_{tipo}",
+        "area": "previdenciario",
+        "texto_peticao": resultado["peticao"],
+        "modelo_padrao": resultado["modelo_padrao"],
+        "refinada": resultado["refinada"],
+        "dados_utilizados": dados.dict()
+    })
+
 # ENDPOINTS JÁ EXISTENTES
 @router.post("/peticao-aposentadoria-invalidez")
-async def gerar_peticao_aposentadoria_invalidez(dados: DadosPrevidenciarios):
+async def gerar_peticao_aposentadoria_invalidez(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para aposentadoria por invalidez"""
+    if stream:
+        return _resposta_stream("aposentadoria_invalidez", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_aposentadoria_invalidez(dados)
         response = {
@@ -29,8 +59,13 @@ async def gerar_peticao_aposentadoria_invalidez(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-revisao-vida-toda")
-async def gerar_peticao_revisao_vida_toda(dados: DadosPrevidenciarios):
+async def gerar_peticao_revisao_vida_toda(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para Revisão da Vida Toda"""
+    if stream:
+        return _resposta_stream("revisao_vida_toda", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_revisao_vida_toda(dados)
         response = {
@@ -44,8 +79,13 @@ async def gerar_peticao_revisao_vida_toda(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-aposentadoria-tempo-contribuicao")
-async def gerar_peticao_aposentadoria_tempo_contribuicao(dados: DadosPrevidenciarios):
+async def gerar_peticao_aposentadoria_tempo_contribuicao(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para aposentadoria por tempo de contribuição"""
+    if stream:
+        return _resposta_stream("aposentadoria_tempo_contribuicao", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_aposentadoria_tempo_contribuicao(dados)
         response = {
@@ -59,8 +99,17 @@ async def gerar_peticao_aposentadoria_tempo_contribuicao(dados: DadosPrevidencia
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-auxilio-doenca")
-async def gerar_peticao_auxilio_doenca(dados: DadosPrevidenciarios):
+async def gerar_peticao_auxilio_doenca(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events"),
+    modelo_padrao: bool = Query(False, description="Monta a petição pelo modelo padrão versionado, sem IA"),
+    refinar: bool = Query(False, description="Com modelo_padrao: a IA revisa a redação do texto montado")
+):
     """Gera petição para auxílio-doença"""
+    if modelo_padrao:
+        return await _resposta_modelo_padrao("auxilio_doenca", dados, refinar)
+    if stream:
+        return _resposta_stream("auxilio_doenca", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_auxilio_doenca(dados)
         response = {
@@ -74,8 +123,13 @@ async def gerar_peticao_auxilio_doenca(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-pensao-morte")
-async def gerar_peticao_pensao_morte(dados: DadosPrevidenciarios):
+async def gerar_peticao_pensao_morte(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para pensão por morte"""
+    if stream:
+        return _resposta_stream("pensao_morte", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_pensao_morte(dados)
         response = {
@@ -89,8 +143,13 @@ async def gerar_peticao_pensao_morte(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-aposentadoria-especial")
-async def gerar_peticao_aposentadoria_especial(dados: DadosPrevidenciarios):
+async def gerar_peticao_aposentadoria_especial(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para aposentadoria especial"""
+    if stream:
+        return _resposta_stream("aposentadoria_especial", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_aposentadoria_especial(dados)
         response = {
@@ -104,8 +163,17 @@ async def gerar_peticao_aposentadoria_especial(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-bpc-loas")
-async def gerar_peticao_bpc_loas(dados: DadosPrevidenciarios):
+async def gerar_peticao_bpc_loas(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events"),
+    modelo_padrao: bool = Query(False, description="Monta a petição pelo modelo padrão versionado, sem IA"),
+    refinar: bool = Query(False, description="Com modelo_padrao: a IA revisa a redação do texto montado")
+):
     """Gera petição para BPC-LOAS"""
+    if modelo_padrao:
+        return await _resposta_modelo_padrao("bpc_loas", dados, refinar)
+    if stream:
+        return _resposta_stream("bpc_loas", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_bpc_loas(dados)
         response = {
@@ -119,8 +187,13 @@ async def gerar_peticao_bpc_loas(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-aposentadoria-rural")
-async def gerar_peticao_aposentadoria_rural(dados: DadosPrevidenciarios):
+async def gerar_peticao_aposentadoria_rural(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para aposentadoria híbrida/rural"""
+    if stream:
+        return _resposta_stream("aposentadoria_rural", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_aposentadoria_rural(dados)
         response = {
@@ -134,8 +207,17 @@ async def gerar_peticao_aposentadoria_rural(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-salario-maternidade")
-async def gerar_peticao_salario_maternidade(dados: DadosPrevidenciarios):
+async def gerar_peticao_salario_maternidade(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events"),
+    modelo_padrao: bool = Query(False, description="Monta a petição pelo modelo padrão versionado, sem IA"),
+    refinar: bool = Query(False, description="Com modelo_padrao: a IA revisa a redação do texto montado")
+):
     """Gera petição para salário-maternidade"""
+    if modelo_padrao:
+        return await _resposta_modelo_padrao("salario_maternidade", dados, refinar)
+    if stream:
+        return _resposta_stream("salario_maternidade", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_salario_maternidade(dados)
         response = {
@@ -149,8 +231,13 @@ async def gerar_peticao_salario_maternidade(dados: DadosPrevidenciarios):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/peticao-revisao-beneficio")
-async def gerar_peticao_revisao_beneficio(dados: DadosPrevidenciarios):
+async def gerar_peticao_revisao_beneficio(
+    dados: DadosPrevidenciarios,
+    stream: bool = Query(False, description="Transmite a petição via Server-Sent Events")
+):
     """Gera petição para revisão de benefício (genérica)"""
+    if stream:
+        return _resposta_stream("revisao_beneficio", dados)
     try:
         peticao = await previdenciario_service.gerar_peticao_revisao_beneficio(dados)
         response = {
@@ -163,6 +250,27 @@ async def gerar_peticao_revisao_beneficio(dados: DadosPrevidenciarios):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== VÁRIOS BENEFÍCIOS PARA O MESMO CLIENTE ====================
+@router.post("/peticoes-multiplas")
+async def gerar_peticoes_multiplas(pedido: PedidoPeticoesMultiplas):
+    """
+    Gera as petições de vários benefícios para os mesmos dados, em paralelo.
+    Server-Sent Events: um evento 'peticao' por tipo, na ordem em que ficam prontas,
+    e um evento 'fim' com os metadados éticos.
+    """
+    tipos = list(dict.fromkeys(tipo.replace("-", "_") for tipo in pedido.tipos))
+    invalidos = [tipo for tipo in tipos if tipo not in previdenciario_service.prompts]
+    if not tipos or invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipos de petição inválidos: {invalidos}" if invalidos else "Informe ao menos um tipo de petição"
+        )
+    eventos = previdenciario_service.gerar_peticoes_multiplas(tipos, pedido.dados)
+    return resposta_sse(eventos, EthicsService.add_ethics_metadata({
+        "area": "previdenciario",
+        "dados_utilizados": pedido.dados.dict()
+    }))
+
 # ENDPOINT PREMIUM COM CALCULADORA
 @router.post("/peticao-com-calculo/{tipo_peticao}")
 async def gerar_peticao_com_calculo(
@@ -1,6 +1,6 @@
 # app/core/config.py - VERSÃO atualizada
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, List, Any
 import os
 
 class Settings(BaseSettings):
@@ -11,13 +11,148 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     cache_ttl_jurisprudencia: int = 86400  # 24 horas
     cache_ttl_ai_response: int = 3600      # 1 hora
+    cache_ttl_ai_metodos: Dict[str, int] = {}  # Sobrescreve o TTL por método: {"consulta": 86400, ...}
+    redis_timeout: float = 2.0             # segundos (falha rápido se o Redis estiver fora)
+    
+    # Single-flight (coalescência de prompts idênticos em voo)
+    single_flight_lock_ttl: int = 180      # segundos; cobre a completion mais longa
+    single_flight_espera_max: float = 180.0
+    single_flight_intervalo: float = 0.25  # intervalo de polling entre workers
+    
+    # Circuit breaker por modelo
+    circuito_taxa_falhas: float = 0.5      # Fração de falhas na janela que abre o circuito
+    circuito_janela: int = 20              # Últimas N chamadas consideradas
+    circuito_minimo_chamadas: int = 5
+    circuito_latencia_limite: float = 90.0 # segundos; chamadas mais lentas contam como falha
+    circuito_tempo_aberto: float = 30.0    # segundos antes de sondar o provedor novamente
+    cache_ttl_ai_stale: int = 604800       # 7 dias: cópia antiga servida com o circuito aberto
+    
+    # Hedging (segunda chamada quando a primeira passa do percentil de latência recente)
+    hedge_ativo: bool = False
+    hedge_metodos: List[str] = ["parecer"]
+    hedge_percentil: float = 0.95
+    hedge_minimo_amostras: int = 20
+    hedge_atraso_minimo: float = 1.0       # segundos
+    hedge_taxa_maxima: float = 0.1         # no máximo 10% das chamadas com hedge
+    hedge_janela: int = 200
+    hedge_modelo_alternativo: bool = True  # hedge no próximo modelo da rota, se houver
+    
+    # Consumo por escritório e orçamentos de tokens (0 = sem limite)
+    consumo_flush_intervalo: float = 60.0  # segundos entre flushes Redis -> Postgres
+    orcamento_tokens_diario: int = 0
+    orcamento_tokens_mensal: int = 0
+    orcamentos_escritorio: Dict[str, Dict[str, int]] = {}  # {"Escritório X": {"diario": 200000, "mensal": 3000000}}
+    
+    # Fila justa das vagas do provedor (classes de prioridade + DRR por escritório)
+    fila_quantum: int = 2000               # tokens de crédito por rodada de cada escritório
+    fila_pesos_classe: Dict[str, int] = {"interativa": 4, "padrao": 2, "lote": 1}  # ordem = prioridade
+    fila_classe_metodo: Dict[str, str] = {"consulta": "interativa", "peticao": "lote", "peticao_caso": "lote", "peticao_secoes": "lote", "peticao_refino": "lote", "resumo_sessao": "lote"}
+    fila_pesos_tier: Dict[str, float] = {"basico": 1, "profissional": 1, "premium": 2}
+    
+    # Prazo por requisição (X-Timeout-Ms ou padrão do endpoint) e cancelamento na desconexão
+    prazo_endpoints: Dict[str, float] = {  # prefixo do path -> segundos
+        "/api/v1/consulta": 60.0,
+        "/api/v1/analise": 120.0,
+        "/api/v1/parecer-juridico": 120.0,
+        "/api/v1/previdenciario": 150.0
+    }
+    prazo_maximo: float = 300.0            # teto para o X-Timeout-Ms do cliente
+    prazo_folga: float = 2.0               # segundos após o prazo antes de cortar a requisição (504)
+    prazo_minimo_chamada: float = 2.0      # abaixo disso nem chama o provedor
+    prazo_fracao_geracao: float = 0.7      # fração do tempo restante reservada para gerar tokens
+    prazo_vazao_padrao: float = 40.0       # tokens/s assumidos antes de haver medições do modelo
+    prazo_min_tokens: int = 256            # max_tokens nunca cai abaixo disso
+    
+    # Reuso de respostas de consultas quase duplicadas (MinHash + LSH por área)
+    similares_ativo: bool = False          # Desligado por padrão: resposta de outra pergunta, só com limiar validado
+    similares_limiar: float = 0.7          # Jaccard mínimo dos shingles para reaproveitar a resposta
+    similares_ngrama: int = 3              # n-gramas de caracteres por palavra
+    similares_permutacoes: int = 32        # compartimentos da assinatura MinHash
+    similares_linhas_banda: int = 3        # linhas por banda LSH (menos linhas = mais candidatos)
+    similares_max_candidatos: int = 20     # candidatos verificados com Jaccard exato
+    similares_max_carga: int = 20000       # consultas carregadas do banco no início
+    
+    # Tamanho da saída: max_tokens pela distribuição observada e parada antecipada por estrutura
+    saida_min_amostras: int = 30           # respostas do método antes de sair do max_tokens fixo
+    saida_percentil: float = 0.99          # percentil da saída observada usado como teto
+    saida_folga: float = 1.15              # margem sobre o percentil
+    saida_quantum: int = 128               # teto arredondado para cima (estabiliza a chave de cache)
+    saida_min_tokens: int = 256            # teto nunca abaixo disso
+    saida_fator_resumido: float = 0.5      # X-Tamanho-Resposta: resumido → fração da saída típica
+    saida_max_truncadas: float = 0.05      # acima dessa fração de respostas no teto, volta ao fixo
+    saida_historico: int = 500             # respostas mantidas por método
+    saida_paradas: Dict[str, List[str]] = {}  # Vazio = padrões de app/services/output_policy.py
+    saida_parada_amostra: float = 0.05     # fração das chamadas que só observam (mede a cauda evitada)
+    
+    # Sessões de consulta (histórico no Redis com orçamento de tokens e resumo)
+    sessao_ttl: int = 86400                # segundos sem uso até a sessão expirar
+    sessao_orcamento_tokens: int = 2000    # histórico (resumo + turnos) enviado ao modelo por turno
+    sessao_tokens_recentes: int = 1000     # turnos recentes mantidos literais ao compactar
+    sessao_resumo_max_tokens: int = 400    # tamanho máximo do resumo das conversas antigas
+    
+    # Telemetria das chamadas à IA (GET /metrics e /api/v1/analytics/telemetria)
+    telemetria_log: bool = True            # Um evento JSON por chamada no log
+    telemetria_rotulo_escritorio: bool = True  # Escritório como rótulo no Prometheus (cardinalidade)
+    telemetria_janela_segundos: float = 900.0  # Janela do resumo p50/p95/p99
+    telemetria_max_eventos: int = 5000     # Eventos recentes mantidos em memória
+    
+    # Provedor de LLM: "openai" (API real ou compatível) ou "mock" (local, determinístico)
+    ai_provider: str = "openai"
+    mock_tokens_resposta: int = 400
+    mock_latencia_primeiro_token: float = 0.2   # segundos
+    mock_latencia_por_token: float = 0.005      # segundos
+    mock_tokens_cauda: int = 0                  # observações após a assinatura (como alguns modelos fazem)
+    
+    # Roteamento de modelos por método/área/tamanho do prompt/plano do escritório
+    roteamento_regras: List[Dict[str, Any]] = []   # Vazio = regras padrão de app/services/model_router.py
+    roteamento_timeout: float = 45.0               # segundos por modelo antes de cair para o próximo
+    roteamento_historico: int = 500                # decisões mantidas em memória
+    precos_modelos: Dict[str, Dict[str, float]] = {}  # {"gpt-4o": {"entrada": 0.0025, "saida": 0.01}} (USD/1K)
+    tenant_tiers: Dict[str, str] = {}              # {"Escritório X": "premium"}
+    tenant_tier_padrao: str = "profissional"
     
     # OpenAI
     openai_api_key: Optional[str] = None
+    openai_api_keys: List[str] = []         # Chaves extras (outras organizações); somam RPM/TPM
+    chaves_ejecao_padrao: float = 20.0      # segundos fora da rotação após 429 sem Retry-After
     openai_model: str = "gpt-4"
+    openai_base_url: Optional[str] = None   # Permite apontar para um provedor compatível/mock
+    openai_timeout: float = 120.0           # segundos
+    openai_max_connections: int = 100       # Pool HTTP compartilhado
+    openai_max_keepalive_connections: int = 20
+    
+    # Gateway do provedor (concorrência adaptativa, retentativas, RPM/TPM)
+    gateway_concorrencia_inicial: int = 16
+    gateway_concorrencia_min: int = 1
+    gateway_concorrencia_max: int = 64
+    gateway_latencia_limite: float = 60.0   # segundos; acima disso a concorrência é reduzida
+    gateway_max_tentativas: int = 4
+    gateway_backoff_base: float = 0.5       # segundos (dobra a cada tentativa, com jitter)
+    gateway_backoff_max: float = 30.0
+    gateway_limites_modelo: Dict[str, Dict[str, int]] = {}  # Por chave de API: {"gpt-4": {"rpm": 500, "tpm": 300000}}
+    
+    # Análise de documentos longos (map-reduce por trechos)
+    analise_limite_tokens: int = 6000       # Acima disso o documento é dividido em trechos
+    analise_chunk_max_tokens: int = 2500    # Tamanho máximo de cada trecho
+    analise_chunks_concorrencia: int = 4    # Trechos analisados em paralelo por documento
+    
+    # Petições previdenciárias em streaming (?stream=true): pós-processamento incremental
+    peticao_stream_janela: int = 192        # caracteres retidos no fim do buffer (maior placeholder/assinatura)
+    
+    # Seções fixas das petições previdenciárias (direito, jurisprudência, pedidos) geradas uma vez por tipo
+    secoes_cache_ativo: bool = True
+    secoes_cache_ttl: int = 2592000         # 30 dias na memória e no Redis
+    secoes_banco_validade: int = 7776000    # 90 dias: linha mais antiga no Postgres é gerada de novo
+    secoes_falha_espera: int = 600          # Geração que falhou só é tentada de novo depois disso (s)
+    secoes_caso_max_tokens: int = 900       # Teto da chamada que redige só qualificação e fatos
+    
+    # Várias petições para o mesmo cliente (/previdenciario/peticoes-multiplas)
+    peticoes_multiplas_concorrencia: int = 3  # Petições geradas em paralelo por requisição
     
     # Application
     debug: bool = True
+    static_dir: str = "static"
+    pdf_output_dir: str = "static/pdfs"
 
     class Config:
         env_file = ".env"
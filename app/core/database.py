@@ -20,4 +20,20 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dialetos com INSERT ... ON CONFLICT (upsert do consumo e das seções de petição)
+DIALETOS_UPSERT = ("postgresql", "sqlite")
+
+def suporta_upsert() -> bool:
+    return engine.dialect.name in DIALETOS_UPSERT
+
+def insert_upsert(tabela):
+    """INSERT com on_conflict_do_update do dialeto do engine (PostgreSQL ou SQLite)"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upsert não suportado no dialeto {engine.dialect.name}")
+    return insert(tabela)
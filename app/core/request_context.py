@@ -0,0 +1,28 @@
+# app/core/request_context.py - CONTEXTO DA REQUISIÇÃO PARA OS SERVIÇOS DE IA
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Definido pelo AIContextMiddleware a partir dos headers da requisição e lido
+# pelo AIService sem precisar repassar parâmetros por todos os módulos
+ignorar_cache: ContextVar[bool] = ContextVar("ignorar_cache", default=False)
+
+# Tamanho de resposta pedido no header X-Tamanho-Resposta: "completo" ou "resumido"
+tamanho_resposta: ContextVar[str] = ContextVar("tamanho_resposta", default="completo")
+
+# Path HTTP que originou as chamadas à IA (telemetria)
+endpoint_http: ContextVar[Optional[str]] = ContextVar("endpoint_http", default=None)
+
+# Prazo da requisição (time.monotonic() absoluto) definido pelo PrazoMiddleware
+# a partir do header X-Timeout-Ms ou do padrão do endpoint; None = sem prazo
+prazo: ContextVar[Optional[float]] = ContextVar("prazo", default=None)
+
+
+class PrazoEsgotado(Exception):
+    """O prazo da requisição acabou (ou não cabe mais uma chamada ao provedor)"""
+
+
+def tempo_restante() -> Optional[float]:
+    """Segundos até o prazo da requisição (negativo se já passou) ou None sem prazo"""
+    limite = prazo.get()
+    return None if limite is None else limite - time.monotonic()
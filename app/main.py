@@ -1,9 +1,11 @@
 # app/main.py → VERSÃO FINAL OFICIAL (produção + dev)
-from fastapi import FastAPI
+from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from typing import Optional
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 from dotenv import load_dotenv
@@ -12,23 +14,41 @@ load_dotenv()
 
 # Importar serviços e rotas
 from app.services.ai_service import ai_service
+from app.core.config import settings
 from app.api.routes import (
     calculadora, peticoes, consultas, analytics,
     trabalhista, consumidor, previdenciario, civil, processual_civil
 )
 from app.middleware.ethics_middleware import EthicsMiddleware
+from app.middleware.ai_context_middleware import AIContextMiddleware
+from app.middleware.prazo_middleware import PrazoMiddleware
+from app.utils.sse import resposta_sse
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pool HTTP do provedor de IA criado uma única vez por worker
+    await ai_service.iniciar()
+    yield
+    await ai_service.encerrar()
 
 app = FastAPI(
     title="TamarUSE API",
     description="Soluções inteligentes para automação jurídica com IA",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Middleware ético
 app.add_middleware(EthicsMiddleware)
 
+# Headers de controle da IA (ex.: X-Cache-Bypass)
+app.add_middleware(AIContextMiddleware)
+
+# Prazo por requisição (X-Timeout-Ms) e cancelamento quando o cliente desconecta
+app.add_middleware(PrazoMiddleware)
+
 # ========== CORS CONFIGURATION (AQUI ESTÁ O QUE IMPORTA) ==========
 # Detecta automaticamente se está em desenvolvimento
 IS_DEV = os.getenv("ENVIRONMENT") == "development" or not os.getenv("RAILWAY_ENVIRONMENT")
@@ -74,6 +94,11 @@ class ConsultaRequest(BaseModel):
     lawyer_name: Optional[str] = None
     signature_text: Optional[str] = None
     ai_persona: Optional[str] = None
+    sessao_id: Optional[str] = None  # continua uma sessão aberta em /api/v1/consulta/sessoes
+
+class SessaoRequest(BaseModel):
+    area: str = "geral"
+    firm_name: Optional[str] = None
 
 class AnaliseRequest(BaseModel):
     texto: str
@@ -98,24 +123,83 @@ class RelatorioRequest(BaseModel):
 async def root():
     return {"message": "TamarUSE API rodando!", "version": "2.0.0", "docs": "/docs"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Histogramas das chamadas à IA no formato texto do Prometheus"""
+    return PlainTextResponse(ai_service.telemetria.prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "2.0.0"}
+    circuitos = ai_service.resiliencia.estado_circuitos()
+    # Com algum circuito aberto a API responde, mas em modo degradado
+    status = "degraded" if any(c["estado"] != "fechado" for c in circuitos.values()) else "healthy"
+    return {"status": status, "version": "2.0.0", "circuitos_ia": circuitos}
 
 # Rotas de IA
 @app.post("/api/v1/consulta")
-async def fazer_consulta(request: ConsultaRequest):
+async def fazer_consulta(
+    request: ConsultaRequest,
+    stream: bool = Query(False, description="Transmite os tokens via Server-Sent Events")
+):
+    if stream:
+        eventos = ai_service.fazer_consulta_juridica_stream(
+            request.pergunta, request.area,
+            firm_name=request.firm_name,
+            lawyer_name=request.lawyer_name,
+            signature_text=request.signature_text,
+            ai_persona=request.ai_persona,
+            sessao_id=request.sessao_id
+        )
+        return resposta_sse(eventos, {"pergunta": request.pergunta, "escritorio": request.firm_name or "LawClerk AI"})
+    
     resultado = await ai_service.fazer_consulta_juridica(
         request.pergunta, request.area,
         firm_name=request.firm_name,
         lawyer_name=request.lawyer_name,
         signature_text=request.signature_text,
-        ai_persona=request.ai_persona
+        ai_persona=request.ai_persona,
+        sessao_id=request.sessao_id
     )
     return {"pergunta": request.pergunta, "escritorio": request.firm_name or "LawClerk AI", **resultado}
 
+@app.post("/api/v1/consulta/sessoes")
+async def abrir_sessao(request: SessaoRequest):
+    """Abre uma sessão de consulta: as perguntas seguintes enviam só o sessao_id"""
+    sessao_id = await ai_service.sessoes.criar(request.firm_name, request.area)
+    if sessao_id is None:
+        raise HTTPException(status_code=503, detail="Sessões indisponíveis no momento")
+    return {"sessao_id": sessao_id, "area": request.area, "expira_em_segundos": settings.sessao_ttl}
+
+@app.get("/api/v1/consulta/sessoes/{sessao_id}")
+async def obter_sessao(sessao_id: str, firm_name: Optional[str] = None):
+    """Resumo acumulado e turnos ainda literais da sessão"""
+    sessao = await ai_service.sessoes.carregar(sessao_id, firm_name)
+    if sessao is None:
+        raise HTTPException(status_code=404, detail="Sessão de consulta não encontrada ou expirada")
+    _, tokens_historico = ai_service.sessoes.historico(sessao)
+    return {**sessao, "tokens_historico": tokens_historico}
+
+@app.delete("/api/v1/consulta/sessoes/{sessao_id}")
+async def encerrar_sessao(sessao_id: str, firm_name: Optional[str] = None):
+    if not await ai_service.sessoes.encerrar(sessao_id, firm_name):
+        raise HTTPException(status_code=404, detail="Sessão de consulta não encontrada ou expirada")
+    return {"sessao_id": sessao_id, "status": "encerrada"}
+
 @app.post("/api/v1/analise")
-async def analisar_texto(request: AnaliseRequest):
+async def analisar_texto(
+    request: AnaliseRequest,
+    stream: bool = Query(False, description="Transmite os tokens via Server-Sent Events")
+):
+    if stream:
+        eventos = ai_service.analisar_documento_stream(
+            request.texto, request.tipo_analise,
+            firm_name=request.firm_name,
+            lawyer_name=request.lawyer_name,
+            signature_text=request.signature_text,
+            ai_persona=request.ai_persona
+        )
+        return resposta_sse(eventos, {"escritorio": request.firm_name or "LawClerk AI"})
+    
     resultado = await ai_service.analisar_documento(
         request.texto, request.tipo_analise,
         firm_name=request.firm_name,
@@ -126,7 +210,20 @@ async def analisar_texto(request: AnaliseRequest):
     return {"escritorio": request.firm_name or "LawClerk AI", **resultado}
 
 @app.post("/api/v1/parecer-juridico")
-async def gerar_parecer_juridico(request: RelatorioRequest):
+async def gerar_parecer_juridico(
+    request: RelatorioRequest,
+    stream: bool = Query(False, description="Transmite os tokens via Server-Sent Events")
+):
+    if stream:
+        eventos = ai_service.gerar_relatorio_juridico_stream(
+            request.titulo, request.conteudo, request.area, request.incluir_jurisprudencia,
+            firm_name=request.firm_name,
+            lawyer_name=request.lawyer_name,
+            signature_text=request.signature_text,
+            ai_persona=request.ai_persona
+        )
+        return resposta_sse(eventos, {"titulo": request.titulo, "escritorio": request.firm_name or "LawClerk AI"})
+    
     resultado = await ai_service.gerar_relatorio_juridico(
         request.titulo, request.conteudo, request.area, request.incluir_jurisprudencia,
         firm_name=request.firm_name,
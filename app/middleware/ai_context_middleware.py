@@ -0,0 +1,24 @@
+# app/middleware/ai_context_middleware.py
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.request_context import ignorar_cache, endpoint_http, tamanho_resposta
+
+TAMANHOS = ("completo", "resumido")
+
+class AIContextMiddleware(BaseHTTPMiddleware):
+    """Propaga headers de controle da IA para o contexto da requisição"""
+    
+    async def dispatch(self, request: Request, call_next):
+        # X-Cache-Bypass: true → força nova chamada ao provedor (não lê o cache)
+        bypass = request.headers.get("X-Cache-Bypass", "").lower() in ("1", "true", "yes", "sim")
+        token = ignorar_cache.set(bypass)
+        token_endpoint = endpoint_http.set(request.url.path)
+        # X-Tamanho-Resposta: resumido → resposta concisa com max_tokens menor
+        tamanho = request.headers.get("X-Tamanho-Resposta", "").lower()
+        token_tamanho = tamanho_resposta.set(tamanho if tamanho in TAMANHOS else "completo")
+        try:
+            return await call_next(request)
+        finally:
+            tamanho_resposta.reset(token_tamanho)
+            endpoint_http.reset(token_endpoint)
+            ignorar_cache.reset(token)
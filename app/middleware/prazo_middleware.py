@@ -0,0 +1,124 @@
+# app/middleware/prazo_middleware.py - PRAZO POR REQUISIÇÃO E CANCELAMENTO NA DESCONEXÃO
+"""
+Middleware ASGI puro (o BaseHTTPMiddleware não enxerga a desconexão do cliente
+sem consumir o corpo da requisição).
+
+- Prazo: header X-Timeout-Ms (limitado a PRAZO_MAXIMO) ou o padrão do endpoint
+  em PRAZO_ENDPOINTS. Fica no contexto (request_context.prazo) para o
+  AIService ajustar timeouts e max_tokens; passado o prazo + PRAZO_FOLGA a
+  requisição é cancelada e, se nada foi enviado ainda, responde 504.
+- Desconexão: depois de lido o corpo, um vigia aguarda o http.disconnect e
+  cancela o handler, o que cancela a chamada em voo ao provedor e libera a
+  vaga do gateway.
+"""
+import asyncio
+import json
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.request_context import prazo
+
+stats: Dict[str, int] = {"requisicoes_com_prazo": 0, "desconexoes": 0, "prazos_esgotados": 0}
+
+
+def prazo_da_requisicao(path: str, headers: Dict[str, str]) -> Optional[float]:
+    """Segundos de prazo: header do cliente ou padrão do prefixo mais específico"""
+    valor = headers.get("x-timeout-ms")
+    if valor:
+        try:
+            return min(max(0.0, float(valor) / 1000), settings.prazo_maximo)
+        except ValueError:
+            pass
+    prefixos = [p for p in settings.prazo_endpoints if path.startswith(p)]
+    if not prefixos:
+        return None
+    return settings.prazo_endpoints[max(prefixos, key=len)]
+
+
+class PrazoMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        segundos = prazo_da_requisicao(scope.get("path", ""), headers)
+        if segundos is None:
+            await self.app(scope, receive, send)
+            return
+
+        stats["requisicoes_com_prazo"] += 1
+        corpo_lido = asyncio.Event()
+        desconectado = asyncio.Event()
+        resposta_iniciada = False
+        resposta_concluida = asyncio.Event()
+
+        async def receber():
+            if corpo_lido.is_set():
+                # O vigia é o único leitor depois do corpo; aqui só se espera a desconexão
+                await desconectado.wait()
+                return {"type": "http.disconnect"}
+            mensagem = await receive()
+            if mensagem["type"] == "http.disconnect":
+                desconectado.set()
+            elif not mensagem.get("more_body", False):
+                corpo_lido.set()
+            return mensagem
+
+        async def enviar(mensagem):
+            nonlocal resposta_iniciada
+            if mensagem["type"] == "http.response.start":
+                resposta_iniciada = True
+            await send(mensagem)
+            if mensagem["type"] == "http.response.body" and not mensagem.get("more_body", False):
+                resposta_concluida.set()
+
+        # A task herda o contexto com o prazo já definido
+        token = prazo.set(time.monotonic() + segundos)
+        try:
+            tarefa = asyncio.ensure_future(self.app(scope, receber, enviar))
+        finally:
+            prazo.reset(token)
+
+        async def vigiar():
+            await corpo_lido.wait()
+            while not desconectado.is_set():
+                if (await receive())["type"] == "http.disconnect":
+                    desconectado.set()
+            # Depois da resposta completa o servidor também sinaliza disconnect: não é desistência
+            if not tarefa.done() and not resposta_concluida.is_set():
+                stats["desconexoes"] += 1
+                tarefa.cancel()
+
+        vigia = asyncio.ensure_future(vigiar())
+        try:
+            concluidas, _ = await asyncio.wait({tarefa}, timeout=max(0.0, segundos) + settings.prazo_folga)
+            if tarefa in concluidas:
+                if not tarefa.cancelled():
+                    tarefa.result()
+                return
+
+            stats["prazos_esgotados"] += 1
+            tarefa.cancel()
+            await asyncio.gather(tarefa, return_exceptions=True)
+            if not resposta_iniciada and not desconectado.is_set():
+                await self._responder_504(send, segundos)
+        finally:
+            for pendente in (tarefa, vigia):
+                if not pendente.done():
+                    pendente.cancel()
+            await asyncio.gather(tarefa, vigia, return_exceptions=True)
+
+    @staticmethod
+    async def _responder_504(send, segundos: float) -> None:
+        corpo = json.dumps({"detail": f"Prazo da requisição esgotado ({segundos:.1f}s)"}, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(corpo)).encode())]
+        })
+        await send({"type": "http.response.body", "body": corpo})
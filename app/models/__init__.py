@@ -3,6 +3,8 @@ from .base import Base
 from .consulta import Consulta, AreaJuridica
 from .peticao import Peticao, TipoPeticao, StatusPeticao
 from .documento import Documento
+from .consumo_ia import ConsumoIA
+from .secao_peticao import SecaoPeticao
 
 __all__ = [
     "Base",
@@ -11,5 +13,7 @@ __all__ = [
     "Peticao", 
     "TipoPeticao", 
     "StatusPeticao",
-    "Documento"
+    "Documento",
+    "ConsumoIA",
+    "SecaoPeticao"
 ]
\ No newline at end of file
@@ -0,0 +1,26 @@
+# app/models/consumo_ia.py
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Float, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class ConsumoIA(Base):
+    """Consumo agregado da IA por escritório, endpoint, modelo e dia (flush periódico do Redis)"""
+    __tablename__ = "consumo_ia"
+    __table_args__ = (
+        UniqueConstraint("firm_name", "endpoint", "modelo", "dia", name="uq_consumo_ia_chave"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    firm_name = Column(String(255), nullable=False, index=True)
+    endpoint = Column(String(100), nullable=False)
+    modelo = Column(String(100), nullable=False)
+    dia = Column(Date, nullable=False, index=True)
+    
+    # Contadores
+    chamadas = Column(Integer, nullable=False, default=0)
+    tokens = Column(BigInteger, nullable=False, default=0)
+    custo_usd = Column(Float, nullable=False, default=0.0)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,24 @@
+# app/models/secao_peticao.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class SecaoPeticao(Base):
+    """Seção de petição que não depende do caso (direito, jurisprudência, pedidos), por tipo, modelo e versão do prompt"""
+    __tablename__ = "secoes_peticao"
+    __table_args__ = (
+        UniqueConstraint("tipo_beneficio", "modelo", "versao", "secao", name="uq_secoes_peticao_chave"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tipo_beneficio = Column(String(100), nullable=False, index=True)
+    modelo = Column(String(100), nullable=False)
+    versao = Column(String(50), nullable=False)
+    secao = Column(String(50), nullable=False)
+    
+    # Conteúdo gerado (com os placeholders que o pós-processamento preenche)
+    texto = Column(Text, nullable=False)
+    tokens = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps (a validade das seções conta daqui; regravar a chave renova)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,183 @@
+# app/modules/previdenciario/modelos.py - MODELOS PADRÃO VERSIONADOS (PETIÇÃO SEM IA)
+"""
+Petições de rotina montadas só a partir de templates versionados, dos campos
+de DadosPrevidenciarios e das saídas das calculadoras, sem chamada à IA.
+
+- Slots {campo} compilados uma vez (PromptTemplate, o mesmo compilador dos
+  prompts); os valores vêm de PrevidenciarioService._campos_<tipo>, os mesmos
+  que alimentam o prompt do tipo
+- Nome, CPF, RG, endereço, comarca, DER e local/data ficam como placeholders
+  [INSERIR ...]: o pós-processamento de sempre (_preencher_template) os
+  preenche, insere a tutela antecipada e acrescenta pedidos finais e assinatura
+- Um parágrafo por linha (a compilação junta espaços, mas mantém as quebras)
+- Mudou o texto, suba a versão: ela volta na resposta para rastrear a peça
+"""
+from typing import Dict
+from app.services.prompt_compiler import PromptTemplate
+
+_ENDERECAMENTO = "EXCELENTÍSSIMO(A) SENHOR(A) JUIZ(A) FEDERAL DO JUIZADO ESPECIAL FEDERAL DA [INSERIR COMARCA]"
+
+_QUALIFICACAO = (
+    "[INSERIR NOME DO REQUERENTE], [NACIONALIDADE], [ESTADO CIVIL], [PROFISSÃO], inscrito(a) no CPF sob o nº [INSERIR CPF], "
+    "RG nº [INSERIR RG], residente e domiciliado(a) em [INSERIR ENDEREÇO COMPLETO], por seu advogado que esta subscreve, "
+    "vem respeitosamente à presença de Vossa Excelência propor a presente"
+)
+
+_REU = (
+    "em face do INSTITUTO NACIONAL DO SEGURO SOCIAL - INSS, autarquia federal, [INSERIR ENDEREÇO DO INSS], "
+    "pelos fatos e fundamentos a seguir expostos."
+)
+
+MODELOS_PADRAO: Dict[str, PromptTemplate] = {
+    "auxilio_doenca": PromptTemplate("modelo_padrao.auxilio_doenca", {
+        "enderecamento": _ENDERECAMENTO,
+        "qualificacao": f"""
+            {_QUALIFICACAO}
+
+            AÇÃO DE CONCESSÃO DE AUXÍLIO-DOENÇA (BENEFÍCIO POR INCAPACIDADE TEMPORÁRIA)
+
+            {_REU}
+        """,
+        "fatos": """
+            I - DOS FATOS
+
+            O(A) Autor(a) requereu administrativamente o benefício de auxílio-doença em [INSERIR DER] (DER), tendo o pedido sido indeferido pelo INSS sob o fundamento de: {motivo_recusa}.
+
+            O(A) Autor(a) é portador(a) da enfermidade classificada sob o CID {cid_principal}. Quadro clínico: {informacoes_medicas}.
+
+            Em razão desse quadro, encontra-se temporariamente incapacitado(a) para o exercício de sua atividade habitual ({historico_laboral}), conforme a documentação médica: {laudos_medicos}.
+
+            Quanto à carência: {tempo_validado}.
+        """,
+        "direito": """
+            II - DO DIREITO
+
+            Nos termos do art. 59 da Lei 8.213/91, o auxílio-doença é devido ao segurado que, cumprida a carência de 12 contribuições mensais (art. 25, I), ficar incapacitado para o seu trabalho ou para a sua atividade habitual por mais de 15 dias consecutivos.
+
+            A qualidade de segurado na data de início da incapacidade e a carência estão demonstradas pelo CNIS, e a incapacidade laboral pela documentação médica anexa, que deverá ser confirmada por perícia judicial, a qual prevalece sobre a conclusão da perícia administrativa.
+
+            O benefício tem natureza alimentar, o que reforça a necessidade de sua implantação imediata.
+        """,
+        "jurisprudencia": """
+            III - DA JURISPRUDÊNCIA
+
+            A Turma Nacional de Uniformização firmou entendimento de que o juiz não está vinculado ao laudo administrativo do INSS, devendo considerar as condições pessoais e sociais do segurado na avaliação da incapacidade (Súmula 47 da TNU).
+
+            O Superior Tribunal de Justiça reconhece a natureza alimentar dos benefícios por incapacidade, admitindo a antecipação da tutela quando demonstrada a incapacidade por prova médica idônea.
+        """,
+        "valor": """
+            IV - DO VALOR DA CAUSA
+
+            Dá-se à causa o valor de {valor_causa_formatado}, correspondente às parcelas vencidas e a doze parcelas vincendas.
+        """,
+        "pedidos": """
+            V - DOS PEDIDOS
+
+            Ante o exposto, requer:
+
+            a) a citação do INSS para, querendo, apresentar contestação, e a realização de perícia médica judicial com {especialidade_perito};
+
+            b) a procedência do pedido para condenar o INSS a conceder o auxílio-doença desde a DER ([INSERIR DER]), com o pagamento das parcelas vencidas acrescidas de correção monetária e juros de mora;
+        """
+    }, versao="1"),
+
+    "bpc_loas": PromptTemplate("modelo_padrao.bpc_loas", {
+        "enderecamento": _ENDERECAMENTO,
+        "qualificacao": f"""
+            {_QUALIFICACAO}
+
+            AÇÃO DE CONCESSÃO DE BENEFÍCIO DE PRESTAÇÃO CONTINUADA (BPC-LOAS)
+
+            {_REU}
+        """,
+        "fatos": """
+            I - DOS FATOS
+
+            O(A) Autor(a) requereu administrativamente o benefício assistencial ({tipo_beneficio}) em [INSERIR DER] (DER), tendo o pedido sido indeferido pelo INSS sob o fundamento de: {motivo_recusa}.
+
+            O(A) Autor(a) apresenta impedimento de longo prazo, CID {cid_principal}, conforme a documentação médica: {laudos_medicos}.
+
+            Situação socioeconômica do grupo familiar: {informacoes_medicas}.
+
+            {tempo_validado}: o benefício independe de contribuições ao RGPS.
+        """,
+        "direito": """
+            II - DO DIREITO
+
+            O art. 203, V, da Constituição Federal e o art. 20 da Lei 8.742/93 (LOAS) garantem um salário mínimo mensal à pessoa com deficiência e ao idoso com 65 anos ou mais que comprovem não possuir meios de prover a própria manutenção nem de tê-la provida por sua família.
+
+            A deficiência é aferida por avaliação biopsicossocial (art. 2º da Lei 13.146/2015 - Estatuto da Pessoa com Deficiência), considerando os impedimentos de longo prazo e as barreiras que obstruem a participação plena na sociedade.
+
+            O critério de renda per capita inferior a 1/4 do salário mínimo não é o único meio de prova da miserabilidade, que pode ser demonstrada pelas demais circunstâncias do caso concreto.
+        """,
+        "jurisprudencia": """
+            III - DA JURISPRUDÊNCIA
+
+            O Supremo Tribunal Federal, no RE 567.985/MT (repercussão geral), declarou a inconstitucionalidade parcial do critério objetivo de renda do art. 20, § 3º, da LOAS, admitindo a aferição da miserabilidade por outros elementos.
+
+            A jurisprudência admite a exclusão, do cálculo da renda familiar, de benefícios de valor mínimo recebidos por outros membros do grupo familiar idosos ou com deficiência.
+        """,
+        "valor": """
+            IV - DO VALOR DA CAUSA
+
+            Dá-se à causa o valor de {valor_causa_formatado}, correspondente às parcelas vencidas e a doze parcelas vincendas de um salário mínimo.
+        """,
+        "pedidos": """
+            V - DOS PEDIDOS
+
+            Ante o exposto, requer:
+
+            a) a citação do INSS para, querendo, apresentar contestação, e a realização de perícia médica e de avaliação social por assistente social;
+
+            b) a procedência do pedido para condenar o INSS a conceder o benefício de prestação continuada no valor de um salário mínimo mensal desde a DER ([INSERIR DER]), com o pagamento das parcelas vencidas acrescidas de correção monetária e juros de mora;
+        """
+    }, versao="1"),
+
+    "salario_maternidade": PromptTemplate("modelo_padrao.salario_maternidade", {
+        "enderecamento": _ENDERECAMENTO,
+        "qualificacao": f"""
+            {_QUALIFICACAO}
+
+            AÇÃO DE CONCESSÃO DE SALÁRIO-MATERNIDADE
+
+            {_REU}
+        """,
+        "fatos": """
+            I - DOS FATOS
+
+            A Autora requereu administrativamente o salário-maternidade ({tipo_beneficio}), em razão do parto/adoção ocorrido em [INSERIR DER], tendo o pedido sido indeferido pelo INSS sob o fundamento de: {motivo_recusa}.
+
+            Na data do fato gerador, a Autora mantinha a qualidade de segurada, contando com {contribuicoes_cnis}.
+        """,
+        "direito": """
+            II - DO DIREITO
+
+            Os arts. 71 a 73 da Lei 8.213/91 asseguram o salário-maternidade à segurada da Previdência Social durante 120 dias, com início entre 28 dias antes do parto e a data de sua ocorrência, e também à segurada que adotar ou obtiver guarda judicial para fins de adoção (art. 71-A).
+
+            Para a segurada empregada, a empregada doméstica e a trabalhadora avulsa, o benefício independe de carência (art. 26, VI); para a contribuinte individual, a facultativa e a segurada especial, a carência é de 10 contribuições mensais (art. 25, III), reduzida em caso de parto antecipado.
+
+            O benefício tem natureza alimentar e visa à proteção da maternidade e da criança (arts. 6º e 201, II, da Constituição Federal).
+        """,
+        "jurisprudencia": """
+            III - DA JURISPRUDÊNCIA
+
+            O Superior Tribunal de Justiça entende que a manutenção da qualidade de segurada na data do parto é suficiente para a concessão do salário-maternidade, ainda que a segurada esteja desempregada, sendo o pagamento devido diretamente pelo INSS.
+
+            O Supremo Tribunal Federal (ADI 6.327) fixou que o termo inicial do benefício, em caso de internação prolongada da mãe ou do recém-nascido, é a alta hospitalar.
+        """,
+        "valor": """
+            IV - DO VALOR DA CAUSA
+
+            Dá-se à causa o valor de {valor_causa_formatado}, correspondente às parcelas do benefício devidas.
+        """,
+        "pedidos": """
+            V - DOS PEDIDOS
+
+            Ante o exposto, requer:
+
+            a) a citação do INSS para, querendo, apresentar contestação;
+
+            b) a procedência do pedido para condenar o INSS a pagar o salário-maternidade pelo período de 120 dias, a contar do parto/adoção ([INSERIR DER]), com as parcelas acrescidas de correção monetária e juros de mora;
+        """
+    }, versao="1")
+}
@@ -0,0 +1,571 @@
+# app/modules/previdenciario/prompts.py - TEMPLATES PRÉ-COMPILADOS DAS PETIÇÕES PREVIDENCIÁRIAS
+from app.services.prompt_compiler import prompt_registry
+
+# ========== PERSONA + TAREFA ==========
+# Persona e instruções são estáticas e abrem o prompt (cache de prefixo do provedor);
+# a tarefa recebe só a parte fixa do tipo de petição - os dados do caso vão no final
+PERSONA_TAREFA = prompt_registry.registrar("previdenciario.persona_tarefa", {
+    "persona": """
+        PERSONA ESPECIALIZADA - ESPECIALISTA EM DIREITO PREVIDENCIÁRIO:
+        Você é um advogado sênior especialista em Direito Previdenciário com vasta experiência prática.
+
+        EXPERTISE TÉCNICA COMPROVADA:
+        - Domínio absoluto da Lei 8.213/91, Decreto 3.048/99 e todas as alterações
+        - Conhecimento profundo da EC 103/2019 (Nova Previdência) e regras de transição
+        - Atualização constante com jurisprudência do STF, STJ, TNU e TRFs
+        - Especialização em cálculos previdenciários complexos e atuariais
+        - Experiência comprovada em milhares de casos previdenciários exitosos
+        - Conhecimento técnico de CNIS, PPP, LTCAT e documentação previdenciária
+
+        HABILIDADES JURÍDICAS ESPECÍFICAS:
+        - Redação técnica precisa de petições iniciais conforme CPC/2015
+        - Análise minuciosa de documentos e histórico contributivo
+        - Estratégias processuais diferenciadas para cada tipo de benefício
+        - Domínio completo de precedentes, súmulas e teses de repercussão geral
+        - Conhecimento das nuances das regras de transição da EC 103/2019
+        - Expertise em conversão de tempo especial e atividade rural
+
+        METODOLOGIA PROFISSIONAL:
+        - Fundamentação sempre baseada em jurisprudência atual e vinculante
+        - Inclusão obrigatória de cálculos precisos e planilhas técnicas
+        - Argumentação sólida sustentada por precedentes consolidados
+        - Linguagem técnica mas acessível ao poder judiciário
+        - Estrutura processual rigorosamente conforme CPC/2015 art. 319
+        - Pedidos estratégicos incluindo tutelas antecipadas quando cabíveis
+
+        CONHECIMENTO JURISPRUDENCIAL ATUALIZADO:
+        - STF: RE 1.276.977 (Revisão da Vida Toda), RE 567.985/MT (BPC-LOAS)
+        - STJ: Precedentes sobre tempo de contribuição, atividade especial, rurais
+        - TNU: Entendimentos sobre incapacidade, perícia judicial, atividade especial
+        - TRF5: Jurisprudência regional do Nordeste sobre aposentadoria especial
+        - Precedentes locais específicos para fortalecer argumentação regional
+        - Teses de repercussão geral e recursos repetitivos atualizados
+        - Mudanças legislativas e regulamentares constantemente atualizadas
+
+        COMPROMISSO ÉTICO PROFISSIONAL:
+        - Inclusão obrigatória de disclaimers sobre responsabilidade profissional
+        - Orientação clara sobre necessidade de revisão advocatícia qualificada
+        - Conformidade absoluta com Código de Ética e Disciplina da OAB
+        - Transparência sobre limitações da inteligência artificial
+        - Responsabilidade na orientação jurídica fornecida
+
+        ESTILO DE REDAÇÃO TÉCNICA:
+        - Linguagem jurídica precisa, técnica e persuasiva
+        - Estrutura lógica com fundamentação escalonada
+        - Citações corretas e completas de jurisprudência
+        - Argumentação convincente baseada em precedentes
+        - Pedidos claros, específicos e juridicamente viáveis
+        - Tom respeitoso mas firme perante o poder judiciário
+
+        INSTRUÇÕES CRÍTICAS PARA PLACEHOLDERS:
+        - SEMPRE use placeholders padronizados em vez de inventar dados
+        - Comarca: use "[INSERIR COMARCA]" em vez de inventar cidade
+        - Endereço do autor: use "[INSERIR ENDEREÇO COMPLETO]"
+        - Endereço do INSS: use "[INSERIR ENDEREÇO DO INSS]"
+        - Nome do advogado: use "[NOME DO ADVOGADO]"
+        - OAB: use "OAB/[UF] [NÚMERO]"
+        - Data e local: use "[INSERIR LOCAL E DATA]"
+
+        NUNCA invente dados que não foram fornecidos. Use SEMPRE os placeholders listados.
+    """,
+    "instrucoes": """
+        INSTRUÇÕES TÉCNICAS OBRIGATÓRIAS:
+        - Utilize toda sua expertise previdenciária para criar uma petição tecnicamente perfeita
+        - Inclua jurisprudência específica, atual e vinculante para o caso concreto
+        - Mantenha linguagem profissional, técnica e persuasiva
+        - Estruture rigorosamente conforme as melhores práticas processuais
+        - Demonstre conhecimento profundo e atualizado da matéria previdenciária
+        - Inclua argumentação estratégica que maximize as chances de êxito
+        - Fundamente todos os pedidos com base legal e jurisprudencial sólida
+    """,
+    "tarefa": """
+        TAREFA ESPECÍFICA SOLICITADA:
+        {tarefa}
+    """
+}, versao="2")
+
+# ========== APOSENTADORIA POR INVALIDEZ ==========
+APOSENTADORIA_INVALIDEZ = prompt_registry.registrar("previdenciario.aposentadoria_invalidez", {
+    "solicitacao": "Elabore uma petição inicial para APOSENTADORIA POR INVALIDEZ com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Tipo de benefício: {tipo_beneficio}
+        - DER (Data de Entrada do Requerimento): {der}
+        - Motivo da recusa administrativa: {motivo_recusa}
+        - CID principal: {cid_principal}
+        - Nome do segurado: {nome}
+        - CPF: {cpf}
+        - Informações médicas detalhadas: {informacoes_medicas}
+        - Histórico laboral: {historico_laboral}
+        - Atividade especial prévia: {atividade_especial}
+        - Exposição ocupacional: {exposicao_agentes_nocivos}
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar rigorosamente com art. 42 da Lei 8.213/91
+        - Citar jurisprudência específica da TNU sobre incapacidade permanente e total
+        - Incluir pedido de tutela antecipada com fundamentação técnica sólida
+        - Demonstrar conhecimento especializado sobre incapacidade laboral
+        - Estruturar conforme CPC/2015 art. 319 com precisão técnica
+        - Argumentar sobre integralidade do salário de benefício (100% da média)
+        - Incluir pedido de perícia médica judicial se necessário
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Tempo validado: {tempo_validado}
+        - Documentos médicos: {laudos_medicos}
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - TNU, PEDILEF sobre incapacidade permanente
+        - STJ sobre aposentadoria por invalidez
+        - Precedentes sobre perícia médica judicial vs administrativa
+    """
+})
+
+# ========== REVISÃO DA VIDA TODA ==========
+REVISAO_VIDA_TODA = prompt_registry.registrar("previdenciario.revisao_vida_toda", {
+    "solicitacao": "Elabore uma petição inicial para REVISÃO DA VIDA TODA com base na decisão do STF e nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Número do benefício: {numero_beneficio}
+        - DIB (Data de Início do Benefício): {dib}
+        - DER original: {der}
+        - Tempo total de contribuição: {tempo_contribuicao} meses
+        - Histórico contributivo detalhado: {historico_contribuicoes}
+        - Nome do segurado: {nome}
+        - Motivo da revisão: {motivo_recusa}
+    """,
+    "fundamentos": """
+        FUNDAMENTOS TÉCNICOS ESPECÍFICOS:
+        - STF RE 1.276.977 com repercussão geral (Tema 1102)
+        - Inclusão obrigatória de salários anteriores a julho/1994
+        - Demonstração de cálculo mais benéfico ao segurado
+        - Aplicação da prescrição quinquenal apenas às parcelas vencidas
+        - Análise técnica do período pré-Plano Real
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com a decisão específica do STF RE 1.276.977
+        - Demonstrar conhecimento técnico sobre cálculo previdenciário
+        - Incluir simulação comparativa obrigatória
+        - Citar precedentes sobre prescrição quinquenal
+        - Estruturar argumentação sobre direito adquirido
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Tempo validado: {tempo_validado} meses
+        - Período contributivo relevante: Anterior a julho/1994
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STF RE 1.276.977 (Tema 1102) - texto integral da decisão
+        - Precedentes sobre prescrição quinquenal
+        - Decisões sobre direito adquirido previdenciário
+    """
+})
+
+# ========== APOSENTADORIA POR TEMPO DE CONTRIBUIÇÃO ==========
+APOSENTADORIA_TEMPO_CONTRIBUICAO = prompt_registry.registrar("previdenciario.aposentadoria_tempo_contribuicao", {
+    "solicitacao": "Elabore uma petição inicial para APOSENTADORIA POR TEMPO DE CONTRIBUIÇÃO com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Tempo total comprovado: {tempo_contribuicao} meses ({tempo_contribuicao_anos} anos)
+        - DER (Data de Entrada do Requerimento): {der}
+        - Motivo da recusa administrativa: {motivo_recusa}
+        - Histórico contributivo: {historico_contribuicoes}
+        - Nome do segurado: {nome}
+        - CPF: {cpf}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - Homem: 35 anos de contribuição (420 meses) - Verificar cumprimento
+        - Mulher: 30 anos de contribuição (360 meses) - Verificar cumprimento
+        - Carência mínima: 180 contribuições mensais
+        - Qualidade de segurado na DER
+        - Análise das regras de transição da EC 103/2019
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.213/91 arts. 52, 53 e 55
+        - Analisar aplicabilidade das regras de transição EC 103/2019
+        - Demonstrar conhecimento sobre contagem de tempo de contribuição
+        - Incluir análise técnica do CNIS e vínculos
+        - Estruturar conforme CPC/2015 com precisão processual
+        - Argumentar sobre fator previdenciário se aplicável
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Tempo validado: {tempo_validado} meses
+        - Análise de suficiência do tempo de contribuição
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STJ sobre contagem integral do tempo de contribuição
+        - Precedentes sobre reconhecimento de vínculos
+        - Decisões sobre aplicação do fator previdenciário
+    """
+})
+
+# ========== AUXÍLIO-DOENÇA ==========
+AUXILIO_DOENCA = prompt_registry.registrar("previdenciario.auxilio_doenca", {
+    "solicitacao": "Elabore uma petição inicial para AUXÍLIO-DOENÇA com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - DER (Data de Entrada do Requerimento): {der}
+        - CID principal: {cid_principal}
+        - Motivo da recusa administrativa: {motivo_recusa}
+        - Informações médicas detalhadas: {informacoes_medicas}
+        - Nome do segurado: {nome}
+        - CPF: {cpf}
+        - Histórico laboral: {historico_laboral}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - Incapacidade temporária para o trabalho habitual
+        - Carência: 12 contribuições mensais (exceto acidente)
+        - Qualidade de segurado na DII (Data de Início da Incapacidade)
+        - Comprovação médica da incapacidade laboral
+        - Análise da atividade habitual do segurado
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar rigorosamente com Lei 8.213/91 art. 59
+        - Demonstrar conhecimento sobre incapacidade temporária vs permanente
+        - Incluir pedido OBRIGATÓRIO de tutela antecipada
+        - Argumentar sobre prevalência da perícia judicial
+        - Citar precedentes sobre natureza alimentar do benefício
+        - Incluir pedido de perícia médica judicial
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Carência validada: {tempo_validado}
+        - Documentos médicos: {laudos_medicos}
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - TNU sobre prevalência da perícia judicial vs administrativa
+        - STJ sobre natureza alimentar do auxílio-doença
+        - Precedentes sobre tutela antecipada em benefícios por incapacidade
+    """
+})
+
+# ========== PENSÃO POR MORTE ==========
+PENSAO_MORTE = prompt_registry.registrar("previdenciario.pensao_morte", {
+    "solicitacao": "Elabore uma petição inicial para PENSÃO POR MORTE com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Data do óbito: {der}
+        - Motivo da recusa administrativa: {motivo_recusa}
+        - Relação de parentesco: {historico_laboral}
+        - Informações sobre dependência: {informacoes_medicas}
+        - Nome do dependente: {nome}
+        - CPF do dependente: {cpf}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - Qualidade de segurado do instituidor na data do óbito
+        - Dependência econômica (presumida para cônjuge/companheiro)
+        - Carência dispensada para pensão por morte
+        - Comprovação do óbito e da relação de dependência
+        - Análise da cota-parte se múltiplos dependentes
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.213/91 arts. 74 a 79
+        - Demonstrar conhecimento sobre classes de dependentes (art. 16)
+        - Argumentar sobre presunção de dependência econômica
+        - Incluir análise sobre duração do benefício conforme EC 103/2019
+        - Citar precedentes sobre qualidade de segurado do instituidor
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Carência: {tempo_validado}
+        - DIB: Data do óbit como regra geral
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STJ sobre presunção de dependência econômica do cônjuge
+        - Precedentes sobre qualidade de segurado do instituidor
+        - Decisões sobre duração da pensão por morte
+    """
+})
+
+# ========== APOSENTADORIA ESPECIAL ==========
+APOSENTADORIA_ESPECIAL = prompt_registry.registrar("previdenciario.aposentadoria_especial", {
+    "solicitacao": "Elabore uma petição inicial para APOSENTADORIA ESPECIAL com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Tempo especial comprovado: {tempo_contribuicao} meses ({tempo_contribuicao_anos} anos)
+        - Atividade especial confirmada: {atividade_especial}
+        - Agentes nocivos específicos: {exposicao_agentes_nocivos}
+        - DER: {der}
+        - Motivo da recusa: {motivo_recusa}
+        - Nome do segurado: {nome}
+        - CPF: {cpf}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - 15, 20 ou 25 anos conforme grau de nocividade do agente
+        - Exposição habitual, permanente e não ocasional
+        - Comprovação através de PPP e LTCAT válidos
+        - Análise das regras de transição da EC 103/2019
+        - Eficácia dos equipamentos de proteção individual
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.213/91 art. 57 e EC 103/2019
+        - Demonstrar conhecimento técnico sobre agentes nocivos
+        - Incluir análise das regras de transição aplicáveis
+        - Argumentar sobre conversão subsidiária de tempo especial
+        - OBRIGATÓRIO: Incluir pedido de conversão de tempo comum em especial
+        - Mencionar possibilidade de períodos híbridos (comum + especial)
+        - Citar precedentes sobre PPP e LTCAT
+        - Incluir pedido de perícia técnica se necessário
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Tempo especial validado: {tempo_validado} meses
+        - Análise de suficiência do tempo especial
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STJ sobre exposição habitual e permanente a agentes nocivos
+        - TNU sobre validade de PPP e LTCAT
+        - Precedentes sobre regras de transição da EC 103/2019
+        - TRF5: Decisões regionais sobre aposentadoria especial no Nordeste
+    """,
+    "documentos": """
+        DOCUMENTOS OBRIGATÓRIOS A MENCIONAR:
+        - PPP (Perfil Profissiográfico Previdenciário)
+        - LTCAT (Laudo Técnico das Condições Ambientais do Trabalho)
+        - CNIS (Cadastro Nacional de Informações Sociais)
+        - Laudos médicos (audiometria, exames ocupacionais)
+        - Carteira de Trabalho e documentos pessoais
+    """
+})
+
+# ========== BPC-LOAS ==========
+BPC_LOAS = prompt_registry.registrar("previdenciario.bpc_loas", {
+    "solicitacao": "Elabore uma petição inicial para BPC-LOAS (Benefício de Prestação Continuada) com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Tipo de benefício: {tipo_beneficio}
+        - CID principal: {cid_principal}
+        - Situação de renda familiar: {informacoes_medicas}
+        - Motivo da recusa: {motivo_recusa}
+        - Nome do requerente: {nome}
+        - CPF: {cpf}
+        - DER: {der}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - Pessoa com deficiência ou idoso com 65+ anos
+        - Renda familiar per capita inferior a 1/4 do salário mínimo
+        - Não recebimento de qualquer outro benefício previdenciário
+        - Avaliação biopsicossocial da deficiência
+        - Análise da composição do grupo familiar
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.742/93 (LOAS) art. 20
+        - Demonstrar conhecimento sobre critério de miserabilidade
+        - Incluir pedido OBRIGATÓRIO de tutela antecipada
+        - Argumentar sobre flexibilização do critério de renda (STF)
+        - Citar Estatuto da Pessoa com Deficiência (Lei 13.146/2015)
+        - Incluir pedido de avaliação social e médica
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Valor do benefício: 1 salário mínimo mensal
+        - Carência: {tempo_validado}
+        - Documentos médicos: {laudos_medicos}
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STF RE 567.985/MT sobre flexibilização do critério de miserabilidade
+        - Precedentes sobre avaliação biopsicossocial da deficiência
+        - Decisões sobre composição do grupo familiar
+    """
+})
+
+# ========== APOSENTADORIA HÍBRIDA/RURAL ==========
+APOSENTADORIA_RURAL = prompt_registry.registrar("previdenciario.aposentadoria_rural", {
+    "solicitacao": "Elabore uma petição inicial para APOSENTADORIA HÍBRIDA/RURAL com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Tempo rural alegado: {historico_laboral}
+        - Tempo urbano comprovado: {tempo_contribuicao} meses
+        - DER: {der}
+        - Atividade rural detalhada: {exposicao_agentes_nocivos}
+        - Nome do segurado: {nome}
+        - CPF: {cpf}
+        - Motivo da recusa: {motivo_recusa}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - Somatória de tempo rural + urbano para atingir carência
+        - Comprovação de atividade rural por início de prova material + testemunhal
+        - Carência conforme período de filiação
+        - Idade mínima: 60 anos (homem) / 55 anos (mulher)
+        - Qualidade de segurado na DER
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.213/91 art. 48, § 3º (aposentadoria híbrida)
+        - Demonstrar conhecimento sobre comprovação de atividade rural
+        - Incluir pedido de produção de prova testemunhal
+        - Argumentar sobre início de prova material
+        - Citar precedentes sobre aposentadoria híbrida
+        - Incluir análise da idade na DER
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Tempo urbano validado: {tempo_validado} meses
+        - Análise da somatória rural + urbano
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STJ sobre aposentadoria híbrida sem atividade rural atual
+        - TNU sobre comprovação de atividade rural
+        - Precedentes sobre início de prova material + testemunhal
+    """
+})
+
+# ========== SALÁRIO-MATERNIDADE ==========
+SALARIO_MATERNIDADE = prompt_registry.registrar("previdenciario.salario_maternidade", {
+    "solicitacao": "Elabore uma petição inicial para SALÁRIO-MATERNIDADE com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Data do parto/adoção: {der}
+        - Motivo da recusa administrativa: {motivo_recusa}
+        - Tipo específico: {tipo_beneficio}
+        - Carência atual: {tempo_contribuicao} meses
+        - Nome da segurada: {nome}
+        - CPF: {cpf}
+    """,
+    "requisitos_legais": """
+        REQUISITOS LEGAIS TÉCNICOS:
+        - Qualidade de segurada na data do parto/adoção
+        - Carência: 10 contribuições mensais (exceto para acidente)
+        - Período de pagamento: 120 dias (parto) ou conforme idade (adoção)
+        - Análise da categoria de segurada (empregada, autônoma, rural)
+        - Verificação de afastamento do trabalho
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.213/91 art. 71 a 73
+        - Demonstrar conhecimento sobre diferentes modalidades
+        - Incluir pedido OBRIGATÓRIO de tutela antecipada
+        - Argumentar sobre natureza alimentar do benefício
+        - Citar precedentes sobre dispensa de carência
+        - Incluir análise sobre período de pagamento
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Carência analisada: {tempo_validado} meses
+        - Período de pagamento: 120 dias (regra geral)
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STJ sobre qualidade de segurada como requisito único
+        - Precedentes sobre tutela antecipada em salário-maternidade
+        - Decisões sobre diferentes modalidades de seguradas
+    """
+})
+
+# ========== REVISÃO DE BENEFÍCIO ==========
+REVISAO_BENEFICIO = prompt_registry.registrar("previdenciario.revisao_beneficio", {
+    "solicitacao": "Elabore uma petição inicial para REVISÃO DE BENEFÍCIO PREVIDENCIÁRIO com base nos seguintes dados:",
+    "dados_caso": """
+        DADOS TÉCNICOS DO CASO:
+        - Número do benefício: {numero_beneficio}
+        - DIB original: {dib}
+        - DER original: {der}
+        - Motivo específico da revisão: {motivo_recusa}
+        - Tipo de revisão solicitada: {tipo_beneficio}
+        - Nome do segurado: {nome}
+        - CPF: {cpf}
+    """,
+    "fundamentos": """
+        FUNDAMENTOS TÉCNICOS PARA REVISÃO:
+        - Erro material no cálculo da RMI
+        - Não consideração de períodos contributivos válidos
+        - Aplicação incorreta de índices de correção
+        - Desconsideração de salários de contribuição
+        - Aplicação equivocada de regras de cálculo
+    """,
+    "requisitos_tecnicos": """
+        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
+        - Fundamentar com Lei 8.213/91 art. 29 (cálculo do salário de benefício)
+        - Demonstrar conhecimento técnico sobre cálculo previdenciário
+        - Incluir análise detalhada do erro cometido
+        - Argumentar sobre prescrição quinquenal das parcelas
+        - Citar precedentes sobre revisão de benefícios
+        - Incluir pedido de perícia contábil se necessário
+    """,
+    "calculos": """
+        CÁLCULOS E VALORES TÉCNICOS:
+        - Valor da causa: R$ {valor_causa:,.2f}
+        - Análise temporal: {tempo_validado}
+        - Diferença mensal estimada a ser demonstrada em planilha
+    """,
+    "jurisprudencia": """
+        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
+        - STJ sobre possibilidade de revisão quando comprovado erro de cálculo
+        - Precedentes sobre prescrição quinquenal em revisões
+        - Decisões sobre erro material vs erro de direito
+    """
+})
+
+# ========== PETIÇÃO EM SEÇÕES ==========
+# Direito, jurisprudência e pedidos não dependem do caso: gerados uma vez por tipo
+# (mesmo prefixo estático do tipo) e guardados; por requisição só qualificação e fatos
+SECOES_FIXAS = prompt_registry.registrar("previdenciario.secoes_fixas", {
+    "instrucoes": """
+        REDAÇÃO DAS SEÇÕES COMUNS A TODOS OS CASOS DESTE BENEFÍCIO:
+        Redija SOMENTE as seções abaixo, nesta ordem e com estes títulos:
+        II - DO DIREITO
+        III - DA JURISPRUDÊNCIA
+        IV - DOS PEDIDOS
+
+        REGRAS:
+        - O texto será reutilizado em petições de segurados diferentes: não cite nomes, CPF, CID, datas nem valores
+        - Refira-se à parte como "o(a) Autor(a)"; onde precisar da DER use "[INSERIR DER]" e do valor da causa "[INSERIR VALOR]"
+        - Não escreva endereçamento, qualificação, fatos, fecho ("Nestes termos"), local, data nem assinatura
+    """
+}, versao="1")
+
+SECOES_CASO = prompt_registry.registrar("previdenciario.secoes_caso", {
+    "instrucoes": """
+        PARTE DA PETIÇÃO A REDIGIR AGORA:
+        Redija SOMENTE o endereçamento, a qualificação das partes e a seção "I - DOS FATOS", com os dados acima.
+        As seções de direito, jurisprudência e pedidos e o fecho já estão prontos e serão anexados: não os escreva.
+    """
+}, versao="1")
+
+# ========== REVISÃO DO MODELO PADRÃO ==========
+# Etapa opcional do modelo padrão: a IA só melhora a redação da peça já montada
+REFINAR_MODELO = prompt_registry.registrar("previdenciario.refinar_modelo", {
+    "instrucoes": """
+        REVISÃO DE PETIÇÃO MONTADA A PARTIR DE MODELO PADRÃO:
+        - Aprimore a redação, a coesão e a argumentação com base nos fatos narrados
+        - Mantenha a estrutura, a ordem das seções e todos os pedidos
+        - Mantenha exatamente como estão os placeholders entre colchetes ([INSERIR ...]) e os valores
+        - Não acrescente fecho, local, data nem assinatura
+        - Responda somente com o texto da petição revisada
+    """,
+    "peticao": """
+        PETIÇÃO A REVISAR:
+        {peticao}
+    """
+}, versao="1")
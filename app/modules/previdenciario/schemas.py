@@ -64,4 +64,9 @@ class PeticaoPrevidenciaria(BaseModel):
     tipo: str
     area: str
     texto_peticao: str
-    dados_utilizados: DadosPrevidenciarios
\ No newline at end of file
+    dados_utilizados: DadosPrevidenciarios
+
+class PedidoPeticoesMultiplas(BaseModel):
+    """Mesmo cliente, vários benefícios (ex.: invalidez x auxílio-doença x BPC-LOAS)"""
+    dados: DadosPrevidenciarios
+    tipos: List[str]  # "auxilio_doenca" ou "auxilio-doenca"
@@ -0,0 +1,394 @@
+# app/modules/previdenciario/secoes.py - SEÇÕES FIXAS DAS PETIÇÕES (GERADAS UMA VEZ POR TIPO)
+"""
+Direito, jurisprudência e pedidos de uma petição previdenciária dependem do
+tipo de benefício, não do segurado. Essas seções são geradas uma vez por
+(tipo, modelo, versão do prompt) e guardadas; a cada requisição o modelo
+redige só endereçamento, qualificação e fatos.
+
+- Busca: memória do processo e Redis (hash secoes_peticao:{tipo}|{modelo}|{versão})
+  por SECOES_CACHE_TTL -> banco (tabela secoes_peticao, linhas valem por
+  SECOES_BANCO_VALIDADE desde a gravação; upsert só em PostgreSQL e SQLite,
+  nos demais dialetos as seções ficam só no Redis e na memória)
+- Modelo da chave: o preferido da rota de "peticao_secoes" (ROTEAMENTO_REGRAS);
+  a resposta de qualquer modelo da rota (fallback) é aceita
+- Ausente: a geração roda em segundo plano (uma por chave, com trava no
+  Redis), fora do prazo e do X-Cache-Bypass da requisição que a disparou;
+  a requisição atual segue com a petição inteira gerada pelo modelo
+- Geração que falhou não é repetida por SECOES_FALHA_ESPERA (no processo e,
+  com Redis, entre processos): sem isso cada petição pagaria outra chamada
+- Só se guarda resposta completa: parada no teto de tokens ou sem as três
+  seções (pedidos terminados em "." ou ";") é descartada
+- Versão: formato das seções + versões dos templates + hash do prefixo
+  estático do tipo; mudar o prompt gera seções novas sem apagar as antigas
+- As seções guardam os placeholders ([INSERIR DER], [INSERIR VALOR]) que o
+  pós-processamento preenche com os dados de cada caso
+"""
+import asyncio
+import hashlib
+import re
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.request_context import ignorar_cache, prazo, tamanho_resposta
+from app.services.ai_service import ai_service
+from app.services.cache_service import CacheService
+from app.services.prompt_compiler import prompt_registry, contar_tokens
+from .prompts import PERSONA_TAREFA, SECOES_FIXAS
+
+ORDEM_SECOES = ("direito", "jurisprudencia", "pedidos")
+
+# Suba quando mudar o que conta como seção válida: linhas antigas deixam de ser lidas
+_FORMATO = "2"
+
+# Título de seção fixa no início da linha (com ou sem numeração romana/markdown)
+_TITULO_FIXO = re.compile(
+    r"^[ \t#*]*(?:[IVX]+\s*[-–.]\s*)?(DO\s+DIREITO|DOS\s+FUNDAMENTOS|DA\s+JURISPRUD\w*|DOS\s+PEDIDOS)",
+    re.MULTILINE
+)
+_FECHO = re.compile(r"Nestes\s+termos", re.IGNORECASE)
+# Último pedido encerrado (com ou sem ênfase markdown depois da pontuação)
+_PEDIDOS_ENCERRADOS = re.compile(r"[.;][*_)\s]*$")
+# Linha em curso mais longa que isso já não pode ser um título
+_MAX_TITULO = 60
+
+FECHO_SECOES = "Nestes termos,\npede deferimento.\n\n[INSERIR LOCAL E DATA]"
+
+
+def _nome_secao(titulo: str) -> str:
+    if "PEDIDOS" in titulo:
+        return "pedidos"
+    if "JURISPRUD" in titulo:
+        return "jurisprudencia"
+    return "direito"
+
+
+def dividir_secoes(texto: str) -> Optional[Dict[str, str]]:
+    """Seções fixas do texto gerado; None se faltar alguma seção ou os pedidos ficarem pela metade"""
+    achados = list(_TITULO_FIXO.finditer(texto))
+    secoes: Dict[str, str] = {}
+    for i, achado in enumerate(achados):
+        fim = achados[i + 1].start() if i + 1 < len(achados) else len(texto)
+        nome = _nome_secao(achado.group(1))
+        trecho = texto[achado.start():fim].strip()
+        secoes[nome] = f"{secoes[nome]}\n\n{trecho}" if nome in secoes else trecho
+
+    if any(nome not in secoes for nome in ORDEM_SECOES):
+        return None
+    # O fecho e a assinatura vêm do pós-processamento de cada caso
+    fecho = _FECHO.search(secoes["pedidos"])
+    if fecho:
+        secoes["pedidos"] = secoes["pedidos"][:fecho.start()].rstrip()
+    if not _PEDIDOS_ENCERRADOS.search(secoes["pedidos"]):
+        return None
+    return secoes
+
+
+def montar_secoes(secoes: Dict[str, str]) -> str:
+    """Texto das seções fixas em ordem, terminado pelo fecho (ponto da tutela antecipada)"""
+    corpo = "\n\n".join(secoes[nome] for nome in ORDEM_SECOES if secoes.get(nome))
+    return f"{corpo}\n\n{FECHO_SECOES}"
+
+
+def cortar_caso(texto: str) -> str:
+    """Parte do caso até o primeiro título de seção fixa (se o modelo passou dela)"""
+    achado = _TITULO_FIXO.search(texto)
+    return texto[:achado.start()] if achado else texto
+
+
+def juntar_secoes(caso: str, fixas: str) -> str:
+    """O que vai depois da parte do caso: separação de um parágrafo + seções fixas"""
+    if caso.endswith("\n\n"):
+        return fixas
+    return ("\n" if caso.endswith("\n") else "\n\n") + fixas
+
+
+class CorteCaso:
+    """
+    cortar_caso em streaming: repassa o texto do caso à medida que chega,
+    segurando só a linha em curso enquanto ela ainda pode ser um título
+    """
+
+    def __init__(self):
+        self.texto = ""
+        self.emitido = 0
+        self.linha = 0
+        self.encerrado = False
+
+    @property
+    def caso(self) -> str:
+        """Parte do caso repassada até aqui"""
+        return self.texto[:self.emitido]
+
+    def alimentar(self, pedaco: str) -> str:
+        if self.encerrado:
+            return ""
+        self.texto += pedaco
+        achado = _TITULO_FIXO.search(self.texto, self.linha)
+        if achado:
+            self.encerrado = True
+            fim = achado.start()
+        else:
+            quebra = self.texto.rfind("\n", self.linha)
+            if quebra != -1:
+                self.linha = quebra + 1
+            fim = self.linha if len(self.texto) - self.linha <= _MAX_TITULO else len(self.texto)
+        fim = max(fim, self.emitido)
+        saida = self.texto[self.emitido:fim]
+        self.emitido = fim
+        return saida
+
+    def finalizar(self) -> str:
+        if self.encerrado:
+            return ""
+        saida = self.texto[self.emitido:]
+        self.emitido = len(self.texto)
+        return saida
+
+
+class SecoesFixas:
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+        self._memoria: Dict[str, Tuple[str, float]] = {}  # chave -> (texto, expira em)
+        self._gerando: Dict[str, asyncio.Task] = {}
+        self._rotas: Dict[str, List[str]] = {}  # tipo|versão -> modelos da rota de "peticao_secoes"
+        self._adiadas: Dict[str, float] = {}  # chave -> até quando não gerar de novo (falha recente)
+        self.stats = {"memoria": 0, "redis": 0, "banco": 0, "ausentes": 0, "geradas": 0, "falhas": 0, "adiadas": 0}
+        self._banco = self._banco_suportado()
+
+    @staticmethod
+    def _banco_suportado() -> bool:
+        """Seções só vão para o banco com upsert (PostgreSQL ou SQLite); nos demais, só Redis e memória"""
+        from app.core.database import engine, suporta_upsert
+        if suporta_upsert():
+            return True
+        print(f"⚠️ Aviso: banco {engine.dialect.name} sem upsert - seções fixas da petição não serão gravadas no banco")
+        return False
+
+    @staticmethod
+    def versao(tipo: str, instrucoes_fixas: str) -> str:
+        """Formato + versões dos templates + hash do prefixo estático (o texto que as seções seguem)"""
+        template = prompt_registry.obter(f"previdenciario.{tipo}")
+        resumo = hashlib.sha256(f"{instrucoes_fixas}\n{SECOES_FIXAS.texto}".encode()).hexdigest()[:12]
+        return f"f{_FORMATO}.{PERSONA_TAREFA.versao}.{template.versao}.{SECOES_FIXAS.versao}-{resumo}"
+
+    def _modelos(self, tipo: str, versao: str, instrucoes_fixas: str) -> List[str]:
+        """Modelos da rota da geração (preferido primeiro), calculados uma vez por tipo e versão"""
+        chave = f"{tipo}|{versao}"
+        if chave not in self._rotas:
+            self._rotas[chave] = ai_service.modelos_peticao(
+                SECOES_FIXAS.texto, "previdenciario", instrucoes_fixas=instrucoes_fixas, metodo="peticao_secoes"
+            )
+        return self._rotas[chave]
+
+    async def obter(self, tipo: str, instrucoes_fixas: str) -> Optional[str]:
+        """Seções fixas montadas; None (e geração em segundo plano) se ainda não existem"""
+        if not settings.secoes_cache_ativo or ignorar_cache.get():
+            return None
+        versao = self.versao(tipo, instrucoes_fixas)
+        modelos = self._modelos(tipo, versao, instrucoes_fixas)
+        modelo = modelos[0]
+        chave = f"{tipo}|{modelo}|{versao}"
+
+        guardado = self._memoria.get(chave)
+        if guardado is not None:
+            if guardado[1] > time.monotonic():
+                self.stats["memoria"] += 1
+                return guardado[0]
+            del self._memoria[chave]
+
+        secoes = await self._ler_redis(chave)
+        if secoes:
+            self.stats["redis"] += 1
+        else:
+            try:
+                secoes = await asyncio.to_thread(self._ler_banco, tipo, modelo, versao)
+            except Exception as e:
+                print(f"Erro ao ler seções da petição no banco: {e}")
+                secoes = None
+            if secoes:
+                self.stats["banco"] += 1
+                await self._gravar_redis(chave, secoes)
+
+        if not secoes:
+            self.stats["ausentes"] += 1
+            self._agendar(chave, tipo, modelos, versao, instrucoes_fixas)
+            return None
+
+        return self._guardar_memoria(chave, secoes)
+
+    def _guardar_memoria(self, chave: str, secoes: Dict[str, str]) -> str:
+        texto = montar_secoes(secoes)
+        self._memoria[chave] = (texto, time.monotonic() + self._ttl())
+        return texto
+
+    @staticmethod
+    def _ttl() -> int:
+        """Tempo de memória e Redis: nunca além da validade das linhas do banco"""
+        return min(settings.secoes_cache_ttl, settings.secoes_banco_validade)
+
+    def _agendar(self, chave: str, tipo: str, modelos: List[str], versao: str, instrucoes_fixas: str) -> None:
+        if chave in self._gerando:
+            return
+        if self._adiadas.get(chave, 0.0) > time.monotonic():
+            self.stats["adiadas"] += 1
+            return
+        self._adiadas.pop(chave, None)
+        tarefa = asyncio.create_task(self._gerar(chave, tipo, modelos, versao, instrucoes_fixas))
+        self._gerando[chave] = tarefa
+        tarefa.add_done_callback(lambda _: self._gerando.pop(chave, None))
+
+    async def _gerar(self, chave: str, tipo: str, modelos: List[str], versao: str, instrucoes_fixas: str) -> None:
+        """Gera e guarda as seções de uma chave (um gerador por chave entre os processos)"""
+        # A tarefa herda o contexto da requisição que a disparou: as seções são
+        # guardadas para todos, então nada do prazo, do X-Cache-Bypass nem do
+        # tamanho resumido daquela requisição vale aqui
+        prazo.set(None)
+        ignorar_cache.set(False)
+        tamanho_resposta.set("completo")
+        if await self._falha_recente(chave):
+            self.stats["adiadas"] += 1
+            return
+        trava = f"secoes_peticao:{chave}"
+        dono = uuid.uuid4().hex
+        # None: Redis indisponível - gera mesmo assim (só a trava local deste processo)
+        obtida = await self.cache.adquirir_lock(trava, dono, 300)
+        if obtida is False:
+            return
+        try:
+            resultado = await ai_service.gerar_peticao_especializada(
+                SECOES_FIXAS.texto, "previdenciario", instrucoes_fixas=instrucoes_fixas, metodo="peticao_secoes"
+            )
+            # Resposta de contingência (ou de modelo fora da rota) não vale para esta chave
+            if resultado.get("status") != "sucesso" or resultado.get("modelo") not in modelos:
+                await self._registrar_falha(chave)
+                return
+            if resultado.get("truncada"):
+                print(f"⚠️ Aviso: seções fixas da petição ({tipo}) pararam no limite de tokens - não guardadas")
+                await self._registrar_falha(chave)
+                return
+            secoes = dividir_secoes(resultado["peticao"])
+            if secoes is None:
+                print(f"⚠️ Aviso: seções fixas da petição ({tipo}) incompletas - não guardadas")
+                await self._registrar_falha(chave)
+                return
+
+            if self._banco:
+                try:
+                    # Guardadas na chave da rota, mesmo se quem respondeu foi o fallback
+                    await asyncio.to_thread(self._gravar_banco, tipo, modelos[0], versao, secoes)
+                except Exception as e:
+                    print(f"Erro ao gravar seções da petição no banco: {e}")
+            await self._gravar_redis(chave, secoes)
+            self._guardar_memoria(chave, secoes)
+            self.stats["geradas"] += 1
+        except Exception as e:
+            print(f"Erro ao gerar seções fixas da petição ({tipo}): {e}")
+            await self._registrar_falha(chave)
+        finally:
+            if obtida:
+                await self.cache.liberar_lock(trava, dono)
+
+    async def _registrar_falha(self, chave: str) -> None:
+        """Adia novas gerações da chave por SECOES_FALHA_ESPERA (aqui e nos outros processos)"""
+        self.stats["falhas"] += 1
+        self._adiadas[chave] = time.monotonic() + settings.secoes_falha_espera
+        try:
+            await self.cache.redis_client.set(f"secoes_peticao_falha:{chave}", 1, ex=settings.secoes_falha_espera)
+        except Exception as e:
+            print(f"Erro ao registrar falha das seções da petição no cache: {e}")
+
+    async def _falha_recente(self, chave: str) -> bool:
+        """Outro processo falhou ao gerar a chave há pouco (a espera passa a valer aqui também)"""
+        try:
+            restante = await self.cache.redis_client.ttl(f"secoes_peticao_falha:{chave}")
+        except Exception:
+            return False
+        if restante is None or restante <= 0:
+            return False
+        self._adiadas[chave] = time.monotonic() + restante
+        return True
+
+    async def _ler_redis(self, chave: str) -> Optional[Dict[str, str]]:
+        try:
+            return await self.cache.redis_client.hgetall(f"secoes_peticao:{chave}") or None
+        except Exception as e:
+            print(f"Erro ao ler seções da petição no cache: {e}")
+            return None
+
+    async def _gravar_redis(self, chave: str, secoes: Dict[str, str]) -> None:
+        try:
+            async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(f"secoes_peticao:{chave}", mapping=secoes)
+                pipe.expire(f"secoes_peticao:{chave}", self._ttl())
+                await pipe.execute()
+        except Exception as e:
+            print(f"Erro ao gravar seções da petição no cache: {e}")
+
+    @staticmethod
+    def _ler_banco(tipo: str, modelo: str, versao: str) -> Optional[Dict[str, str]]:
+        """Seções ainda válidas da chave (executado em thread: SQLAlchemy síncrono)"""
+        from app.core.database import SessionLocal
+        from app.models.secao_peticao import SecaoPeticao
+
+        limite = datetime.now(timezone.utc) - timedelta(seconds=settings.secoes_banco_validade)
+        db = SessionLocal()
+        try:
+            linhas = (
+                db.query(SecaoPeticao.secao, SecaoPeticao.texto)
+                .filter(
+                    SecaoPeticao.tipo_beneficio == tipo,
+                    SecaoPeticao.modelo == modelo,
+                    SecaoPeticao.versao == versao,
+                    SecaoPeticao.created_at >= limite
+                )
+                .all()
+            )
+        finally:
+            db.close()
+        secoes = {secao: texto for secao, texto in linhas}
+        # Parte das seções vencida ou faltando: gera de novo
+        return secoes if all(nome in secoes for nome in ORDEM_SECOES) else None
+
+    @staticmethod
+    def _gravar_banco(tipo: str, modelo: str, versao: str, secoes: Dict[str, str]) -> None:
+        """Insere as seções; linha da mesma chave (vencida ou de outro processo) é sobrescrita"""
+        from sqlalchemy import func
+        from app.core.database import SessionLocal, insert_upsert
+        from app.models.secao_peticao import SecaoPeticao
+
+        comando = insert_upsert(SecaoPeticao).values([
+            {
+                "tipo_beneficio": tipo,
+                "modelo": modelo,
+                "versao": versao,
+                "secao": secao,
+                "texto": texto,
+                "tokens": contar_tokens(texto, modelo)
+            }
+            for secao, texto in secoes.items()
+        ])
+        comando = comando.on_conflict_do_update(
+            index_elements=["tipo_beneficio", "modelo", "versao", "secao"],
+            set_={
+                "texto": comando.excluded.texto,
+                "tokens": comando.excluded.tokens,
+                "created_at": func.now()
+            }
+        )
+
+        db = SessionLocal()
+        try:
+            db.execute(comando)
+            db.commit()
+        finally:
+            db.close()
+
+    def estatisticas(self) -> Dict[str, object]:
+        return {**self.stats, "em_memoria": len(self._memoria), "gerando": len(self._gerando)}
+
+
+# Instância global
+secoes_fixas = SecoesFixas(ai_service.cache)
@@ -1,13 +1,121 @@
 # app/modules/previdenciario/service.py - VERSÃO CORRIGIDA COMPLETA
 
+import asyncio
 import re
-from typing import List
+import time
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from datetime import date
 from .schemas import DadosPrevidenciarios
+from .prompts import (
+    PERSONA_TAREFA, APOSENTADORIA_INVALIDEZ, REVISAO_VIDA_TODA, APOSENTADORIA_TEMPO_CONTRIBUICAO,
+    AUXILIO_DOENCA, PENSAO_MORTE, APOSENTADORIA_ESPECIAL, BPC_LOAS, APOSENTADORIA_RURAL,
+    SALARIO_MATERNIDADE, REVISAO_BENEFICIO, SECOES_CASO, REFINAR_MODELO
+)
+from .modelos import MODELOS_PADRAO
+from .secoes import secoes_fixas, cortar_caso, juntar_secoes, CorteCaso
 from app.services.ai_service import ai_service
 from app.core.ethics import EthicsService
 from app.core.calculators.previdenciario_calculator import CalculadoraPrevidenciaria
 from app.core.validators.juridico_validator import ValidadorJuridico
+from app.core.config import settings
+from app.utils.substituicao import RemocaoSequencial, PassadaIncremental
+
+# Assinaturas escritas pela IA (a petição recebe a assinatura única no final)
+_ASSINATURA_IA = RemocaoSequencial({
+    "atenciosamente_advogado": r"Atenciosamente,\s*\n\s*Dr\.\s*\[NOME DO ADVOGADO\]",
+    "advogado_oab": r"Dr\.\s*\[NOME DO ADVOGADO\]\s*\nOAB/[A-Z]{2}\s*\[NÚMERO[^\]]*\]",
+    "atenciosamente_oab": r"Atenciosamente,\s*\n\s*[^\n]*\nOAB/[A-Z]{2}[^\n]*",
+    "oab_advogado": r"OAB/[A-Z]{2}\s*\[NÚMERO[^\]]*\]\s*\nDr\.\s*\[NOME DO ADVOGADO\]",
+    "data_oab": r"Icó/CE,\s*\d+\s*de\s*\w+\s*de\s*\d+\s*\n\s*\n\s*OAB/[A-Z]{2}",
+}, flags=re.MULTILINE | re.IGNORECASE)
+
+_NESTES_TERMOS = "Nestes termos,"
+
+
+class PeticaoIncremental:
+    """
+    Pós-processamento da petição aplicado ao stream do modelo, pedaço a pedaço:
+    tutela antecipada -> preenchimento -> remoção da assinatura da IA -> strip,
+    e no fim os pedidos finais e o disclaimer (como em _pos_processar).
+
+    - Preenchimento e remoção usam PassadaIncremental (janela de
+      PETICAO_STREAM_JANELA caracteres).
+    - Com tutela antecipada pedida, o texto a partir do primeiro "Nestes
+      termos," fica retido: a tutela entra antes do último e só se o texto
+      inteiro não a mencionar.
+    - Espaços no fim do que já saiu ficam retidos (o strip final os remove).
+    """
+
+    def __init__(self, service: "PrevidenciarioService", dados: DadosPrevidenciarios):
+        self.service = service
+        self.dados = dados
+        tabela = service._tabela_preenchimento(dados)
+        self.preencher = PassadaIncremental(
+            lambda texto: service._substituir_em_ordem(texto, tabela), settings.peticao_stream_janela
+        )
+        self.remover = PassadaIncremental(_ASSINATURA_IA.aplicar, settings.peticao_stream_janela)
+        self.bruto: List[str] = []
+        self.emitido: List[str] = []
+        self.retido = ""
+        self.travado = False
+        self.no_inicio = True
+        self.espacos = ""
+
+    def _liberar(self, pedaco: str) -> str:
+        """Texto do modelo que já pode ser processado (fora do trecho reservado à tutela)"""
+        if not self.dados.tutela_antecipada:
+            return pedaco
+        self.retido += pedaco
+        if self.travado:
+            return ""
+        posicao = self.retido.find(_NESTES_TERMOS)
+        if posicao != -1:
+            self.travado = True
+        else:
+            # "Nestes termos," pode estar chegando pela metade
+            posicao = max(0, len(self.retido) - len(_NESTES_TERMOS) + 1)
+        liberado, self.retido = self.retido[:posicao], self.retido[posicao:]
+        return liberado
+
+    def _aparar(self, texto: str, final: bool = False) -> str:
+        if self.no_inicio:
+            texto = texto.lstrip()
+            self.no_inicio = not texto
+        if final:
+            return (self.espacos + texto).rstrip() if texto else ""
+        if not texto:
+            return ""
+        texto = self.espacos + texto
+        corpo = texto.rstrip()
+        self.espacos = texto[len(corpo):]
+        return corpo
+
+    def _emitir(self, texto: str) -> str:
+        self.emitido.append(texto)
+        return texto
+
+    def alimentar(self, pedaco: str) -> str:
+        """Texto final correspondente ao que já chegou ("" se ainda depende do que vem)"""
+        self.bruto.append(pedaco)
+        preenchido = self.preencher.alimentar(self._liberar(pedaco))
+        return self._emitir(self._aparar(self.remover.alimentar(preenchido)))
+
+    def finalizar(self) -> str:
+        """Resto do texto, pedidos finais, assinatura única e disclaimer"""
+        resto = self.retido
+        if self.dados.tutela_antecipada and "tutela antecipada" not in "".join(self.bruto).lower():
+            resto = self.service._inserir_tutela_antecipada(resto, self.dados.tipo_beneficio)
+        preenchido = self.preencher.alimentar(resto) + self.preencher.finalizar()
+        removido = self.remover.alimentar(preenchido) + self.remover.finalizar()
+        texto = self._aparar(removido, final=True)
+        fechamento = f"{self.service._fechamento_pedidos(self.dados)}\n\n{EthicsService.get_disclaimer()}"
+        return self._emitir(texto + fechamento)
+
+    def divergencia(self) -> Optional[str]:
+        """Texto do pós-processamento completo se o que foi transmitido for diferente dele"""
+        esperado = self.service._pos_processar("".join(self.bruto), self.dados)
+        return None if "".join(self.emitido) == esperado else esperado
+
 
 class PrevidenciarioService:
     
@@ -15,95 +123,46 @@ class PrevidenciarioService:
         self.calc = CalculadoraPrevidenciaria()
         self.validator = ValidadorJuridico()
         self.persona_especialista = self._criar_persona_previdenciaria()
+        
+        # Tipo de petição -> prompt (o streaming usa o mesmo prompt da rota normal)
+        self.prompts = {
+            "aposentadoria_invalidez": self._prompt_aposentadoria_invalidez,
+            "revisao_vida_toda": self._prompt_revisao_vida_toda,
+            "aposentadoria_tempo_contribuicao": self._prompt_aposentadoria_tempo_contribuicao,
+            "auxilio_doenca": self._prompt_auxilio_doenca,
+            "pensao_morte": self._prompt_pensao_morte,
+            "aposentadoria_especial": self._prompt_aposentadoria_especial,
+            "bpc_loas": self._prompt_bpc_loas,
+            "aposentadoria_rural": self._prompt_aposentadoria_rural,
+            "salario_maternidade": self._prompt_salario_maternidade,
+            "revisao_beneficio": self._prompt_revisao_beneficio
+        }
+        
+        # Tipos com modelo padrão (petição sem IA) -> campos do caso + calculadoras
+        self.campos_modelo = {
+            "auxilio_doenca": self._campos_auxilio_doenca,
+            "bpc_loas": self._campos_bpc_loas,
+            "salario_maternidade": self._campos_salario_maternidade
+        }
     
     def _criar_persona_previdenciaria(self) -> str:
         """
         Define a persona especializada em Direito Previdenciário
         VERSÃO IMPESSOAL PARA COMERCIALIZAÇÃO PaaS
+        (texto compilado uma única vez em prompts.PERSONA_TAREFA)
         """
-        return """
-        PERSONA ESPECIALIZADA - ESPECIALISTA EM DIREITO PREVIDENCIÁRIO:
-        Você é um advogado sênior especialista em Direito Previdenciário com vasta experiência prática.
-        
-        EXPERTISE TÉCNICA COMPROVADA:
-        - Domínio absoluto da Lei 8.213/91, Decreto 3.048/99 e todas as alterações
-        - Conhecimento profundo da EC 103/2019 (Nova Previdência) e regras de transição
-        - Atualização constante com jurisprudência do STF, STJ, TNU e TRFs
-        - Especialização em cálculos previdenciários complexos e atuariais
-        - Experiência comprovada em milhares de casos previdenciários exitosos
-        - Conhecimento técnico de CNIS, PPP, LTCAT e documentação previdenciária
-        
-        HABILIDADES JURÍDICAS ESPECÍFICAS:
-        - Redação técnica precisa de petições iniciais conforme CPC/2015
-        - Análise minuciosa de documentos e histórico contributivo
-        - Estratégias processuais diferenciadas para cada tipo de benefício
-        - Domínio completo de precedentes, súmulas e teses de repercussão geral
-        - Conhecimento das nuances das regras de transição da EC 103/2019
-        - Expertise em conversão de tempo especial e atividade rural
-        
-        METODOLOGIA PROFISSIONAL:
-        - Fundamentação sempre baseada em jurisprudência atual e vinculante
-        - Inclusão obrigatória de cálculos precisos e planilhas técnicas
-        - Argumentação sólida sustentada por precedentes consolidados
-        - Linguagem técnica mas acessível ao poder judiciário
-        - Estrutura processual rigorosamente conforme CPC/2015 art. 319
-        - Pedidos estratégicos incluindo tutelas antecipadas quando cabíveis
-        
-        CONHECIMENTO JURISPRUDENCIAL ATUALIZADO:
-        - STF: RE 1.276.977 (Revisão da Vida Toda), RE 567.985/MT (BPC-LOAS)
-        - STJ: Precedentes sobre tempo de contribuição, atividade especial, rurais
-        - TNU: Entendimentos sobre incapacidade, perícia judicial, atividade especial
-        - TRF5: Jurisprudência regional do Nordeste sobre aposentadoria especial
-        - Precedentes locais específicos para fortalecer argumentação regional
-        - Teses de repercussão geral e recursos repetitivos atualizados
-        - Mudanças legislativas e regulamentares constantemente atualizadas
-        
-        COMPROMISSO ÉTICO PROFISSIONAL:
-        - Inclusão obrigatória de disclaimers sobre responsabilidade profissional
-        - Orientação clara sobre necessidade de revisão advocatícia qualificada
-        - Conformidade absoluta com Código de Ética e Disciplina da OAB
-        - Transparência sobre limitações da inteligência artificial
-        - Responsabilidade na orientação jurídica fornecida
-        
-        ESTILO DE REDAÇÃO TÉCNICA:
-        - Linguagem jurídica precisa, técnica e persuasiva
-        - Estrutura lógica com fundamentação escalonada
-        - Citações corretas e completas de jurisprudência
-        - Argumentação convincente baseada em precedentes
-        - Pedidos claros, específicos e juridicamente viáveis
-        - Tom respeitoso mas firme perante o poder judiciário
-        
-        INSTRUÇÕES CRÍTICAS PARA PLACEHOLDERS:
-        - SEMPRE use placeholders padronizados em vez de inventar dados
-        - Comarca: use "[INSERIR COMARCA]" em vez de inventar cidade
-        - Endereço do autor: use "[INSERIR ENDEREÇO COMPLETO]" 
-        - Endereço do INSS: use "[INSERIR ENDEREÇO DO INSS]"
-        - Nome do advogado: use "[NOME DO ADVOGADO]"
-        - OAB: use "OAB/[UF] [NÚMERO]"
-        - Data e local: use "[INSERIR LOCAL E DATA]"
-        
-        NUNCA invente dados que não foram fornecidos. Use SEMPRE os placeholders listados.
-        """
+        return PERSONA_TAREFA.secoes["persona"]
     
-    def _aplicar_persona_especializada(self, prompt_base: str) -> str:
+    def _aplicar_persona_especializada(self, prompt_base: Dict[str, str]) -> Dict[str, str]:
         """
         Aplica a persona especializada ao prompt
+        Persona, instruções e a parte fixa da petição formam o prefixo estático
+        (igual em toda chamada do mesmo tipo); os dados do caso seguem no final
         """
-        return f"""
-        {self.persona_especialista}
-        
-        TAREFA ESPECÍFICA SOLICITADA:
-        {prompt_base}
-        
-        INSTRUÇÕES TÉCNICAS OBRIGATÓRIAS:
-        - Utilize toda sua expertise previdenciária para criar uma petição tecnicamente perfeita
-        - Inclua jurisprudência específica, atual e vinculante para o caso concreto
-        - Mantenha linguagem profissional, técnica e persuasiva
-        - Estruture rigorosamente conforme as melhores práticas processuais
-        - Demonstre conhecimento profundo e atualizado da matéria previdenciária
-        - Inclua argumentação estratégica que maximize as chances de êxito
-        - Fundamente todos os pedidos com base legal e jurisprudencial sólida
-        """
+        return {
+            "instrucoes_fixas": PERSONA_TAREFA.preencher(tarefa=prompt_base["estatico"]),
+            "prompt": prompt_base["dinamico"]
+        }
     
     def _formatar_cpf(self, cpf) -> str:
         """Formata CPF com pontos e hífen"""
@@ -222,21 +281,8 @@ Advogado do Requerente
 """
 
     def _remover_assinatura_ia(self, template: str) -> str:
-        """Remove assinatura gerada pela IA para evitar duplicação"""
-        
-        # Padrões mais robustos
-        padroes_remover = [
-            r"Atenciosamente,\s*\n\s*Dr\.\s*\[NOME DO ADVOGADO\]",
-            r"Dr\.\s*\[NOME DO ADVOGADO\]\s*\nOAB/[A-Z]{2}\s*\[NÚMERO[^\]]*\]",
-            r"Atenciosamente,\s*\n\s*[^\n]*\nOAB/[A-Z]{2}[^\n]*",
-            r"OAB/[A-Z]{2}\s*\[NÚMERO[^\]]*\]\s*\nDr\.\s*\[NOME DO ADVOGADO\]",  # NOVO
-            r"Icó/CE,\s*\d+\s*de\s*\w+\s*de\s*\d+\s*\n\s*\n\s*OAB/[A-Z]{2}",  # NOVO
-        ]
-        
-        for padrao in padroes_remover:
-            template = re.sub(padrao, "", template, flags=re.MULTILINE | re.IGNORECASE)
-        
-        return template.strip()
+        """Remove assinatura gerada pela IA para evitar duplicação (padrões em _ASSINATURA_IA, em ordem)"""
+        return _ASSINATURA_IA.aplicar(template).strip()
 
     def _gerar_pedidos_completos(self, dados: DadosPrevidenciarios, pedidos_base: str) -> str:
         """Gera pedidos com DIB e justiça gratuita"""
@@ -244,6 +290,11 @@ Advogado do Requerente
         # REMOVER ASSINATURA DA IA PRIMEIRO
         pedidos_base = self._remover_assinatura_ia(pedidos_base)
         
+        return f"{pedidos_base}{self._fechamento_pedidos(dados)}"
+
+    def _fechamento_pedidos(self, dados: DadosPrevidenciarios) -> str:
+        """Pedidos finais (DIB, justiça gratuita, custas) e a assinatura única, acrescentados ao texto da IA"""
+        
         # Adicionar DIB se disponível
         dib_pedido = ""
         if hasattr(dados, 'dib') and dados.dib:
@@ -259,16 +310,22 @@ d) Que seja deferido o benefício da justiça gratuita, nos termos da Lei 1.060/
         # Adicionar assinatura única
         assinatura = self._gerar_assinatura_unica(dados)
         
-        return f"""{pedidos_base}{dib_pedido}{justica_gratuita}
+        return f"""{dib_pedido}{justica_gratuita}
 
 e) Que sejam juntados aos autos todos os documentos e informações constantes do processo administrativo;
 
 f) A condenação da parte requerida ao pagamento das custas processuais e honorários advocatícios, nos termos do art. 85 do CPC.{assinatura}"""
 
-    def _preencher_template(self, template: str, dados: DadosPrevidenciarios) -> str:
+    def _preencher_template(
+        self,
+        template: str,
+        dados: DadosPrevidenciarios,
+        tabela: Optional[Dict[str, str]] = None
+    ) -> str:
         """
         Preenche automaticamente os placeholders do template
         VERSÃO CORRIGIDA COMPLETA - TODOS OS PADRÕES
+        (`tabela`: _tabela_preenchimento já calculada para os mesmos dados)
         """
         
         # ADICIONAR CORREÇÕES CRÍTICAS:
@@ -279,6 +336,19 @@ f) A condenação da parte requerida ao pagamento das custas processuais e honor
             if "tutela antecipada" not in template.lower():
                 template = self._inserir_tutela_antecipada(template, dados.tipo_beneficio)
         
+        return self._substituir_em_ordem(template, tabela or self._tabela_preenchimento(dados))
+
+    @staticmethod
+    def _substituir_em_ordem(template: str, replacements: Dict[str, str]) -> str:
+        # Em ordem: o valor de uma chave pode formar uma chave seguinte
+        for placeholder, valor in replacements.items():
+            template = template.replace(placeholder, valor)
+        
+        return template
+    
+    def _tabela_preenchimento(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Placeholders e valores do caso, na ordem em que são aplicados"""
+        
         # 2. CORREÇÃO CPF/RG (CRÍTICO)
         cpf_formatado = self._formatar_cpf(dados.cpf)
         rg_numero = dados.rg or "DOCUMENTO A INFORMAR"
@@ -506,62 +576,65 @@ f) A condenação da parte requerida ao pagamento das custas processuais e honor
             "endereço profissional na com sede em Brasília/DF": f"escritório profissional à {endereco_completo}",
         }
         
-        # Aplicar substituições
-        for placeholder, valor in replacements.items():
-            template = template.replace(placeholder, valor)
-        
-        return template
+        return replacements
     
-    async def gerar_peticao_aposentadoria_invalidez(self, dados: DadosPrevidenciarios) -> str:
-        """Gera petição para aposentadoria por invalidez com persona especializada"""
-        
-        # Integração das calculadoras - CORRIGIDO
-        tempo_validado = "Não aplicável para invalidez"
-        valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=12, valor_mensal=2500.00)
-        
-        prompt_base = f"""
-        Elabore uma petição inicial para APOSENTADORIA POR INVALIDEZ com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Tipo de benefício: {dados.tipo_beneficio}
-        - DER (Data de Entrada do Requerimento): {dados.der}
-        - Motivo da recusa administrativa: {dados.motivo_recusa}
-        - CID principal: {dados.cid_principal or 'A definir conforme laudos médicos'}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        - Informações médicas detalhadas: {dados.informacoes_medicas or 'A detalhar conforme documentação médica'}
-        - Histórico laboral: {dados.historico_laboral or 'A informar'}
-        - Atividade especial prévia: {"Sim" if dados.atividade_especial else "Não"}
-        - Exposição ocupacional: {dados.exposicao_agentes_nocivos or 'Não informado'}
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar rigorosamente com art. 42 da Lei 8.213/91
-        - Citar jurisprudência específica da TNU sobre incapacidade permanente e total
-        - Incluir pedido de tutela antecipada com fundamentação técnica sólida
-        - Demonstrar conhecimento especializado sobre incapacidade laboral
-        - Estruturar conforme CPC/2015 art. 319 com precisão técnica
-        - Argumentar sobre integralidade do salário de benefício (100% da média)
-        - Incluir pedido de perícia médica judicial se necessário
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Tempo validado: {tempo_validado}
-        - Documentos médicos: {', '.join(dados.laudos_medicos) if dados.laudos_medicos else 'Laudos médicos a anexar'}
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - TNU, PEDILEF sobre incapacidade permanente
-        - STJ sobre aposentadoria por invalidez
-        - Precedentes sobre perícia médica judicial vs administrativa
+    @staticmethod
+    def _prompt_caso(prompt_completo: Dict[str, str]) -> str:
+        """Dados do caso + pedido só de qualificação e fatos (o prefixo estático não muda)"""
+        return f"{prompt_completo['prompt']}\n\n{SECOES_CASO.texto}"
+    
+    async def _gerar_peticao(
+        self,
+        tipo: str,
+        dados: DadosPrevidenciarios,
+        tabela: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Gera o texto com a IA e aplica o pós-processamento"""
+        peticao, _ = await self._gerar_peticao_com_status(tipo, dados, tabela)
+        return peticao
+    
+    async def _gerar_peticao_com_status(
+        self,
+        tipo: str,
+        dados: DadosPrevidenciarios,
+        tabela: Optional[Dict[str, str]] = None
+    ) -> Tuple[str, str]:
         """
-        
-        # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
+        Texto pós-processado e status da chamada à IA (fora de "sucesso" o texto
+        é a mensagem de contingência). Com as seções fixas do tipo já guardadas,
+        o modelo redige só qualificação e fatos.
+        """
+        prompt_completo = self.prompts[tipo](dados)
+        fixas = await secoes_fixas.obter(tipo, prompt_completo["instrucoes_fixas"])
+        if fixas is not None:
+            resultado = await ai_service.gerar_peticao_especializada(
+                self._prompt_caso(prompt_completo), "previdenciario",
+                instrucoes_fixas=prompt_completo["instrucoes_fixas"],
+                metodo="peticao_caso", max_tokens=settings.secoes_caso_max_tokens
+            )
+            peticao = resultado.get("peticao", "Erro ao gerar petição")
+            status = resultado.get("status", "erro")
+            if status == "sucesso":
+                caso = cortar_caso(peticao)
+                peticao = caso + juntar_secoes(caso, fixas)
+            return self._pos_processar(peticao, dados, tabela), status
+        
+        resultado = await ai_service.gerar_peticao_especializada(
+            prompt_completo["prompt"], "previdenciario", instrucoes_fixas=prompt_completo["instrucoes_fixas"]
+        )
         peticao = resultado.get("peticao", "Erro ao gerar petição")
+        return self._pos_processar(peticao, dados, tabela), resultado.get("status", "erro")
+    
+    def _pos_processar(
+        self,
+        peticao: str,
+        dados: DadosPrevidenciarios,
+        tabela: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Placeholders, pedidos finais com assinatura única e disclaimer"""
         
         # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
+        peticao = self._preencher_template(peticao, dados, tabela)
         
         # Aplicar pedidos completos com DIB e justiça gratuita
         peticao = self._gerar_pedidos_completos(dados, peticao)
@@ -569,244 +642,287 @@ f) A condenação da parte requerida ao pagamento das custas processuais e honor
         peticao += f"\n\n{EthicsService.get_disclaimer()}"
         return peticao
     
+    async def gerar_peticao_stream(self, tipo: str, dados: DadosPrevidenciarios) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Petição em streaming: eventos 'token' com o texto já pós-processado
+        (PeticaoIncremental) e um evento 'fim'. O texto completo é igual ao
+        da geração sem streaming (inclusive com as seções fixas em cache:
+        os fatos chegam do modelo e as seções guardadas são anexadas no fim).
+        """
+        prompt_completo = self.prompts[tipo](dados)
+        fixas = await secoes_fixas.obter(tipo, prompt_completo["instrucoes_fixas"])
+        if fixas is None:
+            corte = None
+            eventos = ai_service.gerar_peticao_especializada_stream(
+                prompt_completo["prompt"], "previdenciario", instrucoes_fixas=prompt_completo["instrucoes_fixas"]
+            )
+        else:
+            corte = CorteCaso()
+            eventos = ai_service.gerar_peticao_especializada_stream(
+                self._prompt_caso(prompt_completo), "previdenciario",
+                instrucoes_fixas=prompt_completo["instrucoes_fixas"],
+                metodo="peticao_caso", max_tokens=settings.secoes_caso_max_tokens
+            )
+        
+        incremental = PeticaoIncremental(self, dados)
+        recebido = False
+        async for evento in eventos:
+            if evento["evento"] == "token":
+                recebido = True
+                texto = corte.alimentar(evento["conteudo"]) if corte else evento["conteudo"]
+                texto = incremental.alimentar(texto) if texto else ""
+                if texto:
+                    yield {"evento": "token", "conteudo": texto}
+                continue
+            
+            # Erro antes do texto: como no modo normal, a mensagem vira o corpo da petição
+            erro_sem_texto = bool(evento.get("erro")) and not recebido
+            if erro_sem_texto:
+                incremental.alimentar(evento["erro"])
+            if erro_sem_texto or evento.get("status") in ("sucesso", "degradado"):
+                texto = ""
+                if corte is not None and not erro_sem_texto:
+                    resto = corte.finalizar()
+                    if evento.get("status") == "sucesso":
+                        resto += juntar_secoes(corte.caso, fixas)
+                    texto = incremental.alimentar(resto)
+                yield {"evento": "token", "conteudo": texto + incremental.finalizar()}
+                esperado = incremental.divergencia()
+                if esperado is not None:
+                    # Trecho reconhecido maior que a janela: o cliente troca o texto pelo completo
+                    print(f"⚠️ Streaming da petição divergiu do pós-processamento completo ({tipo})")
+                    evento = {**evento, "texto_peticao": esperado, "reescrever": True}
+            yield {**evento, "tipo": f"peticao_{tipo}", "secoes_cache": fixas is not None}
+    
+    async def gerar_peticoes_multiplas(self, tipos: List[str], dados: DadosPrevidenciarios) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Petições de vários benefícios para o mesmo cliente (comparar alternativas):
+        até PETICOES_MULTIPLAS_CONCORRENCIA em paralelo, um evento 'peticao' por
+        tipo assim que fica pronto (com o status da IA; fora de "sucesso" conta
+        como erro) e um evento 'fim'. A tabela de preenchimento
+        (CPF, cidade/UF, valores, data) é montada uma vez para todas; o prefixo
+        estático de cada tipo começa pela mesma persona (cache de prefixo).
+        """
+        tabela = self._tabela_preenchimento(dados)
+        semaforo = asyncio.BoundedSemaphore(settings.peticoes_multiplas_concorrencia)
+        inicio = time.perf_counter()
+        
+        async def gerar(tipo: str) -> Dict[str, Any]:
+            async with semaforo:
+                comeco = time.perf_counter()
+                evento: Dict[str, Any] = {"evento": "peticao", "tipo": f"peticao_{tipo}"}
+                try:
+                    evento["texto_peticao"], evento["status"] = await self._gerar_peticao_com_status(tipo, dados, tabela)
+                except Exception as e:
+                    evento["erro"] = str(e)
+                    evento["status"] = "erro"
+                evento["segundos"] = round(time.perf_counter() - comeco, 3)
+                return evento
+        
+        tarefas = [asyncio.create_task(gerar(tipo)) for tipo in tipos]
+        erros = 0
+        try:
+            for ordem, proxima in enumerate(asyncio.as_completed(tarefas), 1):
+                evento = await proxima
+                erros += evento["status"] != "sucesso"
+                yield {**evento, "ordem": ordem}
+        finally:
+            # Cliente desconectou: as gerações que faltam não seguem consumindo tokens
+            for tarefa in tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+        
+        yield {
+            "evento": "fim",
+            "status": "sucesso" if not erros else ("erro" if erros == len(tipos) else "parcial"),
+            "tipos": [f"peticao_{tipo}" for tipo in tipos],
+            "erros": erros,
+            "segundos": round(time.perf_counter() - inicio, 3)
+        }
+    
+    def renderizar_modelo_padrao(self, tipo: str, dados: DadosPrevidenciarios) -> str:
+        """Texto do modelo padrão do tipo (campos + calculadoras), ainda com os placeholders [INSERIR ...]"""
+        if tipo not in MODELOS_PADRAO:
+            raise ValueError(f"Não há modelo padrão para petição do tipo '{tipo}'")
+        campos = self.campos_modelo[tipo](dados)
+        valores = {campo: "não informado" if valor is None else valor for campo, valor in campos.items()}
+        valores["valor_causa_formatado"] = self._formatar_valor_monetario(campos["valor_causa"])
+        valores["especialidade_perito"] = dados.especialidade_perito or "especialista na enfermidade do(a) Autor(a)"
+        valores["contribuicoes_cnis"] = (
+            f"{dados.tempo_contribuicao_total} contribuições mensais registradas no CNIS"
+            if dados.tempo_contribuicao_total else "as contribuições registradas no CNIS"
+        )
+        return MODELOS_PADRAO[tipo].preencher(**valores)
+    
+    async def gerar_peticao_modelo_padrao(self, tipo: str, dados: DadosPrevidenciarios, refinar: bool = False) -> Dict[str, Any]:
+        """
+        Petição pelo modelo padrão: sem chamada à IA, mesmo pós-processamento da geração normal.
+        refinar=True: a IA revisa a redação do texto montado antes do preenchimento (nome,
+        CPF e endereço ainda são placeholders); se a revisão falhar, fica o texto do modelo.
+        """
+        texto = self.renderizar_modelo_padrao(tipo, dados)
+        refinada = False
+        if refinar:
+            prompt_completo = self._aplicar_persona_especializada(REFINAR_MODELO.preencher_partes(peticao=texto))
+            resultado = await ai_service.gerar_peticao_especializada(
+                prompt_completo["prompt"], "previdenciario",
+                instrucoes_fixas=prompt_completo["instrucoes_fixas"], metodo="peticao_refino"
+            )
+            if resultado.get("status") == "sucesso" and resultado.get("peticao"):
+                texto = resultado["peticao"]
+                refinada = True
+        
+        modelo = MODELOS_PADRAO[tipo]
+        return {
+            "peticao": self._pos_processar(texto, dados),
+            "modelo_padrao": f"{modelo.nome}@{modelo.versao}",
+            "refinada": refinada
+        }
+    
+    async def gerar_peticao_aposentadoria_invalidez(self, dados: DadosPrevidenciarios) -> str:
+        """Gera petição para aposentadoria por invalidez com persona especializada"""
+        return await self._gerar_peticao("aposentadoria_invalidez", dados)
+
+    def _prompt_aposentadoria_invalidez(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
+        
+        # Integração das calculadoras - CORRIGIDO
+        tempo_validado = "Não aplicável para invalidez"
+        valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=12, valor_mensal=2500.00)
+        
+        prompt_base = APOSENTADORIA_INVALIDEZ.preencher_partes(
+            tipo_beneficio=dados.tipo_beneficio,
+            der=dados.der,
+            motivo_recusa=dados.motivo_recusa,
+            cid_principal=dados.cid_principal or 'A definir conforme laudos médicos',
+            nome=getattr(dados, 'nome', 'A informar'),
+            cpf=getattr(dados, 'cpf', 'A informar'),
+            informacoes_medicas=dados.informacoes_medicas or 'A detalhar conforme documentação médica',
+            historico_laboral=dados.historico_laboral or 'A informar',
+            atividade_especial="Sim" if dados.atividade_especial else "Não",
+            exposicao_agentes_nocivos=dados.exposicao_agentes_nocivos or 'Não informado',
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado,
+            laudos_medicos=', '.join(dados.laudos_medicos) if dados.laudos_medicos else 'Laudos médicos a anexar'
+        )
+        
+        # Aplicar persona especializada
+        return self._aplicar_persona_especializada(prompt_base)
+    
     async def gerar_peticao_revisao_vida_toda(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para Revisão da Vida Toda com persona especializada"""
+        return await self._gerar_peticao("revisao_vida_toda", dados)
+
+    def _prompt_revisao_vida_toda(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = self.validator.converter_tempo_especial(dados.tempo_contribuicao_total or 0)
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=24, valor_mensal=3000.00)
         
-        prompt_base = f"""
-        Elabore uma petição inicial para REVISÃO DA VIDA TODA com base na decisão do STF e nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Número do benefício: {dados.numero_beneficio or 'A informar'}
-        - DIB (Data de Início do Benefício): {dados.dib or 'A informar'}
-        - DER original: {dados.der}
-        - Tempo total de contribuição: {dados.tempo_contribuicao_total or 0} meses
-        - Histórico contributivo detalhado: {dados.historico_contribuicoes or 'A detalhar'}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - Motivo da revisão: {dados.motivo_recusa}
-        
-        FUNDAMENTOS TÉCNICOS ESPECÍFICOS:
-        - STF RE 1.276.977 com repercussão geral (Tema 1102)
-        - Inclusão obrigatória de salários anteriores a julho/1994
-        - Demonstração de cálculo mais benéfico ao segurado
-        - Aplicação da prescrição quinquenal apenas às parcelas vencidas
-        - Análise técnica do período pré-Plano Real
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com a decisão específica do STF RE 1.276.977
-        - Demonstrar conhecimento técnico sobre cálculo previdenciário
-        - Incluir simulação comparativa obrigatória
-        - Citar precedentes sobre prescrição quinquenal
-        - Estruturar argumentação sobre direito adquirido
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Tempo validado: {tempo_validado} meses
-        - Período contributivo relevante: Anterior a julho/1994
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STF RE 1.276.977 (Tema 1102) - texto integral da decisão
-        - Precedentes sobre prescrição quinquenal
-        - Decisões sobre direito adquirido previdenciário
-        """
+        prompt_base = REVISAO_VIDA_TODA.preencher_partes(
+            numero_beneficio=dados.numero_beneficio or 'A informar',
+            dib=dados.dib or 'A informar',
+            der=dados.der,
+            tempo_contribuicao=dados.tempo_contribuicao_total or 0,
+            historico_contribuicoes=dados.historico_contribuicoes or 'A detalhar',
+            nome=getattr(dados, 'nome', 'A informar'),
+            motivo_recusa=dados.motivo_recusa,
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado
+        )
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_aposentadoria_tempo_contribuicao(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para aposentadoria por tempo de contribuição com persona especializada"""
+        return await self._gerar_peticao("aposentadoria_tempo_contribuicao", dados)
+
+    def _prompt_aposentadoria_tempo_contribuicao(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = self.validator.converter_tempo_especial(dados.tempo_contribuicao_total or 0)
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=18, valor_mensal=2800.00)
         
-        prompt_base = f"""
-        Elabore uma petição inicial para APOSENTADORIA POR TEMPO DE CONTRIBUIÇÃO com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Tempo total comprovado: {dados.tempo_contribuicao_total or 0} meses ({(dados.tempo_contribuicao_total or 0) // 12} anos)
-        - DER (Data de Entrada do Requerimento): {dados.der}
-        - Motivo da recusa administrativa: {dados.motivo_recusa}
-        - Histórico contributivo: {dados.historico_contribuicoes or 'A detalhar conforme CNIS'}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - Homem: 35 anos de contribuição (420 meses) - Verificar cumprimento
-        - Mulher: 30 anos de contribuição (360 meses) - Verificar cumprimento
-        - Carência mínima: 180 contribuições mensais
-        - Qualidade de segurado na DER
-        - Análise das regras de transição da EC 103/2019
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.213/91 arts. 52, 53 e 55
-        - Analisar aplicabilidade das regras de transição EC 103/2019
-        - Demonstrar conhecimento sobre contagem de tempo de contribuição
-        - Incluir análise técnica do CNIS e vínculos
-        - Estruturar conforme CPC/2015 com precisão processual
-        - Argumentar sobre fator previdenciário se aplicável
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Tempo validado: {tempo_validado} meses
-        - Análise de suficiência do tempo de contribuição
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STJ sobre contagem integral do tempo de contribuição
-        - Precedentes sobre reconhecimento de vínculos
-        - Decisões sobre aplicação do fator previdenciário
-        """
+        prompt_base = APOSENTADORIA_TEMPO_CONTRIBUICAO.preencher_partes(
+            tempo_contribuicao=dados.tempo_contribuicao_total or 0,
+            tempo_contribuicao_anos=(dados.tempo_contribuicao_total or 0) // 12,
+            der=dados.der,
+            motivo_recusa=dados.motivo_recusa,
+            historico_contribuicoes=dados.historico_contribuicoes or 'A detalhar conforme CNIS',
+            nome=getattr(dados, 'nome', 'A informar'),
+            cpf=getattr(dados, 'cpf', 'A informar'),
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado
+        )
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_auxilio_doenca(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para auxílio-doença com persona especializada"""
+        return await self._gerar_peticao("auxilio_doenca", dados)
+
+    def _campos_auxilio_doenca(self, dados: DadosPrevidenciarios) -> Dict[str, Any]:
+        """Campos do caso e saídas das calculadoras (usados pelo prompt e pelo modelo padrão)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = "Carência: 12 contribuições mensais"
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=6, valor_mensal=1800.00)
         
-        prompt_base = f"""
-        Elabore uma petição inicial para AUXÍLIO-DOENÇA com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - DER (Data de Entrada do Requerimento): {dados.der}
-        - CID principal: {dados.cid_principal or 'A definir conforme laudos médicos'}
-        - Motivo da recusa administrativa: {dados.motivo_recusa}
-        - Informações médicas detalhadas: {dados.informacoes_medicas or 'A detalhar conforme documentação'}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        - Histórico laboral: {dados.historico_laboral or 'A informar'}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - Incapacidade temporária para o trabalho habitual
-        - Carência: 12 contribuições mensais (exceto acidente)
-        - Qualidade de segurado na DII (Data de Início da Incapacidade)
-        - Comprovação médica da incapacidade laboral
-        - Análise da atividade habitual do segurado
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar rigorosamente com Lei 8.213/91 art. 59
-        - Demonstrar conhecimento sobre incapacidade temporária vs permanente
-        - Incluir pedido OBRIGATÓRIO de tutela antecipada
-        - Argumentar sobre prevalência da perícia judicial
-        - Citar precedentes sobre natureza alimentar do benefício
-        - Incluir pedido de perícia médica judicial
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Carência validada: {tempo_validado}
-        - Documentos médicos: {', '.join(dados.laudos_medicos) if dados.laudos_medicos else 'Laudos médicos a anexar'}
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - TNU sobre prevalência da perícia judicial vs administrativa
-        - STJ sobre natureza alimentar do auxílio-doença
-        - Precedentes sobre tutela antecipada em benefícios por incapacidade
-        """
+        return {
+            "der": dados.der,
+            "cid_principal": dados.cid_principal or 'A definir conforme laudos médicos',
+            "motivo_recusa": dados.motivo_recusa,
+            "informacoes_medicas": dados.informacoes_medicas or 'A detalhar conforme documentação',
+            "nome": getattr(dados, 'nome', 'A informar'),
+            "cpf": getattr(dados, 'cpf', 'A informar'),
+            "historico_laboral": dados.historico_laboral or 'A informar',
+            "valor_causa": valor_causa,
+            "tempo_validado": tempo_validado,
+            "laudos_medicos": ', '.join(dados.laudos_medicos) if dados.laudos_medicos else 'Laudos médicos a anexar'
+        }
+
+    def _prompt_auxilio_doenca(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
+        prompt_base = AUXILIO_DOENCA.preencher_partes(**self._campos_auxilio_doenca(dados))
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_pensao_morte(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para pensão por morte com persona especializada"""
+        return await self._gerar_peticao("pensao_morte", dados)
+
+    def _prompt_pensao_morte(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = "Carência dispensada para pensão por morte"
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=12, valor_mensal=2200.00)
         
-        prompt_base = f"""
-        Elabore uma petição inicial para PENSÃO POR MORTE com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Data do óbito: {dados.der}
-        - Motivo da recusa administrativa: {dados.motivo_recusa}
-        - Relação de parentesco: {dados.historico_laboral or 'A informar conforme documentação'}
-        - Informações sobre dependência: {dados.informacoes_medicas or 'A comprovar'}
-        - Nome do dependente: {getattr(dados, 'nome', 'A informar')}
-        - CPF do dependente: {getattr(dados, 'cpf', 'A informar')}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - Qualidade de segurado do instituidor na data do óbito
-        - Dependência econômica (presumida para cônjuge/companheiro)
-        - Carência dispensada para pensão por morte
-        - Comprovação do óbito e da relação de dependência
-        - Análise da cota-parte se múltiplos dependentes
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.213/91 arts. 74 a 79
-        - Demonstrar conhecimento sobre classes de dependentes (art. 16)
-        - Argumentar sobre presunção de dependência econômica
-        - Incluir análise sobre duração do benefício conforme EC 103/2019
-        - Citar precedentes sobre qualidade de segurado do instituidor
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Carência: {tempo_validado}
-        - DIB: Data do óbit como regra geral
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STJ sobre presunção de dependência econômica do cônjuge
-        - Precedentes sobre qualidade de segurado do instituidor
-        - Decisões sobre duração da pensão por morte
-        """
+        prompt_base = PENSAO_MORTE.preencher_partes(
+            der=dados.der,
+            motivo_recusa=dados.motivo_recusa,
+            historico_laboral=dados.historico_laboral or 'A informar conforme documentação',
+            informacoes_medicas=dados.informacoes_medicas or 'A comprovar',
+            nome=getattr(dados, 'nome', 'A informar'),
+            cpf=getattr(dados, 'cpf', 'A informar'),
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado
+        )
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_aposentadoria_especial(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para aposentadoria especial com persona especializada"""
+        return await self._gerar_peticao("aposentadoria_especial", dados)
+
+    def _prompt_aposentadoria_especial(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = self.validator.converter_tempo_especial(dados.tempo_contribuicao_total or 0)
@@ -823,306 +939,131 @@ f) A condenação da parte requerida ao pagamento das custas processuais e honor
                 valor_mensal=valor_mensal_estimado
             )
         
-        prompt_base = f"""
-        Elabore uma petição inicial para APOSENTADORIA ESPECIAL com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Tempo especial comprovado: {dados.tempo_contribuicao_total or 0} meses ({(dados.tempo_contribuicao_total or 0) // 12} anos)
-        - Atividade especial confirmada: {"Sim" if dados.atividade_especial else "Não"}
-        - Agentes nocivos específicos: {dados.exposicao_agentes_nocivos or 'A especificar conforme PPP/LTCAT'}
-        - DER: {dados.der}
-        - Motivo da recusa: {dados.motivo_recusa}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - 15, 20 ou 25 anos conforme grau de nocividade do agente
-        - Exposição habitual, permanente e não ocasional
-        - Comprovação através de PPP e LTCAT válidos
-        - Análise das regras de transição da EC 103/2019
-        - Eficácia dos equipamentos de proteção individual
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.213/91 art. 57 e EC 103/2019
-        - Demonstrar conhecimento técnico sobre agentes nocivos
-        - Incluir análise das regras de transição aplicáveis
-        - Argumentar sobre conversão subsidiária de tempo especial
-        - OBRIGATÓRIO: Incluir pedido de conversão de tempo comum em especial
-        - Mencionar possibilidade de períodos híbridos (comum + especial)
-        - Citar precedentes sobre PPP e LTCAT
-        - Incluir pedido de perícia técnica se necessário
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Tempo especial validado: {tempo_validado} meses
-        - Análise de suficiência do tempo especial
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STJ sobre exposição habitual e permanente a agentes nocivos
-        - TNU sobre validade de PPP e LTCAT
-        - Precedentes sobre regras de transição da EC 103/2019
-        - TRF5: Decisões regionais sobre aposentadoria especial no Nordeste
-        
-        DOCUMENTOS OBRIGATÓRIOS A MENCIONAR:
-        - PPP (Perfil Profissiográfico Previdenciário)
-        - LTCAT (Laudo Técnico das Condições Ambientais do Trabalho)
-        - CNIS (Cadastro Nacional de Informações Sociais)
-        - Laudos médicos (audiometria, exames ocupacionais)
-        - Carteira de Trabalho e documentos pessoais
-        """
+        prompt_base = APOSENTADORIA_ESPECIAL.preencher_partes(
+            tempo_contribuicao=dados.tempo_contribuicao_total or 0,
+            tempo_contribuicao_anos=(dados.tempo_contribuicao_total or 0) // 12,
+            atividade_especial="Sim" if dados.atividade_especial else "Não",
+            exposicao_agentes_nocivos=dados.exposicao_agentes_nocivos or 'A especificar conforme PPP/LTCAT',
+            der=dados.der,
+            motivo_recusa=dados.motivo_recusa,
+            nome=getattr(dados, 'nome', 'A informar'),
+            cpf=getattr(dados, 'cpf', 'A informar'),
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado
+        )
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_bpc_loas(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para BPC-LOAS com persona especializada"""
+        return await self._gerar_peticao("bpc_loas", dados)
+
+    def _campos_bpc_loas(self, dados: DadosPrevidenciarios) -> Dict[str, Any]:
+        """Campos do caso e saídas das calculadoras (usados pelo prompt e pelo modelo padrão)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = "Não há carência para BPC-LOAS"
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=12, valor_mensal=1412.00)  # 1 SM
         
-        prompt_base = f"""
-        Elabore uma petição inicial para BPC-LOAS (Benefício de Prestação Continuada) com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Tipo de benefício: {dados.tipo_beneficio}
-        - CID principal: {dados.cid_principal or 'A definir conforme avaliação médica'}
-        - Situação de renda familiar: {dados.informacoes_medicas or 'A comprovar conforme documentação'}
-        - Motivo da recusa: {dados.motivo_recusa}
-        - Nome do requerente: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        - DER: {dados.der}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - Pessoa com deficiência ou idoso com 65+ anos
-        - Renda familiar per capita inferior a 1/4 do salário mínimo
-        - Não recebimento de qualquer outro benefício previdenciário
-        - Avaliação biopsicossocial da deficiência
-        - Análise da composição do grupo familiar
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.742/93 (LOAS) art. 20
-        - Demonstrar conhecimento sobre critério de miserabilidade
-        - Incluir pedido OBRIGATÓRIO de tutela antecipada
-        - Argumentar sobre flexibilização do critério de renda (STF)
-        - Citar Estatuto da Pessoa com Deficiência (Lei 13.146/2015)
-        - Incluir pedido de avaliação social e médica
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Valor do benefício: 1 salário mínimo mensal
-        - Carência: {tempo_validado}
-        - Documentos médicos: {', '.join(dados.laudos_medicos) if dados.laudos_medicos else 'Laudos médicos a anexar'}
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STF RE 567.985/MT sobre flexibilização do critério de miserabilidade
-        - Precedentes sobre avaliação biopsicossocial da deficiência
-        - Decisões sobre composição do grupo familiar
-        """
+        return {
+            "tipo_beneficio": dados.tipo_beneficio,
+            "cid_principal": dados.cid_principal or 'A definir conforme avaliação médica',
+            "informacoes_medicas": dados.informacoes_medicas or 'A comprovar conforme documentação',
+            "motivo_recusa": dados.motivo_recusa,
+            "nome": getattr(dados, 'nome', 'A informar'),
+            "cpf": getattr(dados, 'cpf', 'A informar'),
+            "der": dados.der,
+            "valor_causa": valor_causa,
+            "tempo_validado": tempo_validado,
+            "laudos_medicos": ', '.join(dados.laudos_medicos) if dados.laudos_medicos else 'Laudos médicos a anexar'
+        }
+
+    def _prompt_bpc_loas(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
+        prompt_base = BPC_LOAS.preencher_partes(**self._campos_bpc_loas(dados))
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_aposentadoria_rural(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para aposentadoria híbrida/rural com persona especializada"""
+        return await self._gerar_peticao("aposentadoria_rural", dados)
+
+    def _prompt_aposentadoria_rural(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = self.validator.converter_tempo_especial(dados.tempo_contribuicao_total or 0)
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=15, valor_mensal=2400.00)
         
-        prompt_base = f"""
-        Elabore uma petição inicial para APOSENTADORIA HÍBRIDA/RURAL com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Tempo rural alegado: {dados.historico_laboral or 'A comprovar conforme documentação'}
-        - Tempo urbano comprovado: {dados.tempo_contribuicao_total or 0} meses
-        - DER: {dados.der}
-        - Atividade rural detalhada: {dados.exposicao_agentes_nocivos or 'A detalhar conforme período'}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        - Motivo da recusa: {dados.motivo_recusa}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - Somatória de tempo rural + urbano para atingir carência
-        - Comprovação de atividade rural por início de prova material + testemunhal
-        - Carência conforme período de filiação
-        - Idade mínima: 60 anos (homem) / 55 anos (mulher)
-        - Qualidade de segurado na DER
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.213/91 art. 48, § 3º (aposentadoria híbrida)
-        - Demonstrar conhecimento sobre comprovação de atividade rural
-        - Incluir pedido de produção de prova testemunhal
-        - Argumentar sobre início de prova material
-        - Citar precedentes sobre aposentadoria híbrida
-        - Incluir análise da idade na DER
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Tempo urbano validado: {tempo_validado} meses
-        - Análise da somatória rural + urbano
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STJ sobre aposentadoria híbrida sem atividade rural atual
-        - TNU sobre comprovação de atividade rural
-        - Precedentes sobre início de prova material + testemunhal
-        """
+        prompt_base = APOSENTADORIA_RURAL.preencher_partes(
+            historico_laboral=dados.historico_laboral or 'A comprovar conforme documentação',
+            tempo_contribuicao=dados.tempo_contribuicao_total or 0,
+            der=dados.der,
+            exposicao_agentes_nocivos=dados.exposicao_agentes_nocivos or 'A detalhar conforme período',
+            nome=getattr(dados, 'nome', 'A informar'),
+            cpf=getattr(dados, 'cpf', 'A informar'),
+            motivo_recusa=dados.motivo_recusa,
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado
+        )
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_salario_maternidade(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para salário-maternidade com persona especializada"""
+        return await self._gerar_peticao("salario_maternidade", dados)
+
+    def _campos_salario_maternidade(self, dados: DadosPrevidenciarios) -> Dict[str, Any]:
+        """Campos do caso e saídas das calculadoras (usados pelo prompt e pelo modelo padrão)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = self.validator.converter_tempo_especial(dados.tempo_contribuicao_total or 0)
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=4, valor_mensal=1800.00)  # 120 dias
         
-        prompt_base = f"""
-        Elabore uma petição inicial para SALÁRIO-MATERNIDADE com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Data do parto/adoção: {dados.der}
-        - Motivo da recusa administrativa: {dados.motivo_recusa}
-        - Tipo específico: {dados.tipo_beneficio}
-        - Carência atual: {dados.tempo_contribuicao_total or 0} meses
-        - Nome da segurada: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        
-        REQUISITOS LEGAIS TÉCNICOS:
-        - Qualidade de segurada na data do parto/adoção
-        - Carência: 10 contribuições mensais (exceto para acidente)
-        - Período de pagamento: 120 dias (parto) ou conforme idade (adoção)
-        - Análise da categoria de segurada (empregada, autônoma, rural)
-        - Verificação de afastamento do trabalho
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.213/91 art. 71 a 73
-        - Demonstrar conhecimento sobre diferentes modalidades
-        - Incluir pedido OBRIGATÓRIO de tutela antecipada
-        - Argumentar sobre natureza alimentar do benefício
-        - Citar precedentes sobre dispensa de carência
-        - Incluir análise sobre período de pagamento
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Carência analisada: {tempo_validado} meses
-        - Período de pagamento: 120 dias (regra geral)
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STJ sobre qualidade de segurada como requisito único
-        - Precedentes sobre tutela antecipada em salário-maternidade
-        - Decisões sobre diferentes modalidades de seguradas
-        """
+        return {
+            "der": dados.der,
+            "motivo_recusa": dados.motivo_recusa,
+            "tipo_beneficio": dados.tipo_beneficio,
+            "tempo_contribuicao": dados.tempo_contribuicao_total or 0,
+            "nome": getattr(dados, 'nome', 'A informar'),
+            "cpf": getattr(dados, 'cpf', 'A informar'),
+            "valor_causa": valor_causa,
+            "tempo_validado": tempo_validado
+        }
+
+    def _prompt_salario_maternidade(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
+        prompt_base = SALARIO_MATERNIDADE.preencher_partes(**self._campos_salario_maternidade(dados))
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
 
     async def gerar_peticao_revisao_beneficio(self, dados: DadosPrevidenciarios) -> str:
         """Gera petição para revisão de benefício com persona especializada"""
+        return await self._gerar_peticao("revisao_beneficio", dados)
+
+    def _prompt_revisao_beneficio(self, dados: DadosPrevidenciarios) -> Dict[str, str]:
+        """Prompt da petição (persona especializada + dados do caso)"""
         
         # Integração das calculadoras - CORRIGIDO
         tempo_validado = "Revisão não depende de tempo adicional"
         valor_causa = dados.valor_causa or self.calc.calcular_valor_causa(parcelas_vencidas=24, valor_mensal=800.00)  # Diferença mensal
         
-        prompt_base = f"""
-        Elabore uma petição inicial para REVISÃO DE BENEFÍCIO PREVIDENCIÁRIO com base nos seguintes dados:
-        
-        DADOS TÉCNICOS DO CASO:
-        - Número do benefício: {dados.numero_beneficio or 'A informar'}
-        - DIB original: {dados.dib or 'A informar'}
-        - DER original: {dados.der}
-        - Motivo específico da revisão: {dados.motivo_recusa}
-        - Tipo de revisão solicitada: {dados.tipo_beneficio}
-        - Nome do segurado: {getattr(dados, 'nome', 'A informar')}
-        - CPF: {getattr(dados, 'cpf', 'A informar')}
-        
-        FUNDAMENTOS TÉCNICOS PARA REVISÃO:
-        - Erro material no cálculo da RMI
-        - Não consideração de períodos contributivos válidos
-        - Aplicação incorreta de índices de correção
-        - Desconsideração de salários de contribuição
-        - Aplicação equivocada de regras de cálculo
-        
-        REQUISITOS TÉCNICOS OBRIGATÓRIOS:
-        - Fundamentar com Lei 8.213/91 art. 29 (cálculo do salário de benefício)
-        - Demonstrar conhecimento técnico sobre cálculo previdenciário
-        - Incluir análise detalhada do erro cometido
-        - Argumentar sobre prescrição quinquenal das parcelas
-        - Citar precedentes sobre revisão de benefícios
-        - Incluir pedido de perícia contábil se necessário
-        
-        CÁLCULOS E VALORES TÉCNICOS:
-        - Valor da causa: R\$ {valor_causa:,.2f}
-        - Análise temporal: {tempo_validado}
-        - Diferença mensal estimada a ser demonstrada em planilha
-        
-        JURISPRUDÊNCIA OBRIGATÓRIA A CITAR:
-        - STJ sobre possibilidade de revisão quando comprovado erro de cálculo
-        - Precedentes sobre prescrição quinquenal em revisões
-        - Decisões sobre erro material vs erro de direito
-        """
+        prompt_base = REVISAO_BENEFICIO.preencher_partes(
+            numero_beneficio=dados.numero_beneficio or 'A informar',
+            dib=dados.dib or 'A informar',
+            der=dados.der,
+            motivo_recusa=dados.motivo_recusa,
+            tipo_beneficio=dados.tipo_beneficio,
+            nome=getattr(dados, 'nome', 'A informar'),
+            cpf=getattr(dados, 'cpf', 'A informar'),
+            valor_causa=valor_causa,
+            tempo_validado=tempo_validado
+        )
         
         # Aplicar persona especializada
-        prompt_completo = self._aplicar_persona_especializada(prompt_base)
-        
-        resultado = await ai_service.gerar_peticao_especializada(prompt_completo, "previdenciario")
-        peticao = resultado.get("peticao", "Erro ao gerar petição")
-        
-        # Preencher placeholders automaticamente
-        peticao = self._preencher_template(peticao, dados)
-        
-        # Aplicar pedidos completos com DIB e justiça gratuita
-        peticao = self._gerar_pedidos_completos(dados, peticao)
-        
-        peticao += f"\n\n{EthicsService.get_disclaimer()}"
-        return peticao
+        return self._aplicar_persona_especializada(prompt_base)
     
\ No newline at end of file
@@ -14,6 +14,7 @@ class ConsultaResponse(BaseModel):
     resposta: str
     area: str
     timestamp: datetime
+    similaridade: Optional[float] = None  # preenchida quando a resposta veio de uma pergunta similar
     
     class Config:
         from_attributes = True
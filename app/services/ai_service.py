@@ -1,22 +1,675 @@
-# app/services/ai_service.py - VERSÃO SIMPLIFICADA SEM IMPORTS CIRCULARES
-from openai import OpenAI
-from typing import Dict, Any, Optional
+# app/services/ai_service.py - VERSÃO ASSÍNCRONA COM PROVEDOR PLUGÁVEL
+from typing import Dict, Any, Optional, List, AsyncIterator
 import os
+import json
+import asyncio
+import hashlib
+import time
+from contextlib import AsyncExitStack
 from dotenv import load_dotenv
+from app.core.config import settings
+from app.core.request_context import ignorar_cache, tempo_restante, PrazoEsgotado
+from app.services.cache_service import CacheService
+from app.services.single_flight import SingleFlight
+from app.services.provider_gateway import ProviderGateway
+from app.services.circuit_breaker import CircuitoAberto
+from app.services.resiliencia import Resiliencia
+from app.services.roteamento import Roteamento
+from app.services.metering_service import MeteringService, OrcamentoExcedido
+from app.services.knowledge_base_enhanced import KnowledgeBaseEnhanced
+from app.services.telemetry import Telemetria
+from app.services.similar_questions import IndiceSimilares
+from app.services.conversation_service import SessoesConsulta
+from app.services.output_policy import PoliticaSaida, DetectorParada
+from app.services.providers import criar_provedor
+from app.services.model_router import ModelRouter
+from app.services.ai_prompts import CONSULTA, RESUMO_SESSAO, ANALISE, ANALISE_TRECHO, ANALISE_CONSOLIDACAO, PARECER, PETICAO
+from app.services.prompt_compiler import PromptTemplate, contar_tokens
+from app.services.document_chunker import dividir_em_trechos
 
 # Carregar .env diretamente
 load_dotenv()
 
 class AIService:
     def __init__(self):
-        # Configurar OpenAI diretamente do .env
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
-            self.client = None
+        # Provedor selecionado por AI_PROVIDER (openai | mock)
+        self.model = os.getenv("OPENAI_MODEL", settings.openai_model)
+        self.provedor = criar_provedor(os.getenv("AI_PROVIDER", settings.ai_provider))
         
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4")
+        # Cache de respostas exatas (Redis) com contadores por método
+        self.cache = CacheService()
+        self.cache_stats: Dict[str, Dict[str, int]] = {}
+        
+        # Coalescência de prompts idênticos em voo (processo + Redis)
+        self.single_flight = SingleFlight(self.cache)
+        
+        # Concorrência adaptativa, retentativas e limites RPM/TPM do provedor
+        self.gateway = ProviderGateway(self.provedor.total_chaves)
+        
+        # Modelo e max_tokens escolhidos por chamada (método, área, prompt, plano)
+        self.roteador = ModelRouter(self.model)
+        
+        # Fallback entre modelos, circuit breaker, hedging e prazo da requisição
+        self.resiliencia = Resiliencia(self.roteador)
+        
+        # Base estática da resposta de contingência (circuito aberto)
+        self.base_conhecimento = KnowledgeBaseEnhanced()
+        
+        # Consumo por escritório/endpoint/modelo e orçamentos de tokens
+        self.medidor = MeteringService(self.cache)
+        
+        # Fila, primeiro token, latência e tokens por chamada (Prometheus + log estruturado)
+        self.telemetria = Telemetria()
+        
+        # Perguntas quase duplicadas por área reaproveitam a resposta anterior
+        self.similares = IndiceSimilares()
+        self._carga_similares: Optional[asyncio.Task] = None
+        
+        # max_tokens pela saída observada de cada método e parada antecipada por estrutura
+        self.saida = PoliticaSaida()
+        
+        # Rota de cada chamada (modelos, max_tokens, fila) e consumo depois dela
+        self.rotas = Roteamento(self.roteador, self.saida, self.medidor)
+        
+        # Sessões de consulta: histórico no Redis, compactado em resumo em segundo plano
+        self.sessoes = SessoesConsulta(self.cache)
+    
+    async def iniciar(self) -> None:
+        """Inicializa o provedor (pool HTTP compartilhado, no caso da OpenAI) e o flush do consumo"""
+        await self.provedor.iniciar()
+        self.medidor.iniciar()
+        if settings.similares_ativo and self._carga_similares is None:
+            # Em segundo plano: o índice completa enquanto a API já atende
+            self._carga_similares = asyncio.create_task(self._carregar_similares())
+    
+    async def _carregar_similares(self) -> None:
+        try:
+            total = await asyncio.to_thread(self.similares.carregar_do_banco)
+            print(f"Índice de consultas similares carregado: {total} consultas")
+        except Exception as e:
+            print(f"⚠️ Aviso: índice de consultas similares sem dados do banco: {e}")
+    
+    def _buscar_similar(self, pergunta: str, area: str, branding: Dict[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+        """Resposta de uma pergunta quase idêntica já respondida (respeita o X-Cache-Bypass)"""
+        if not settings.similares_ativo or ignorar_cache.get():
+            return None
+        return self.similares.buscar(area, branding, pergunta)
+    
+    async def encerrar(self) -> None:
+        """Libera os recursos do provedor e do cache"""
+        await self.provedor.encerrar()
+        await self.medidor.encerrar()
+        await self.cache.fechar()
+    
+    async def _completar(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        modelos: Optional[List[str]] = None,
+        rota: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Executa a completion sem bloquear o event loop, caindo para o próximo modelo em erro/timeout"""
+        # Fora do lifespan (scripts, tarefas avulsas) o provedor é iniciado sob demanda
+        if not self.provedor.iniciado:
+            await self.iniciar()
+        
+        modelos = modelos or [self.model]
+        
+        async def chamar(alvo: str) -> Dict[str, Any]:
+            return {**await self._completar_modelo(alvo, messages, max_tokens, temperature, rota), "modelo": alvo}
+        
+        response, inicio = await self.resiliencia.tentar(modelos, rota, messages, chamar)
+        self.roteador.registrar(
+            rota, response["modelo"], "sucesso", time.monotonic() - inicio,
+            response["tokens_usados"], response.get("tokens_cache", 0)
+        )
+        response["truncada"] = await self.rotas.medir(rota, response["modelo"], response["tokens_usados"])
+        return response
+    
+    async def _completar_modelo(
+        self,
+        modelo: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        rota: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Uma completion em um modelo específico, passando pelo gateway"""
+        inicio = time.monotonic()
+        try:
+            async with self.gateway.reservar(modelo, self.rotas.estimar_tokens(rota, modelo, messages, max_tokens), **self.rotas.fila(rota)) as reserva:
+                response = await reserva.executar(
+                    lambda: self.provedor.completar(modelo, messages, max_tokens, temperature)
+                )
+                reserva.registrar_tokens(response["tokens_usados"])
+        except Exception:
+            self.telemetria.registrar_falha(rota, modelo, inicio, "erro")
+            raise
+        except BaseException:
+            self.telemetria.registrar_falha(rota, modelo, inicio, "cancelada")
+            raise
+        self.telemetria.registrar(rota, modelo, inicio, time.monotonic(), reserva.espera_fila, response)
+        return response
+    
+    @staticmethod
+    def _branding(firm_name: Optional[str], lawyer_name: Optional[str], signature_text: Optional[str], ai_persona: Optional[str]) -> Dict[str, Optional[str]]:
+        """Campos de branding que compõem a chave do cache"""
+        return {
+            "firm_name": firm_name,
+            "lawyer_name": lawyer_name,
+            "signature_text": signature_text,
+            "ai_persona": ai_persona
+        }
+    
+    def _chave_cache(self, metodo: str, chamada: Dict[str, Any], branding: Dict[str, Optional[str]]) -> str:
+        """Gera a chave do cache a partir do prompt canonicalizado e dos parâmetros da chamada"""
+        canonico = {
+            "metodo": metodo,
+            "modelo": chamada.get("modelos", [self.model])[0],
+            "temperature": chamada["temperature"],
+            "max_tokens": chamada["max_tokens"],
+            # Espaços e indentação não alteram o significado do prompt
+            "messages": [
+                {"role": m["role"], "content": " ".join(m["content"].split())}
+                for m in chamada["messages"]
+            ],
+            "branding": branding
+        }
+        conteudo = json.dumps(canonico, sort_keys=True, ensure_ascii=False)
+        return f"{metodo}:{hashlib.sha256(conteudo.encode()).hexdigest()}"
+    
+    def _ttl_cache(self, metodo: str) -> int:
+        """TTL do método (CACHE_TTL_AI_METODOS) ou o padrão CACHE_TTL_AI_RESPONSE"""
+        return settings.cache_ttl_ai_metodos.get(metodo, settings.cache_ttl_ai_response)
+    
+    def _contar_cache(self, metodo: str, resultado: str) -> None:
+        """Atualiza os contadores de hit/miss/bypass do método"""
+        stats = self.cache_stats.setdefault(metodo, {"hit": 0, "miss": 0, "bypass": 0})
+        stats[resultado] += 1
+    
+    async def _buscar_cache(self, metodo: str, chave: str) -> Optional[Dict[str, Any]]:
+        """Consulta o cache respeitando o header de bypass da requisição"""
+        if ignorar_cache.get():
+            self._contar_cache(metodo, "bypass")
+            return None
+        
+        cached = await self.cache.get_ai_response(chave)
+        if cached:
+            self._contar_cache(metodo, "hit")
+            return json.loads(cached)
+        
+        self._contar_cache(metodo, "miss")
+        return None
+    
+    async def _salvar_cache(self, metodo: str, chave: str, response: Dict[str, Any]) -> None:
+        """Armazena a resposta bem-sucedida no cache"""
+        await self.cache.set_ai_response(
+            chave,
+            json.dumps({
+                "conteudo": response["conteudo"],
+                "tokens_usados": response["tokens_usados"],
+                "modelo": response.get("modelo", self.model),
+                "truncada": response.get("truncada", False)
+            }, ensure_ascii=False),
+            ttl=self._ttl_cache(metodo)
+        )
+    
+    async def _resposta_contingencia(self, metodo: str, chave: str, area: Optional[str]) -> Dict[str, Any]:
+        """Circuito aberto: última resposta conhecida para o mesmo prompt ou texto de contingência"""
+        try:
+            antiga = await self.cache.get_ai_response_stale(chave)
+        except Exception:
+            antiga = None
+        if antiga:
+            antiga = json.loads(antiga)
+            return {
+                "conteudo": antiga["conteudo"],
+                "tokens_usados": 0,
+                "modelo": antiga.get("modelo", self.model),
+                "cache": "stale",
+                "status": "degradado"
+            }
+        
+        return {
+            "conteudo": self._texto_contingencia(area),
+            "tokens_usados": 0,
+            "modelo": None,
+            "cache": "indisponivel",
+            "status": "degradado"
+        }
+    
+    def _texto_contingencia(self, area: Optional[str]) -> str:
+        """Resposta sem IA montada a partir da base de conhecimento estática da área"""
+        area = (area or "geral").lower()
+        linhas = [
+            "⚠️ O serviço de IA está temporariamente indisponível. Esta resposta foi gerada em modo de "
+            "contingência e NÃO analisa o caso concreto. Tente novamente em alguns minutos."
+        ]
+        
+        legislacao = self.base_conhecimento.legislacao_por_area.get(area, {})
+        if legislacao:
+            linhas.append("")
+            linhas.append(f"Legislação de referência ({area}):")
+            linhas.extend(f"- {lei}" for lei in legislacao.values())
+        
+        jurisprudencia = self.base_conhecimento.jurisprudencia_por_area.get(area, {})
+        if jurisprudencia:
+            linhas.append("")
+            linhas.append("Jurisprudência de referência:")
+            linhas.extend(f"- {tipo.replace('_', ' ').capitalize()}: {precedente}" for tipo, precedente in jurisprudencia.items())
+        
+        return "\n".join(linhas)
+    
+    async def _completar_com_cache(
+        self,
+        metodo: str,
+        chamada: Dict[str, Any],
+        branding: Dict[str, Optional[str]],
+        area: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Completion com cache de respostas exatas na frente do provedor"""
+        chamada = self.rotas.rotear(metodo, chamada, area, branding.get("firm_name"))
+        chave = self._chave_cache(metodo, chamada, branding)
+        
+        cached = await self._buscar_cache(metodo, chave)
+        if cached is not None:
+            # Resposta servida do cache não consome tokens do provedor
+            return {
+                "conteudo": cached["conteudo"],
+                "tokens_usados": 0,
+                "modelo": cached.get("modelo", chamada["modelos"][0]),
+                "cache": "hit"
+            }
+        
+        async def chamar_provedor() -> Dict[str, Any]:
+            parada = self.saida.detector(metodo)
+            if parada is not None:
+                # Com parada antecipada a resposta é lida em streaming para poder fechar no ponto de corte
+                response = await self._completar_com_parada(chamada, parada)
+            else:
+                response = await self._completar(**chamada)
+            # Gravar antes de liberar o lock: seguidores em outros workers leem daqui
+            await self._salvar_cache(metodo, chave, response)
+            return response
+        
+        async def ler_resultado() -> Optional[Dict[str, Any]]:
+            cached = await self.cache.get_ai_response(chave)
+            return json.loads(cached) if cached else None
+        
+        try:
+            await self.rotas.verificar_orcamento(chamada)
+        except OrcamentoExcedido as e:
+            return {"conteudo": f"⚠️ {e}", "tokens_usados": 0, "modelo": None, "cache": "miss", "status": "orcamento_excedido"}
+        
+        try:
+            reduzida = self.resiliencia.aplicar_prazo(chamada)
+        except PrazoEsgotado as e:
+            return {"conteudo": f"⚠️ {e}", "tokens_usados": 0, "modelo": None, "cache": "miss", "status": "prazo_esgotado"}
+        if reduzida is not chamada:
+            # Resposta encurtada pelo prazo não ocupa a chave da resposta completa
+            chamada = reduzida
+            chave = self._chave_cache(metodo, chamada, branding)
+        
+        # Protege contra duplicatas simultâneas e stampede em chaves frias
+        try:
+            response, papel = await self.single_flight.executar(chave, chamar_provedor, ler_resultado)
+        except CircuitoAberto:
+            return await self._resposta_contingencia(metodo, chave, area)
+        except PrazoEsgotado as e:
+            self.resiliencia.prazo_stats["esgotados"] += 1
+            return {"conteudo": f"⚠️ {e}", "tokens_usados": 0, "modelo": None, "cache": "miss", "status": "prazo_esgotado"}
+        if papel != "lider":
+            # Chamada coalescida: o custo foi pago pela requisição líder
+            return {
+                "conteudo": response["conteudo"],
+                "tokens_usados": 0,
+                "modelo": response.get("modelo", chamada["modelos"][0]),
+                "truncada": response.get("truncada", False),
+                "cache": "coalescida"
+            }
+        
+        return {**response, "cache": "bypass" if ignorar_cache.get() else "miss"}
+    
+    def estatisticas_cache(self) -> Dict[str, Any]:
+        """Contadores de hit/miss do cache de respostas por método"""
+        total_hits = sum(s["hit"] for s in self.cache_stats.values())
+        total_consultas = sum(s["hit"] + s["miss"] for s in self.cache_stats.values())
+        return {
+            "por_metodo": self.cache_stats,
+            "taxa_acerto": round(total_hits / total_consultas, 4) if total_consultas else 0.0
+        }
+    
+    async def _completar_com_parada(self, chamada: Dict[str, Any], parada: DetectorParada) -> Dict[str, Any]:
+        """Completion lida em streaming e encerrada quando a estrutura esperada fecha"""
+        partes: List[str] = []
+        uso: Dict[str, Any] = {}
+        async for parte in self._completar_stream(**chamada, parada=parada):
+            if parte["tipo"] == "token":
+                partes.append(parte["conteudo"])
+            else:
+                uso = parte
+        return {
+            "conteudo": "".join(partes),
+            "tokens_usados": uso.get("tokens_usados", 0),
+            "tokens_cache": uso.get("tokens_cache", 0),
+            "modelo": uso.get("modelo", (chamada.get("modelos") or [self.model])[0]),
+            "truncada": uso.get("truncada", False)
+        }
+    
+    async def _completar_stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        modelos: Optional[List[str]] = None,
+        rota: Optional[Dict[str, Any]] = None,
+        parada: Optional[DetectorParada] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Executa a completion em modo streaming, repassando os tokens à medida que chegam"""
+        if not self.provedor.iniciado:
+            await self.iniciar()
+        
+        modelos = modelos or [self.model]
+        
+        async def abrir(alvo: str) -> Dict[str, Any]:
+            return await self._abrir_stream(alvo, messages, max_tokens, temperature, rota)
+        
+        async def descartar(aberto: Dict[str, Any]) -> None:
+            await aberto["recursos"].aclose()
+        
+        # Fallback só antes do primeiro token: depois disso o cliente já recebeu texto
+        aberto, inicio = await self.resiliencia.tentar(
+            modelos, rota, messages, abrir, descartar, aguardando="o primeiro token"
+        )
+        
+        # A vaga de concorrência fica ocupada até o fim do stream
+        async with aberto["recursos"]:
+            primeira = [aberto["primeira"]]
+            concluido = False
+            try:
+                async for parte in self._encadear(primeira, aberto["stream"]):
+                    if parte["tipo"] == "token" and parada is not None:
+                        corte = parada.alimentar(parte["conteudo"])
+                        if corte is not None and not parada.observar:
+                            # Estrutura fechada: repassa até o corte e encerra (sair do bloco fecha o stream)
+                            excedente = len(parada.texto) - corte
+                            conteudo = parte["conteudo"][:len(parte["conteudo"]) - excedente]
+                            if conteudo:
+                                yield {"tipo": "token", "conteudo": conteudo}
+                            parte = self._uso_parada(messages, aberto["modelo"], parada.texto[:corte], rota)
+                            self.saida.registrar_corte(rota["metodo"] if rota else "sem_rota")
+                    if parte["tipo"] == "uso":
+                        concluido = True
+                        if parada is not None and parada.observar and parada.corte is not None:
+                            self.saida.registrar_cauda(
+                                rota["metodo"] if rota else "sem_rota",
+                                contar_tokens(parada.texto[parada.corte:], aberto["modelo"]),
+                                time.monotonic() - parada.instante_corte
+                            )
+                        self.telemetria.registrar(
+                            rota, aberto["modelo"], aberto["inicio"], time.monotonic(),
+                            aberto["reserva"].espera_fila, parte, aberto["primeiro_token"]
+                        )
+                        aberto["reserva"].registrar_tokens(parte["tokens_usados"])
+                        self.roteador.registrar(
+                            rota, aberto["modelo"], "sucesso", time.monotonic() - inicio,
+                            parte["tokens_usados"], parte.get("tokens_cache", 0)
+                        )
+                        truncada = await self.rotas.medir(rota, aberto["modelo"], parte["tokens_usados"])
+                        yield {**parte, "modelo": aberto["modelo"], "truncada": truncada}
+                        if parte.get("parada"):
+                            return
+                        continue
+                    yield parte
+            except BaseException as e:
+                if not concluido:
+                    # Stream interrompido no meio (erro, prazo, cliente desconectado)
+                    status = "erro" if isinstance(e, Exception) else "cancelada"
+                    self.telemetria.registrar_falha(rota, aberto["modelo"], aberto["inicio"], status)
+                raise
+    
+    async def _abrir_stream(
+        self,
+        modelo: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        rota: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Reserva a vaga no gateway, abre o stream e aguarda a primeira parte"""
+        inicio = time.monotonic()
+        recursos = AsyncExitStack()
+        try:
+            reserva = await recursos.enter_async_context(
+                self.gateway.reservar(modelo, self.rotas.estimar_tokens(rota, modelo, messages, max_tokens), **self.rotas.fila(rota))
+            )
+            stream = await reserva.executar(
+                lambda: self.provedor.abrir_stream(modelo, messages, max_tokens, temperature)
+            )
+            if hasattr(stream, "aclose"):
+                recursos.push_async_callback(stream.aclose)
+            primeira = await stream.__anext__()
+        except BaseException as e:
+            # Falha ou cancelamento (hedge perdedor): libera a vaga e a conexão
+            self.telemetria.registrar_falha(rota, modelo, inicio, "erro" if isinstance(e, Exception) else "cancelada")
+            await recursos.aclose()
+            raise
+        return {
+            "modelo": modelo,
+            "reserva": reserva,
+            "stream": stream,
+            "primeira": primeira,
+            "recursos": recursos,
+            "inicio": inicio,
+            "primeiro_token": time.monotonic()
+        }
+    
+    @staticmethod
+    def _uso_parada(messages: List[Dict[str, str]], modelo: str, texto: str, rota: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Uso estimado de um stream fechado antes do fim (o provedor só informa o uso no final)"""
+        tokens_prompt = (rota or {}).get("tokens_prompt") or sum(contar_tokens(m["content"], modelo) for m in messages)
+        if rota is not None:
+            rota["parada"] = "estrutura"
+        return {
+            "tipo": "uso",
+            "tokens_usados": tokens_prompt + contar_tokens(texto, modelo),
+            "tokens_prompt": tokens_prompt,
+            "tokens_cache": 0,
+            "parada": True
+        }
+    
+    @staticmethod
+    async def _encadear(iniciais: List[Dict[str, Any]], stream: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        for parte in iniciais:
+            yield parte
+        async for parte in stream:
+            yield parte
+    
+    async def _transmitir(
+        self,
+        metodo: str,
+        chamada: Dict[str, Any],
+        branding: Dict[str, Optional[str]],
+        metadados: Dict[str, Any],
+        mensagem_erro: str,
+        area: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Converte a completion em eventos de streaming com um evento final de metadados"""
+        if not self.provedor.configurado:
+            yield {
+                "evento": "fim",
+                "erro": "⚠️ Chave OpenAI não configurada no arquivo .env",
+                "modelo": self.model,
+                "tokens_usados": 0,
+                **metadados,
+                "status": "erro_configuracao"
+            }
+            return
+        
+        try:
+            chamada = self.rotas.rotear(metodo, chamada, area, branding.get("firm_name"))
+            chave = self._chave_cache(metodo, chamada, branding)
+            cached = await self._buscar_cache(metodo, chave)
+            if cached is not None:
+                yield {"evento": "token", "conteudo": cached["conteudo"]}
+                yield {
+                    "evento": "fim",
+                    "modelo": cached.get("modelo", chamada["modelos"][0]),
+                    "tokens_usados": 0,
+                    **metadados,
+                    "cache": "hit",
+                    "status": "sucesso"
+                }
+                return
+            
+            try:
+                await self.rotas.verificar_orcamento(chamada)
+            except OrcamentoExcedido as e:
+                yield {
+                    "evento": "fim",
+                    "erro": f"⚠️ {e}",
+                    "modelo": None,
+                    "tokens_usados": 0,
+                    **metadados,
+                    "status": "orcamento_excedido"
+                }
+                return
+            
+            try:
+                reduzida = self.resiliencia.aplicar_prazo(chamada)
+            except PrazoEsgotado as e:
+                yield {"evento": "fim", "erro": f"⚠️ {e}", "modelo": None, "tokens_usados": 0, **metadados, "status": "prazo_esgotado"}
+                return
+            if reduzida is not chamada:
+                chamada = reduzida
+                chave = self._chave_cache(metodo, chamada, branding)
+            
+            tokens_usados = 0
+            modelo = chamada["modelos"][0]
+            partes: List[str] = []
+            stream = self._completar_stream(**chamada, parada=self.saida.detector(metodo))
+            try:
+                async for parte in stream:
+                    if parte["tipo"] == "token":
+                        partes.append(parte["conteudo"])
+                        yield {"evento": "token", "conteudo": parte["conteudo"]}
+                    else:
+                        tokens_usados = parte["tokens_usados"]
+                        modelo = parte["modelo"]
+                    restante = tempo_restante()
+                    if restante is not None and restante <= 0 and parte["tipo"] == "token":
+                        # Prazo esgotado no meio do texto: encerra sem cachear o parcial
+                        self.resiliencia.prazo_stats["streams_interrompidos"] += 1
+                        yield {"evento": "fim", "modelo": modelo, "tokens_usados": 0, **metadados, "cache": "miss", "status": "prazo_esgotado"}
+                        return
+            except PrazoEsgotado as e:
+                self.resiliencia.prazo_stats["esgotados"] += 1
+                yield {"evento": "fim", "erro": f"⚠️ {e}", "modelo": None, "tokens_usados": 0, **metadados, "status": "prazo_esgotado"}
+                return
+            except CircuitoAberto:
+                # Circuito aberto falha antes do primeiro token: nada foi enviado ainda
+                contingencia = await self._resposta_contingencia(metodo, chave, area)
+                yield {"evento": "token", "conteudo": contingencia["conteudo"]}
+                yield {
+                    "evento": "fim",
+                    "modelo": contingencia["modelo"],
+                    "tokens_usados": 0,
+                    **metadados,
+                    "cache": contingencia["cache"],
+                    "status": "degradado"
+                }
+                return
+            finally:
+                # Prazo esgotado ou cliente desconectado: fecha já o stream do provedor e libera a vaga
+                await stream.aclose()
+            
+            await self._salvar_cache(metodo, chave, {"conteudo": "".join(partes), "tokens_usados": tokens_usados, "modelo": modelo})
+            
+            yield {
+                "evento": "fim",
+                "modelo": modelo,
+                "tokens_usados": tokens_usados,
+                **metadados,
+                "cache": "bypass" if ignorar_cache.get() else "miss",
+                "status": "sucesso"
+            }
+            
+        except Exception as e:
+            yield {
+                "evento": "fim",
+                "erro": f"{mensagem_erro}: {str(e)}",
+                "modelo": self.model,
+                "tokens_usados": 0,
+                **metadados,
+                "status": "erro"
+            }
+    
+    @staticmethod
+    def _mensagens(template: PromptTemplate, ai_persona: str, instrucoes_fixas: Optional[str] = None, **valores: Any) -> List[Dict[str, str]]:
+        """
+        Mensagens na ordem que aproveita o cache de prefixo do provedor: instruções
+        estáticas do template (idênticas em toda chamada), persona do escritório e,
+        por último, os dados da chamada.
+        """
+        estatico = f"{template.estatico}\n\n{instrucoes_fixas}" if instrucoes_fixas else template.estatico
+        return [
+            {"role": "system", "content": estatico},
+            {"role": "system", "content": ai_persona},
+            {"role": "user", "content": template.preencher_dinamico(**valores)}
+        ]
+    
+    async def _resumir_sessao(self, resumo: str, turnos: List[Dict[str, Any]], branding: Dict[str, Optional[str]]) -> Optional[str]:
+        """Novo resumo acumulado da sessão (passa pelo cache: mesma entrada, mesmo resumo)"""
+        conversa = "\n".join(f"CLIENTE: {t['pergunta']}\nASSISTENTE: {t['resposta']}" for t in turnos)
+        chamada = {
+            "messages": self._mensagens(
+                RESUMO_SESSAO,
+                "Você é um assistente jurídico especializado em Direito brasileiro.",
+                resumo=resumo or "(nenhum)",
+                turnos=conversa
+            ),
+            "max_tokens": settings.sessao_resumo_max_tokens,
+            "temperature": 0.1
+        }
+        response = await self._completar_com_cache("resumo_sessao", chamada, branding)
+        return response["conteudo"] if response.get("status", "sucesso") == "sucesso" else None
+    
+    async def _registrar_turno(self, sessao_id: str, pergunta: str, resposta: str, branding: Dict[str, Optional[str]]) -> None:
+        await self.sessoes.adicionar_turno(
+            sessao_id, pergunta, resposta, branding.get("firm_name"),
+            lambda resumo, turnos: self._resumir_sessao(resumo, turnos, branding)
+        )
+    
+    def _preparar_consulta(
+        self,
+        pergunta: str,
+        area: str,
+        firm_name: Optional[str],
+        lawyer_name: Optional[str],
+        signature_text: Optional[str],
+        ai_persona: Optional[str]
+    ) -> Dict[str, Any]:
+        """Monta mensagens e parâmetros da consulta jurídica com branding dinâmico"""
+        # Definir padrões para branding se não forem fornecidos
+        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
+        _lawyer_name = lawyer_name if lawyer_name else "um especialista em Direito"
+        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
+        _ai_persona = ai_persona if ai_persona else f"Você é um assistente jurídico especializado em Direito brasileiro do escritório {_firm_name}."
+        
+        # Template pré-compilado por área
+        return {
+            "messages": self._mensagens(
+                CONSULTA.get(area, CONSULTA["geral"]),
+                _ai_persona,
+                firm_name=_firm_name,
+                lawyer_name=_lawyer_name,
+                signature_text=_signature_text,
+                pergunta=pergunta
+            ),
+            "max_tokens": 1500,
+            "temperature": 0.3
+        }
     
     async def fazer_consulta_juridica(
         self, 
@@ -25,10 +678,11 @@ class AIService:
         firm_name: Optional[str] = None,
         lawyer_name: Optional[str] = None,
         signature_text: Optional[str] = None,
-        ai_persona: Optional[str] = None
+        ai_persona: Optional[str] = None,
+        sessao_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Fazer consulta jurídica usando OpenAI com branding dinâmico"""
-        if not self.client:
+        """Fazer consulta jurídica usando OpenAI com branding dinâmico (com sessao_id, continua a conversa)"""
+        if not self.provedor.configurado:
             return {
                 "resposta": "⚠️ Chave OpenAI não configurada no arquivo .env",
                 "modelo": self.model,
@@ -36,79 +690,51 @@ class AIService:
                 "status": "erro_configuracao"
             }
         
-        # Definir padrões para branding se não forem fornecidos
-        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
-        _lawyer_name = lawyer_name if lawyer_name else "um especialista em Direito"
-        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
-        _ai_persona = ai_persona if ai_persona else f"Você é um assistente jurídico especializado em Direito brasileiro do escritório {_firm_name}."
-        
         try:
-            # Prompt especializado por área, agora dinâmico
-            prompts = {
-                "previdenciario": f"""
-                {_ai_persona}
-                Você atua como {_lawyer_name}, especialista em Direito Previdenciário brasileiro.
-                Responda de forma técnica e precisa à seguinte pergunta:
-                
-                {pergunta}
-                
-                Inclua:
-                - Base legal (Lei 8.213/91, EC 103/2019, Decreto 3.048/99)
-                - Jurisprudência relevante (STJ, STF, TNU)
-                - Orientações práticas para o cliente
-                - Prazos importantes
-                - Documentação necessária
-                
-                Assine como: {_signature_text}
-                """,
-                "trabalhista": f"""
-                {_ai_persona}
-                Você atua como {_lawyer_name}, especialista em Direito Trabalhista brasileiro.
-                Responda de forma técnica e precisa à seguinte pergunta:
-                
-                {pergunta}
-                
-                Inclua:
-                - Base legal (CLT, Constituição Federal, Normas Regulamentadoras)
-                - Jurisprudência relevante (TST, STF)
-                - Orientações práticas para o cliente
-                - Prazos processuais relevantes
-                - Documentação necessária
-                
-                Assine como: {_signature_text}
-                """,
-                "geral": f"""
-                {_ai_persona}
-                Você é um assistente jurídico geral do escritório {_firm_name}, especializado em Direito brasileiro.
-                Responda de forma técnica e precisa à seguinte pergunta:
-                
-                {pergunta}
-                
-                Forneça uma resposta completa e fundamentada, sempre mencionando que para casos específicos 
-                é recomendável consultar {_lawyer_name or 'um profissional do direito'}.
-                
-                Assine como: {_signature_text}
-                """
-            }
+            branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+            historico, tokens_historico, seguimento = [], 0, False
+            if sessao_id:
+                contexto = await self.sessoes.contexto(sessao_id, firm_name)
+                if contexto is None:
+                    return {**self.sessoes.expirada(sessao_id), "modelo": self.model}
+                historico, tokens_historico, seguimento = contexto
+            extras = {"sessao_id": sessao_id, "tokens_historico": tokens_historico} if sessao_id else {}
             
-            prompt = prompts.get(area, prompts["geral"])
+            # Pergunta de seguimento depende do histórico: não reaproveita respostas avulsas
+            similar = None if seguimento else self._buscar_similar(pergunta, area, branding)
+            if similar is not None:
+                if sessao_id:
+                    await self._registrar_turno(sessao_id, pergunta, similar["resposta"], branding)
+                return {
+                    "resposta": similar["resposta"],
+                    "modelo": similar["modelo"],
+                    "tokens_usados": 0,
+                    "area_consultada": area,
+                    "cache": "similar",
+                    "similaridade": similar["similaridade"],
+                    "pergunta_similar": similar["pergunta_similar"],
+                    **extras,
+                    "status": "sucesso"
+                }
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": _ai_persona},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.3
-            )
+            chamada = self._preparar_consulta(pergunta, area, firm_name, lawyer_name, signature_text, ai_persona)
+            # Histórico entre a persona e a pergunta nova: o prefixo estático continua igual
+            chamada["messages"][2:2] = historico
+            response = await self._completar_com_cache("consulta", chamada, branding, area)
+            if response.get("status", "sucesso") == "sucesso":
+                if not seguimento:
+                    self.similares.adicionar(area, branding, pergunta, response["conteudo"], modelo=response["modelo"])
+                if sessao_id:
+                    await self._registrar_turno(sessao_id, pergunta, response["conteudo"], branding)
             
             return {
-                "resposta": response.choices[0].message.content,
-                "modelo": self.model,
-                "tokens_usados": response.usage.total_tokens,
+                "resposta": response["conteudo"],
+                "modelo": response["modelo"],
+                "tokens_usados": response["tokens_usados"],
                 "area_consultada": area,
-                "status": "sucesso"
+                "cache": response["cache"],
+                **extras,
+                "status": response.get("status", "sucesso")
             }
             
         except Exception as e:
@@ -119,6 +745,225 @@ class AIService:
                 "status": "erro"
             }
     
+    async def fazer_consulta_juridica_stream(
+        self,
+        pergunta: str,
+        area: str = "geral",
+        firm_name: Optional[str] = None,
+        lawyer_name: Optional[str] = None,
+        signature_text: Optional[str] = None,
+        ai_persona: Optional[str] = None,
+        sessao_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Consulta jurídica em streaming: eventos 'token' seguidos de um evento 'fim' com metadados"""
+        branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+        historico, tokens_historico, seguimento = [], 0, False
+        if sessao_id and self.provedor.configurado:
+            contexto = await self.sessoes.contexto(sessao_id, firm_name)
+            if contexto is None:
+                expirada = self.sessoes.expirada(sessao_id)
+                yield {"evento": "fim", "erro": f"⚠️ {expirada.pop('resposta')}", "modelo": self.model, **expirada}
+                return
+            historico, tokens_historico, seguimento = contexto
+        extras = {"sessao_id": sessao_id, "tokens_historico": tokens_historico} if sessao_id else {}
+        
+        similar = None if seguimento or not self.provedor.configurado else self._buscar_similar(pergunta, area, branding)
+        if similar is not None:
+            if sessao_id:
+                await self._registrar_turno(sessao_id, pergunta, similar["resposta"], branding)
+            yield {"evento": "token", "conteudo": similar["resposta"]}
+            yield {
+                "evento": "fim",
+                "modelo": similar["modelo"],
+                "tokens_usados": 0,
+                "area_consultada": area,
+                "cache": "similar",
+                "similaridade": similar["similaridade"],
+                "pergunta_similar": similar["pergunta_similar"],
+                **extras,
+                "status": "sucesso"
+            }
+            return
+        
+        chamada = self._preparar_consulta(pergunta, area, firm_name, lawyer_name, signature_text, ai_persona)
+        chamada["messages"][2:2] = historico
+        partes: List[str] = []
+        async for evento in self._transmitir("consulta", chamada, branding, {"area_consultada": area, **extras}, "Erro ao processar consulta", area):
+            if evento["evento"] == "token":
+                partes.append(evento["conteudo"])
+            elif evento.get("status") == "sucesso":
+                if not seguimento:
+                    self.similares.adicionar(area, branding, pergunta, "".join(partes), modelo=evento["modelo"])
+                if sessao_id:
+                    await self._registrar_turno(sessao_id, pergunta, "".join(partes), branding)
+            yield evento
+    
+    def _preparar_analise(
+        self,
+        texto: str,
+        tipo_analise: str,
+        firm_name: Optional[str],
+        signature_text: Optional[str],
+        ai_persona: Optional[str]
+    ) -> Dict[str, Any]:
+        """Monta mensagens e parâmetros da análise de documento com branding dinâmico"""
+        # Definir padrões para branding se não forem fornecidos
+        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
+        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
+        _ai_persona = ai_persona if ai_persona else f"Você é um analista jurídico especializado do escritório {_firm_name}."
+        
+        return {
+            "messages": self._mensagens(
+                ANALISE,
+                _ai_persona,
+                firm_name=_firm_name,
+                tipo_analise=tipo_analise,
+                texto=texto,
+                signature_text=_signature_text
+            ),
+            "max_tokens": 1000,
+            "temperature": 0.2
+        }
+    
+    def _documento_longo(self, texto: str) -> bool:
+        """Documentos acima de ANALISE_LIMITE_TOKENS são analisados por trechos"""
+        return contar_tokens(texto, self.model) > settings.analise_limite_tokens
+    
+    def _preparar_trecho(self, trecho: str, tipo_analise: str, ai_persona: Optional[str]) -> Dict[str, Any]:
+        """Monta a chamada de análise parcial de um trecho (etapa map)"""
+        _ai_persona = ai_persona if ai_persona else "Você é um analista jurídico especializado."
+        return {
+            "messages": self._mensagens(ANALISE_TRECHO, _ai_persona, tipo_analise=tipo_analise, texto=trecho),
+            "max_tokens": 600,
+            "temperature": 0.2
+        }
+    
+    def _preparar_consolidacao(
+        self,
+        parciais: List[str],
+        tipo_analise: str,
+        firm_name: Optional[str],
+        signature_text: Optional[str],
+        ai_persona: Optional[str]
+    ) -> Dict[str, Any]:
+        """Monta a chamada que consolida as análises parciais no resultado final (etapa reduce)"""
+        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
+        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
+        _ai_persona = ai_persona if ai_persona else f"Você é um analista jurídico especializado do escritório {_firm_name}."
+        
+        analises = "\n\n".join(
+            f"[TRECHO {i}/{len(parciais)}]\n{parcial}" for i, parcial in enumerate(parciais, 1)
+        )
+        return {
+            "messages": self._mensagens(
+                ANALISE_CONSOLIDACAO,
+                _ai_persona,
+                firm_name=_firm_name,
+                tipo_analise=tipo_analise,
+                analises=analises,
+                signature_text=_signature_text
+            ),
+            "max_tokens": 1500,
+            "temperature": 0.2
+        }
+    
+    async def _analisar_trechos(
+        self,
+        trechos: List[str],
+        tipo_analise: str,
+        ai_persona: Optional[str],
+        branding: Dict[str, Optional[str]]
+    ) -> List[Dict[str, Any]]:
+        """Analisa os trechos em paralelo, limitado por ANALISE_CHUNKS_CONCORRENCIA"""
+        semaforo = asyncio.BoundedSemaphore(settings.analise_chunks_concorrencia)
+        
+        async def analisar(trecho: str) -> Dict[str, Any]:
+            async with semaforo:
+                # Cache por conteúdo do trecho: documento editado só reprocessa o que mudou
+                chamada = self._preparar_trecho(trecho, tipo_analise, ai_persona)
+                return await self._completar_com_cache("analise_trecho", chamada, branding)
+        
+        tarefas = [asyncio.create_task(analisar(trecho)) for trecho in trechos]
+        try:
+            return await asyncio.gather(*tarefas)
+        except BaseException:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            raise
+    
+    async def _mapear_documento(
+        self,
+        texto: str,
+        tipo_analise: str,
+        firm_name: Optional[str],
+        signature_text: Optional[str],
+        ai_persona: Optional[str],
+        branding: Dict[str, Optional[str]]
+    ) -> Dict[str, Any]:
+        """
+        Etapa map do documento longo: divide, analisa os trechos e, se as
+        análises parciais ainda forem grandes demais, reduz em níveis.
+        Retorna a chamada de consolidação final e os metadados dos trechos.
+        Trecho sem análise de verdade (contingência, orçamento, prazo) interrompe
+        o map-reduce: status do primeiro deles e os números (a partir de 1) em
+        metadados["trechos_com_falha"].
+        """
+        trechos = dividir_em_trechos(texto, settings.analise_chunk_max_tokens, self.model)
+        respostas = await self._analisar_trechos(trechos, tipo_analise, ai_persona, branding)
+        
+        tokens_usados = sum(r["tokens_usados"] for r in respostas)
+        metadados = {
+            "modo": "map_reduce",
+            "trechos": len(trechos),
+            "trechos_em_cache": sum(1 for r in respostas if r["cache"] in ("hit", "coalescida")),
+            "niveis_reducao": 1
+        }
+        falhas = self._trechos_com_falha(respostas)
+        if falhas:
+            return self._mapa_interrompido(respostas, falhas, tokens_usados, metadados)
+        parciais = [r["conteudo"] for r in respostas]
+        
+        # Redução intermediária: agrupa análises parciais até caberem na consolidação
+        while len(parciais) > 1 and contar_tokens("\n\n".join(parciais), self.model) > settings.analise_limite_tokens:
+            grupos = dividir_em_trechos("\n\n".join(parciais), settings.analise_chunk_max_tokens, self.model)
+            if len(grupos) >= len(parciais):
+                break
+            respostas = await self._analisar_trechos(grupos, tipo_analise, ai_persona, branding)
+            tokens_usados += sum(r["tokens_usados"] for r in respostas)
+            metadados["niveis_reducao"] += 1
+            falhas = self._trechos_com_falha(respostas)
+            if falhas:
+                return self._mapa_interrompido(respostas, falhas, tokens_usados, metadados)
+            parciais = [r["conteudo"] for r in respostas]
+        
+        return {
+            "chamada": self._preparar_consolidacao(parciais, tipo_analise, firm_name, signature_text, ai_persona),
+            "tokens_usados": tokens_usados,
+            "metadados": metadados,
+            "status": "sucesso"
+        }
+    
+    @staticmethod
+    def _trechos_com_falha(respostas: List[Dict[str, Any]]) -> List[int]:
+        return [i for i, r in enumerate(respostas, 1) if r.get("status", "sucesso") != "sucesso"]
+    
+    @staticmethod
+    def _mapa_interrompido(
+        respostas: List[Dict[str, Any]],
+        falhas: List[int],
+        tokens_usados: int,
+        metadados: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Map-reduce sem consolidação: não se reduz sobre texto de contingência ou de erro"""
+        status = respostas[falhas[0] - 1]["status"]
+        return {
+            "chamada": None,
+            "erro": f"⚠️ Análise interrompida: {len(falhas)} de {len(respostas)} trechos sem análise ({status})",
+            "tokens_usados": tokens_usados,
+            "metadados": {**metadados, "trechos_com_falha": falhas},
+            "status": status
+        }
+    
     async def analisar_documento(
         self, 
         texto: str, 
@@ -129,7 +974,7 @@ class AIService:
         ai_persona: Optional[str] = None
     ) -> Dict[str, Any]:
         """Analisar documento usando OpenAI com branding dinâmico"""
-        if not self.client:
+        if not self.provedor.configurado:
             return {
                 "resultado": "⚠️ Chave OpenAI não configurada no arquivo .env",
                 "tipo_analise": tipo_analise,
@@ -140,45 +985,50 @@ class AIService:
                 "status": "erro_configuracao"
             }
         
-        # Definir padrões para branding se não forem fornecidos
-        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
-        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
-        _ai_persona = ai_persona if ai_persona else f"Você é um analista jurídico especializado do escritório {_firm_name}."
-        
         try:
-            prompt = f"""
-            {_ai_persona}
-            Como especialista jurídico do escritório {_firm_name}, 
-            faça um {tipo_analise} do seguinte documento:
-            
-            {texto}
-            
-            Inclua:
-            - Pontos principais
-            - Aspectos jurídicos relevantes
-            - Possíveis riscos ou oportunidades
+            branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
             
-            Assine como: {_signature_text}
-            """
+            if self._documento_longo(texto):
+                # Documento longo: análise por trechos (map) + consolidação (reduce)
+                mapa = await self._mapear_documento(texto, tipo_analise, firm_name, signature_text, ai_persona, branding)
+                if mapa["status"] != "sucesso":
+                    return {
+                        "resultado": mapa["erro"],
+                        "tipo_analise": tipo_analise,
+                        "palavras": len(texto.split()),
+                        "caracteres": len(texto),
+                        "modelo": self.model,
+                        "tokens_usados": mapa["tokens_usados"],
+                        "cache": "miss",
+                        **mapa["metadados"],
+                        "status": mapa["status"]
+                    }
+                response = await self._completar_com_cache("analise", mapa["chamada"], branding)
+                
+                return {
+                    "resultado": response["conteudo"],
+                    "tipo_analise": tipo_analise,
+                    "palavras": len(texto.split()),
+                    "caracteres": len(texto),
+                    "modelo": response["modelo"],
+                    "tokens_usados": response["tokens_usados"] + mapa["tokens_usados"],
+                    "cache": response["cache"],
+                    **mapa["metadados"],
+                    "status": response.get("status", "sucesso")
+                }
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": _ai_persona},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.2
-            )
+            chamada = self._preparar_analise(texto, tipo_analise, firm_name, signature_text, ai_persona)
+            response = await self._completar_com_cache("analise", chamada, branding)
             
             return {
-                "resultado": response.choices[0].message.content,
+                "resultado": response["conteudo"],
                 "tipo_analise": tipo_analise,
                 "palavras": len(texto.split()),
                 "caracteres": len(texto),
-                "modelo": self.model,
-                "tokens_usados": response.usage.total_tokens,
-                "status": "sucesso"
+                "modelo": response["modelo"],
+                "tokens_usados": response["tokens_usados"],
+                "cache": response["cache"],
+                "status": response.get("status", "sucesso")
             }
             
         except Exception as e:
@@ -191,6 +1041,93 @@ class AIService:
                 "tokens_usados": 0,
                 "status": "erro"
             }
+    
+    async def analisar_documento_stream(
+        self,
+        texto: str,
+        tipo_analise: str = "resumo",
+        firm_name: Optional[str] = None,
+        lawyer_name: Optional[str] = None,
+        signature_text: Optional[str] = None,
+        ai_persona: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Análise de documento em streaming: eventos 'token' seguidos de um evento 'fim' com metadados"""
+        branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+        metadados = {
+            "tipo_analise": tipo_analise,
+            "palavras": len(texto.split()),
+            "caracteres": len(texto)
+        }
+        
+        if not self.provedor.configurado or not self._documento_longo(texto):
+            chamada = self._preparar_analise(texto, tipo_analise, firm_name, signature_text, ai_persona)
+            async for evento in self._transmitir("analise", chamada, branding, metadados, "Erro ao analisar documento"):
+                yield evento
+            return
+        
+        # Documento longo: os trechos são analisados antes; transmite-se a consolidação
+        try:
+            mapa = await self._mapear_documento(texto, tipo_analise, firm_name, signature_text, ai_persona, branding)
+        except Exception as e:
+            yield {
+                "evento": "fim",
+                "erro": f"Erro ao analisar documento: {str(e)}",
+                "modelo": self.model,
+                "tokens_usados": 0,
+                **metadados,
+                "status": "erro"
+            }
+            return
+        
+        metadados.update(mapa["metadados"])
+        if mapa["status"] != "sucesso":
+            yield {
+                "evento": "fim",
+                "erro": mapa["erro"],
+                "modelo": self.model,
+                "tokens_usados": mapa["tokens_usados"],
+                **metadados,
+                "status": mapa["status"]
+            }
+            return
+        async for evento in self._transmitir("analise", mapa["chamada"], branding, metadados, "Erro ao analisar documento"):
+            if evento["evento"] == "fim":
+                evento["tokens_usados"] += mapa["tokens_usados"]
+            yield evento
+    
+    def _preparar_relatorio(
+        self,
+        titulo: str,
+        conteudo: str,
+        incluir_jurisprudencia: bool,
+        firm_name: Optional[str],
+        lawyer_name: Optional[str],
+        signature_text: Optional[str],
+        ai_persona: Optional[str]
+    ) -> Dict[str, Any]:
+        """Monta mensagens e parâmetros do parecer jurídico com branding dinâmico"""
+        # Definir padrões para branding se não forem fornecidos
+        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
+        _lawyer_name = lawyer_name if lawyer_name else "um especialista em Direito"
+        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
+        _ai_persona = ai_persona if ai_persona else f"Você é um especialista em elaboração de pareceres jurídicos do escritório {_firm_name}."
+        
+        # Prompt para geração de relatório
+        jurisprudencia_instrucao = "Inclua jurisprudência relevante e precedentes." if incluir_jurisprudencia else "Não inclua jurisprudência."
+        
+        return {
+            "messages": self._mensagens(
+                PARECER,
+                _ai_persona,
+                firm_name=_firm_name,
+                titulo=titulo,
+                conteudo=conteudo,
+                jurisprudencia_instrucao=jurisprudencia_instrucao,
+                signature_text=_signature_text
+            ),
+            "max_tokens": 2000,
+            "temperature": 0.2
+        }
 
     async def gerar_relatorio_juridico(
         self, 
@@ -204,7 +1141,7 @@ class AIService:
         ai_persona: Optional[str] = None
     ) -> Dict[str, Any]:
         """Gerar relatório jurídico estruturado com branding dinâmico"""
-        if not self.client:
+        if not self.provedor.configurado:
             return {
                 "relatorio": "⚠️ Chave OpenAI não configurada no arquivo .env",
                 "modelo": self.model,
@@ -212,51 +1149,22 @@ class AIService:
                 "status": "erro_configuracao"
             }
         
-        # Definir padrões para branding se não forem fornecidos
-        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
-        _lawyer_name = lawyer_name if lawyer_name else "um especialista em Direito"
-        _signature_text = signature_text if signature_text else f"Atenciosamente, Sua IA Jurídica do {_firm_name}"
-        _ai_persona = ai_persona if ai_persona else f"Você é um especialista em elaboração de pareceres jurídicos do escritório {_firm_name}."
-        
         try:
-            # Prompt para geração de relatório
-            jurisprudencia_instrucao = "Inclua jurisprudência relevante e precedentes." if incluir_jurisprudencia else "Não inclua jurisprudência."
-            
-            prompt = f"""
-            {_ai_persona}
-            Você é um assistente jurídico do escritório {_firm_name}.
-            Gere um parecer jurídico estruturado sobre o seguinte tema:
-            
-            TÍTULO: {titulo}
-            CONTEÚDO: {conteudo}
-            
-            Estruture o parecer com:
-            1. INTRODUÇÃO
-            2. FUNDAMENTAÇÃO LEGAL
-            3. ANÁLISE JURÍDICA
-            4. PRECEDENTES - {jurisprudencia_instrucao}
-            5. CONCLUSÃO E RECOMENDAÇÕES
-            
-            Assine como: {_signature_text}
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": _ai_persona},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.2
+            chamada = self._preparar_relatorio(
+                titulo, conteudo, incluir_jurisprudencia,
+                firm_name, lawyer_name, signature_text, ai_persona
             )
+            branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+            response = await self._completar_com_cache("parecer", chamada, branding, area)
             
             return {
-                "relatorio": response.choices[0].message.content,
-                "modelo": self.model,
-                "tokens_usados": response.usage.total_tokens,
+                "relatorio": response["conteudo"],
+                "modelo": response["modelo"],
+                "tokens_usados": response["tokens_usados"],
                 "incluiu_jurisprudencia": incluir_jurisprudencia,
                 "area": area,
-                "status": "sucesso"
+                "cache": response["cache"],
+                "status": response.get("status", "sucesso")
             }
             
         except Exception as e:
@@ -268,9 +1176,72 @@ class AIService:
                 "status": "erro"
             }
     
-    async def gerar_peticao_especializada(self, prompt: str, area: str, firm_name: Optional[str] = None, lawyer_name: Optional[str] = None, signature_text: Optional[str] = None, ai_persona: Optional[str] = None) -> Dict[str, Any]:
-        """Método específico para petições especializadas"""
-        if not self.client:
+    async def gerar_relatorio_juridico_stream(
+        self,
+        titulo: str,
+        conteudo: str,
+        area: str = "geral",
+        incluir_jurisprudencia: bool = True,
+        firm_name: Optional[str] = None,
+        lawyer_name: Optional[str] = None,
+        signature_text: Optional[str] = None,
+        ai_persona: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parecer jurídico em streaming: eventos 'token' seguidos de um evento 'fim' com metadados"""
+        chamada = self._preparar_relatorio(
+            titulo, conteudo, incluir_jurisprudencia,
+            firm_name, lawyer_name, signature_text, ai_persona
+        )
+        branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+        metadados = {"incluiu_jurisprudencia": incluir_jurisprudencia, "area": area}
+        async for evento in self._transmitir("parecer", chamada, branding, metadados, "Erro ao gerar parecer", area):
+            yield evento
+    
+    def _preparar_peticao(
+        self,
+        prompt: str,
+        area: str,
+        firm_name: Optional[str],
+        lawyer_name: Optional[str],
+        signature_text: Optional[str],
+        ai_persona: Optional[str],
+        instrucoes_fixas: Optional[str],
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        """Chamada da petição especializada (mesma no modo normal e no streaming)"""
+        # Definir padrões para branding se não forem fornecidos
+        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
+        _lawyer_name = lawyer_name if lawyer_name else "um especialista em Direito"
+        _signature_text = signature_text if signature_text else f"Atenciosamente, {_lawyer_name} do {_firm_name}"
+        _ai_persona = ai_persona if ai_persona else f"Você é um especialista em {area} com vasta experiência em redação jurídica do escritório {_firm_name}."
+        
+        # Template pré-compilado por área
+        return {
+            "messages": self._mensagens(
+                PETICAO.get(area, PETICAO["geral"]),
+                _ai_persona,
+                instrucoes_fixas,
+                firm_name=_firm_name,
+                lawyer_name=_lawyer_name,
+                signature_text=_signature_text,
+                prompt=prompt
+            ),
+            "max_tokens": max_tokens,
+            "temperature": 0.2
+        }
+
+    def modelos_peticao(self, prompt: str, area: str, instrucoes_fixas: Optional[str] = None, metodo: str = "peticao", max_tokens: int = 2000) -> List[str]:
+        """Modelos da rota de gerar_peticao_especializada com os mesmos argumentos (sem chamar o provedor)"""
+        chamada = self._preparar_peticao(prompt, area, None, None, None, None, instrucoes_fixas, max_tokens)
+        return self.rotas.modelos(metodo, chamada, area, None)
+    
+    async def gerar_peticao_especializada(self, prompt: str, area: str, firm_name: Optional[str] = None, lawyer_name: Optional[str] = None, signature_text: Optional[str] = None, ai_persona: Optional[str] = None, instrucoes_fixas: Optional[str] = None, metodo: str = "peticao", max_tokens: int = 2000) -> Dict[str, Any]:
+        """
+        Método específico para petições especializadas (instrucoes_fixas: bloco estático do módulo, vai no prefixo).
+        metodo/max_tokens: partes da petição geradas separadamente ("peticao_caso", "peticao_secoes")
+        têm roteamento, distribuição de saída e parada próprios.
+        """
+        if not self.provedor.configurado:
             return {
                 "peticao": "⚠️ Chave OpenAI não configurada no arquivo .env",
                 "modelo": self.model,
@@ -278,86 +1249,19 @@ class AIService:
                 "status": "erro_configuracao"
             }
         
-        # Definir padrões para branding se não forem fornecidos
-        _firm_name = firm_name if firm_name else "Serviço Jurídico de IA"
-        _lawyer_name = lawyer_name if lawyer_name else "um especialista em Direito"
-        _signature_text = signature_text if signature_text else f"Atenciosamente, {_lawyer_name} do {_firm_name}"
-        _ai_persona = ai_persona if ai_persona else f"Você é um especialista em {area} com vasta experiência em redação jurídica do escritório {_firm_name}."
-        
         try:
-            # Prompt especializado por área
-            prompts = {
-                "trabalhista": f"""
-                {_ai_persona}
-                Você atua como {_lawyer_name}, especialista em Direito Trabalhista brasileiro.
-                Redija uma petição jurídica completa e formal com base no seguinte pedido:
-                
-                {prompt}
-                
-                Inclua:
-                - Cabeçalho completo (endereçamento ao juízo, qualificação das partes)
-                - Fundamentação legal (CLT, Constituição Federal, Normas Regulamentadoras)
-                - Jurisprudência relevante (TST, STF)
-                - Pedidos claros e específicos
-                - Documentação necessária
-                - Assinatura formal
-                
-                Assine como: {_signature_text}
-                """,
-                "previdenciario": f"""
-                {_ai_persona}
-                Você atua como {_lawyer_name}, especialista em Direito Previdenciário brasileiro.
-                Redija uma petição jurídica completa e formal com base no seguinte pedido:
-                
-                {prompt}
-                
-                Inclua:
-                - Cabeçalho completo (endereçamento ao juízo, qualificação das partes)
-                - Fundamentação legal (Lei 8.213/91, EC 103/2019, Decreto 3.048/99)
-                - Jurisprudência relevante (STJ, STF, TNU)
-                - Pedidos claros e específicos
-                - Documentação necessária
-                - Assinatura formal
-                
-                Assine como: {_signature_text}
-                """,
-                "geral": f"""
-                {_ai_persona}
-                Você é um assistente jurídico geral do escritório {_firm_name}.
-                Redija uma petição jurídica completa e formal com base no seguinte pedido:
-                
-                {prompt}
-                
-                Inclua:
-                - Cabeçalho completo (endereçamento ao juízo, qualificação das partes)
-                - Fundamentação legal relevante ao caso
-                - Jurisprudência aplicável
-                - Pedidos claros e específicos
-                - Documentação necessária
-                - Assinatura formal
-                
-                Assine como: {_signature_text}
-                """
-            }
-            
-            peticao_prompt = prompts.get(area, prompts["geral"])
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": _ai_persona},
-                    {"role": "user", "content": peticao_prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.2
-            )
+            chamada = self._preparar_peticao(prompt, area, firm_name, lawyer_name, signature_text, ai_persona, instrucoes_fixas, max_tokens)
+            branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+            response = await self._completar_com_cache(metodo, chamada, branding, area)
             
             return {
-                "peticao": response.choices[0].message.content,
-                "modelo": self.model,
-                "tokens_usados": response.usage.total_tokens,
+                "peticao": response["conteudo"],
+                "modelo": response["modelo"],
+                "tokens_usados": response["tokens_usados"],
                 "area": area,
-                "status": "sucesso"
+                "cache": response["cache"],
+                "truncada": response.get("truncada", False),
+                "status": response.get("status", "sucesso")
             }
             
         except Exception as e:
@@ -368,5 +1272,23 @@ class AIService:
                 "status": "erro"
             }
 
+    async def gerar_peticao_especializada_stream(
+        self,
+        prompt: str,
+        area: str,
+        firm_name: Optional[str] = None,
+        lawyer_name: Optional[str] = None,
+        signature_text: Optional[str] = None,
+        ai_persona: Optional[str] = None,
+        instrucoes_fixas: Optional[str] = None,
+        metodo: str = "peticao",
+        max_tokens: int = 2000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Petição especializada em streaming (mesma chamada e mesmo cache do modo normal)"""
+        chamada = self._preparar_peticao(prompt, area, firm_name, lawyer_name, signature_text, ai_persona, instrucoes_fixas, max_tokens)
+        branding = self._branding(firm_name, lawyer_name, signature_text, ai_persona)
+        async for evento in self._transmitir(metodo, chamada, branding, {"area": area}, "Erro ao gerar petição", area):
+            yield evento
+
 # Instância global
 ai_service = AIService()
\ No newline at end of file
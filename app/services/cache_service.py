@@ -1,5 +1,5 @@
 # app/services/cache_service.py
-import redis
+import redis.asyncio as redis
 import json
 import hashlib
 from typing import Optional, Any
@@ -7,12 +7,18 @@ from app.core.config import settings
 
 class CacheService:
     def __init__(self):
-        self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        # Cliente assíncrono: operações de cache não bloqueiam o event loop
+        self.redis_client = redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=settings.redis_timeout,
+            socket_timeout=settings.redis_timeout
+        )
     
     async def get_ai_response(self, cache_key: str) -> Optional[str]:
         """Recupera resposta da IA do cache"""
         try:
-            return self.redis_client.get(f"ai_response:{cache_key}")
+            return await self.redis_client.get(f"ai_response:{cache_key}")
         except Exception as e:
             print(f"Erro ao buscar cache: {e}")
             return None
@@ -21,23 +27,57 @@ class CacheService:
         """Salva resposta da IA no cache"""
         try:
             if ttl is None:
-                ttl = settings.CACHE_TTL_AI_RESPONSE
+                ttl = settings.cache_ttl_ai_response
             
-            self.redis_client.setex(
-                f"ai_response:{cache_key}", 
-                ttl, 
-                response
-            )
+            # Cópia de longa duração servida quando o provedor está fora (circuito aberto)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(f"ai_response:{cache_key}", ttl, response)
+                pipe.setex(f"ai_response_stale:{cache_key}", max(ttl, settings.cache_ttl_ai_stale), response)
+                await pipe.execute()
             return True
         except Exception as e:
             print(f"Erro ao salvar cache: {e}")
             return False
     
+    async def get_ai_response_stale(self, cache_key: str) -> Optional[str]:
+        """Recupera a última resposta conhecida, mesmo com o TTL normal expirado"""
+        try:
+            return await self.redis_client.get(f"ai_response_stale:{cache_key}")
+        except Exception as e:
+            print(f"Erro ao buscar cache antigo: {e}")
+            return None
+    
+    async def adquirir_lock(self, nome: str, token: str, ttl: int) -> Optional[bool]:
+        """Tenta obter um lock (SET NX); retorna None se o Redis estiver indisponível"""
+        try:
+            return bool(await self.redis_client.set(f"lock:{nome}", token, nx=True, ex=ttl))
+        except Exception as e:
+            print(f"Erro ao obter lock no cache: {e}")
+            return None
+    
+    async def liberar_lock(self, nome: str, token: str) -> bool:
+        """Libera o lock somente se ainda pertencer a quem o obteve"""
+        try:
+            if await self.redis_client.get(f"lock:{nome}") == token:
+                await self.redis_client.delete(f"lock:{nome}")
+            return True
+        except Exception as e:
+            print(f"Erro ao liberar lock no cache: {e}")
+            return False
+    
+    async def lock_ativo(self, nome: str) -> bool:
+        """Verifica se o lock ainda está ativo"""
+        try:
+            return bool(await self.redis_client.exists(f"lock:{nome}"))
+        except Exception as e:
+            print(f"Erro ao verificar lock no cache: {e}")
+            return False
+    
     async def get_jurisprudencia(self, area: str, palavras_chave: list) -> Optional[list]:
         """Recupera jurisprudência do cache"""
         try:
             cache_key = self._generate_jurisprudencia_key(area, palavras_chave)
-            cached_data = self.redis_client.get(f"jurisprudencia:{cache_key}")
+            cached_data = await self.redis_client.get(f"jurisprudencia:{cache_key}")
             
             if cached_data:
                 return json.loads(cached_data)
@@ -51,9 +91,9 @@ class CacheService:
         try:
             cache_key = self._generate_jurisprudencia_key(area, palavras_chave)
             
-            self.redis_client.setex(
+            await self.redis_client.setex(
                 f"jurisprudencia:{cache_key}",
-                settings.CACHE_TTL_JURISPRUDENCIA,
+                settings.cache_ttl_jurisprudencia,
                 json.dumps(data, ensure_ascii=False)
             )
             return True
@@ -65,7 +105,7 @@ class CacheService:
         """Recupera legislação do cache"""
         try:
             cache_key = self._generate_legislacao_key(area, termo)
-            cached_data = self.redis_client.get(f"legislacao:{cache_key}")
+            cached_data = await self.redis_client.get(f"legislacao:{cache_key}")
             
             if cached_data:
                 return json.loads(cached_data)
@@ -79,9 +119,9 @@ class CacheService:
         try:
             cache_key = self._generate_legislacao_key(area, termo)
             
-            self.redis_client.setex(
+            await self.redis_client.setex(
                 f"legislacao:{cache_key}",
-                settings.CACHE_TTL_JURISPRUDENCIA,
+                settings.cache_ttl_jurisprudencia,
                 json.dumps(data, ensure_ascii=False)
             )
             return True
@@ -102,9 +142,9 @@ class CacheService:
     async def clear_cache(self, pattern: str = "*") -> bool:
         """Limpa cache por padrão"""
         try:
-            keys = self.redis_client.keys(pattern)
+            keys = await self.redis_client.keys(pattern)
             if keys:
-                self.redis_client.delete(*keys)
+                await self.redis_client.delete(*keys)
             return True
         except Exception as e:
             print(f"Erro ao limpar cache: {e}")
@@ -113,7 +153,7 @@ class CacheService:
     async def get_cache_stats(self) -> dict:
         """Retorna estatísticas do cache"""
         try:
-            info = self.redis_client.info()
+            info = await self.redis_client.info()
             return {
                 "total_keys": info.get("db0", {}).get("keys", 0),
                 "memory_used": info.get("used_memory_human", "0B"),
@@ -121,4 +161,11 @@ class CacheService:
             }
         except Exception as e:
             print(f"Erro ao obter estatísticas do cache: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    async def fechar(self) -> None:
+        """Fecha as conexões com o Redis"""
+        try:
+            await self.redis_client.aclose()
+        except Exception as e:
+            print(f"Erro ao fechar conexão com o cache: {e}")
\ No newline at end of file
@@ -0,0 +1,116 @@
+# app/services/circuit_breaker.py - DISJUNTOR (CIRCUIT BREAKER) DAS CHAMADAS AO PROVEDOR
+"""
+Disjuntor por modelo:
+
+- fechado: chamadas passam; erros transitórios e respostas lentas entram
+  numa janela deslizante. Se a taxa de falhas passar do limite, abre.
+- aberto: chamadas falham na hora (CircuitoAberto), sem ocupar worker nem
+  conexão esperando timeout. Depois de CIRCUITO_TEMPO_ABERTO, meio-aberto.
+- meio_aberto: poucas chamadas de sondagem passam; sucesso fecha o
+  circuito, falha abre de novo.
+"""
+import time
+from collections import deque
+from typing import Dict, Any, Deque, Optional
+
+
+class CircuitoAberto(Exception):
+    """Chamada recusada sem tentar o provedor porque o circuito está aberto"""
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        nome: str,
+        taxa_falhas: float,
+        janela: int,
+        minimo_chamadas: int,
+        latencia_limite: float,
+        tempo_aberto: float,
+        sondas: int = 1
+    ):
+        self.nome = nome
+        self.taxa_falhas = taxa_falhas
+        self.minimo_chamadas = minimo_chamadas
+        self.latencia_limite = latencia_limite
+        self.tempo_aberto = tempo_aberto
+        self.sondas = sondas
+
+        self.estado = "fechado"
+        self._resultados: Deque[bool] = deque(maxlen=janela)  # True = falha
+        self._aberto_ate = 0.0
+        self._sondas_em_voo = 0
+        self.aberto_desde: Optional[float] = None
+        self.stats = {"aberturas": 0, "rejeitadas": 0, "falhas": 0, "lentas": 0}
+
+    def permitir(self) -> bool:
+        """Decide se a chamada pode seguir para o provedor"""
+        if self.estado == "aberto":
+            if time.monotonic() < self._aberto_ate:
+                self.stats["rejeitadas"] += 1
+                return False
+            self.estado = "meio_aberto"
+            self._sondas_em_voo = 0
+
+        if self.estado == "meio_aberto":
+            if self._sondas_em_voo >= self.sondas:
+                self.stats["rejeitadas"] += 1
+                return False
+            self._sondas_em_voo += 1
+
+        return True
+
+    def registrar_sucesso(self, latencia: float) -> None:
+        if latencia > self.latencia_limite:
+            # Resposta lenta demais conta como falha: o provedor está degradado
+            self.stats["lentas"] += 1
+            self._registrar(falha=True)
+            return
+        self._registrar(falha=False)
+
+    def registrar_falha(self) -> None:
+        self.stats["falhas"] += 1
+        self._registrar(falha=True)
+
+    def liberar(self) -> None:
+        """Chamada cancelada/neutra: devolve a vaga de sondagem sem mudar o estado"""
+        if self.estado == "meio_aberto" and self._sondas_em_voo > 0:
+            self._sondas_em_voo -= 1
+
+    def _registrar(self, falha: bool) -> None:
+        if self.estado == "meio_aberto":
+            if falha:
+                self._abrir()
+            else:
+                self._fechar()
+            return
+
+        self._resultados.append(falha)
+        if len(self._resultados) >= self.minimo_chamadas:
+            if sum(self._resultados) / len(self._resultados) >= self.taxa_falhas:
+                self._abrir()
+
+    def _abrir(self) -> None:
+        self.estado = "aberto"
+        self._aberto_ate = time.monotonic() + self.tempo_aberto
+        self._sondas_em_voo = 0
+        self.aberto_desde = time.time()
+        self.stats["aberturas"] += 1
+
+    def _fechar(self) -> None:
+        self.estado = "fechado"
+        self._resultados.clear()
+        self._sondas_em_voo = 0
+        self.aberto_desde = None
+
+    def estado_publico(self) -> Dict[str, Any]:
+        falhas = sum(self._resultados)
+        return {
+            "estado": self.estado,
+            "taxa_falhas": round(falhas / len(self._resultados), 3) if self._resultados else 0.0,
+            "chamadas_na_janela": len(self._resultados),
+            "aberto_desde": self.aberto_desde,
+            "reabre_em": round(max(0.0, self._aberto_ate - time.monotonic()), 1) if self.estado == "aberto" else None,
+            **self.stats
+        }
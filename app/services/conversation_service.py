@@ -0,0 +1,217 @@
+# app/services/conversation_service.py - SESSÕES DE CONSULTA COM HISTÓRICO LIMITADO
+"""
+Consultas com continuidade: o cliente abre uma sessão e manda só a pergunta
+nova; o histórico fica no Redis.
+
+- sessao:{id} (hash): escritório, área, resumo acumulado e contadores
+- sessao:{id}:turnos (lista): turnos ainda não resumidos, com os tokens de cada um
+- Cada turno envia ao modelo o resumo + os turnos mais recentes que cabem em
+  SESSAO_ORCAMENTO_TOKENS: o prompt não cresce com o tamanho da conversa.
+- Passado o orçamento, os turnos antigos (fora dos SESSAO_TOKENS_RECENTES
+  mais novos) são compactados no resumo em segundo plano. O resumo fica
+  salvo na sessão e a chamada que o gera passa pelo cache de respostas.
+"""
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable, Awaitable
+from app.core.config import settings
+from app.core.request_context import ignorar_cache, prazo
+from app.services.cache_service import CacheService
+from app.services.prompt_compiler import contar_tokens
+
+Resumidor = Callable[[str, List[Dict[str, Any]]], Awaitable[Optional[str]]]
+
+
+class SessoesConsulta:
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+        self.stats = {"criadas": 0, "turnos": 0, "compactacoes": 0, "turnos_compactados": 0, "turnos_fora_do_orcamento": 0}
+        self._compactacoes: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _chaves(sessao_id: str) -> Tuple[str, str]:
+        return f"sessao:{sessao_id}", f"sessao:{sessao_id}:turnos"
+
+    async def criar(self, escritorio: Optional[str], area: str = "geral") -> Optional[str]:
+        """Abre uma sessão; None se o Redis estiver indisponível"""
+        sessao_id = uuid.uuid4().hex
+        chave, _ = self._chaves(sessao_id)
+        try:
+            async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(chave, mapping={
+                    "escritorio": escritorio or "",
+                    "area": area,
+                    "resumo": "",
+                    "tokens_resumo": 0,
+                    "tokens_turnos": 0,
+                    "turnos_resumidos": 0,
+                    "criada_em": time.time()
+                })
+                pipe.expire(chave, settings.sessao_ttl)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Erro ao criar sessão de consulta: {e}")
+            return None
+        self.stats["criadas"] += 1
+        return sessao_id
+
+    async def carregar(self, sessao_id: str, escritorio: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Sessão com os turnos não resumidos; None se não existe, expirou ou é de outro escritório"""
+        chave, chave_turnos = self._chaves(sessao_id)
+        try:
+            async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hgetall(chave)
+                pipe.lrange(chave_turnos, 0, -1)
+                meta, turnos = await pipe.execute()
+        except Exception as e:
+            print(f"Erro ao carregar sessão de consulta: {e}")
+            return None
+        if not meta or meta.get("escritorio", "") != (escritorio or ""):
+            return None
+        return {
+            "id": sessao_id,
+            "escritorio": meta.get("escritorio") or None,
+            "area": meta.get("area", "geral"),
+            "resumo": meta.get("resumo", ""),
+            "tokens_resumo": int(meta.get("tokens_resumo", 0)),
+            "tokens_turnos": int(meta.get("tokens_turnos", 0)),
+            "turnos_resumidos": int(meta.get("turnos_resumidos", 0)),
+            "criada_em": float(meta.get("criada_em", 0)),
+            "turnos": [json.loads(turno) for turno in turnos]
+        }
+
+    def historico(self, sessao: Dict[str, Any]) -> Tuple[List[Dict[str, str]], int]:
+        """Mensagens de contexto (resumo + turnos mais recentes dentro do orçamento) e os tokens delas"""
+        usados = sessao["tokens_resumo"]
+        recentes: List[Dict[str, Any]] = []
+        for turno in reversed(sessao["turnos"]):
+            if usados + turno["tokens"] > settings.sessao_orcamento_tokens:
+                # Compactação ainda pendente: o excedente fica de fora em vez de inflar o prompt
+                self.stats["turnos_fora_do_orcamento"] += len(sessao["turnos"]) - len(recentes)
+                break
+            recentes.insert(0, turno)
+            usados += turno["tokens"]
+
+        mensagens: List[Dict[str, str]] = []
+        if sessao["resumo"]:
+            mensagens.append({"role": "system", "content": f"RESUMO DA CONVERSA ATÉ AQUI:\n{sessao['resumo']}"})
+        for turno in recentes:
+            mensagens.append({"role": "user", "content": turno["pergunta"]})
+            mensagens.append({"role": "assistant", "content": turno["resposta"]})
+        return mensagens, usados
+
+    async def contexto(self, sessao_id: str, escritorio: Optional[str]) -> Optional[Tuple[List[Dict[str, str]], int, bool]]:
+        """Histórico a enviar ao modelo, tokens dele e se a pergunta é de seguimento; None se a sessão expirou"""
+        sessao = await self.carregar(sessao_id, escritorio)
+        if sessao is None:
+            return None
+        historico, tokens_historico = self.historico(sessao)
+        return historico, tokens_historico, bool(sessao["turnos"] or sessao["resumo"])
+
+    @staticmethod
+    def expirada(sessao_id: str) -> Dict[str, Any]:
+        return {
+            "resposta": "Sessão de consulta não encontrada ou expirada",
+            "tokens_usados": 0,
+            "sessao_id": sessao_id,
+            "status": "sessao_expirada"
+        }
+
+    async def adicionar_turno(
+        self,
+        sessao_id: str,
+        pergunta: str,
+        resposta: str,
+        escritorio: Optional[str],
+        resumir: Resumidor
+    ) -> None:
+        """Guarda o turno e, passado o orçamento, compacta a sessão em segundo plano"""
+        if not await self.registrar_turno(sessao_id, pergunta, resposta):
+            return
+
+        async def compactar() -> None:
+            # Fora do prazo e do X-Cache-Bypass da requisição que disparou a compactação
+            prazo.set(None)
+            ignorar_cache.set(False)
+            await self.compactar(sessao_id, escritorio, resumir)
+
+        # Referência guardada até o fim: o event loop só mantém referência fraca às tasks
+        tarefa = asyncio.create_task(compactar())
+        self._compactacoes.add(tarefa)
+        tarefa.add_done_callback(self._compactacoes.discard)
+
+    async def registrar_turno(self, sessao_id: str, pergunta: str, resposta: str) -> bool:
+        """Guarda o turno; True quando o histórico passou do orçamento e deve ser compactado"""
+        chave, chave_turnos = self._chaves(sessao_id)
+        tokens = contar_tokens(pergunta) + contar_tokens(resposta)
+        turno = json.dumps({"pergunta": pergunta, "resposta": resposta, "tokens": tokens}, ensure_ascii=False)
+        try:
+            async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+                pipe.rpush(chave_turnos, turno)
+                pipe.hincrby(chave, "tokens_turnos", tokens)
+                pipe.hget(chave, "tokens_resumo")
+                pipe.expire(chave, settings.sessao_ttl)
+                pipe.expire(chave_turnos, settings.sessao_ttl)
+                _, tokens_turnos, tokens_resumo, _, _ = await pipe.execute()
+        except Exception as e:
+            print(f"Erro ao registrar turno da sessão: {e}")
+            return False
+        self.stats["turnos"] += 1
+        return tokens_turnos + int(tokens_resumo or 0) > settings.sessao_orcamento_tokens
+
+    async def compactar(self, sessao_id: str, escritorio: Optional[str], resumir: Resumidor) -> None:
+        """Resume os turnos antigos no resumo acumulado (um compactador por sessão)"""
+        trava = f"sessao_resumo:{sessao_id}"
+        dono = uuid.uuid4().hex
+        if not await self.cache.adquirir_lock(trava, dono, 120):
+            return
+        try:
+            # Turnos que chegaram durante o resumo (a trava barrou a compactação deles) entram na volta seguinte
+            for _ in range(3):
+                sessao = await self.carregar(sessao_id, escritorio)
+                if sessao is None or sessao["tokens_resumo"] + sessao["tokens_turnos"] <= settings.sessao_orcamento_tokens:
+                    return
+
+                # Mantém literais os turnos mais novos que cabem em SESSAO_TOKENS_RECENTES
+                mantidos = 0
+                soma = 0
+                for turno in reversed(sessao["turnos"]):
+                    if soma + turno["tokens"] > settings.sessao_tokens_recentes:
+                        break
+                    soma += turno["tokens"]
+                    mantidos += 1
+                antigos = sessao["turnos"][:len(sessao["turnos"]) - mantidos]
+                if not antigos:
+                    return
+
+                resumo = await resumir(sessao["resumo"], antigos)
+                if not resumo:
+                    return
+
+                chave, chave_turnos = self._chaves(sessao_id)
+                async with self.cache.redis_client.pipeline(transaction=True) as pipe:
+                    # Turnos novos entram pelo fim da lista: cortar o início não os perde
+                    pipe.ltrim(chave_turnos, len(antigos), -1)
+                    pipe.hset(chave, mapping={"resumo": resumo, "tokens_resumo": contar_tokens(resumo)})
+                    pipe.hincrby(chave, "tokens_turnos", -sum(turno["tokens"] for turno in antigos))
+                    pipe.hincrby(chave, "turnos_resumidos", len(antigos))
+                    await pipe.execute()
+                self.stats["compactacoes"] += 1
+                self.stats["turnos_compactados"] += len(antigos)
+        except Exception as e:
+            print(f"Erro ao compactar sessão de consulta: {e}")
+        finally:
+            await self.cache.liberar_lock(trava, dono)
+
+    async def encerrar(self, sessao_id: str, escritorio: Optional[str]) -> bool:
+        if await self.carregar(sessao_id, escritorio) is None:
+            return False
+        try:
+            await self.cache.redis_client.delete(*self._chaves(sessao_id))
+            return True
+        except Exception as e:
+            print(f"Erro ao encerrar sessão de consulta: {e}")
+            return False
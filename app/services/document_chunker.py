@@ -0,0 +1,88 @@
+# app/services/document_chunker.py - DIVISÃO DE DOCUMENTOS LONGOS EM TRECHOS
+"""
+Divide documentos em trechos limitados por tokens, respeitando parágrafos.
+
+As fronteiras entre trechos são definidas pelo conteúdo (hash do parágrafo),
+e não apenas pela posição: ao editar um parágrafo, somente o trecho que o
+contém muda e os trechos seguintes voltam a coincidir com os anteriores,
+o que permite reaproveitar as análises em cache.
+"""
+import re
+import zlib
+from typing import List, Optional
+from app.services.prompt_compiler import contar_tokens
+
+_PARAGRAFOS = re.compile(r"\n\s*\n")
+_SENTENCAS = re.compile(r"(?<=[.;:!?])\s+")
+
+# Fecha o trecho em ~1 a cada N parágrafos, depois de atingir o tamanho mínimo
+_DIVISOR_FRONTEIRA = 4
+
+
+def _fronteira(paragrafo: str) -> bool:
+    """Fronteira definida pelo conteúdo do parágrafo (estável entre edições)"""
+    return zlib.crc32(paragrafo.encode()) % _DIVISOR_FRONTEIRA == 0
+
+
+def _quebrar_paragrafo(paragrafo: str, max_tokens: int, modelo: Optional[str]) -> List[str]:
+    """Quebra um parágrafo maior que o limite em sentenças e, se preciso, em palavras"""
+    partes: List[str] = []
+    atual: List[str] = []
+    tokens_atual = 0
+
+    for sentenca in _SENTENCAS.split(paragrafo):
+        tokens = contar_tokens(sentenca, modelo)
+        if tokens > max_tokens:
+            # Sentença gigante (ex.: tabela sem pontuação): corte por palavras
+            palavras = sentenca.split()
+            passo = max(1, len(palavras) * max_tokens // tokens)
+            for i in range(0, len(palavras), passo):
+                if atual:
+                    partes.append(" ".join(atual))
+                    atual, tokens_atual = [], 0
+                partes.append(" ".join(palavras[i:i + passo]))
+            continue
+        if atual and tokens_atual + tokens > max_tokens:
+            partes.append(" ".join(atual))
+            atual, tokens_atual = [], 0
+        atual.append(sentenca)
+        tokens_atual += tokens
+
+    if atual:
+        partes.append(" ".join(atual))
+    return partes
+
+
+def dividir_em_trechos(texto: str, max_tokens: int, modelo: Optional[str] = None) -> List[str]:
+    """Divide o texto em trechos de até `max_tokens`, sem cortar parágrafos quando possível"""
+    paragrafos: List[str] = []
+    for paragrafo in _PARAGRAFOS.split(texto):
+        paragrafo = paragrafo.strip()
+        if not paragrafo:
+            continue
+        if contar_tokens(paragrafo, modelo) > max_tokens:
+            paragrafos.extend(_quebrar_paragrafo(paragrafo, max_tokens, modelo))
+        else:
+            paragrafos.append(paragrafo)
+
+    minimo = max_tokens // 2
+    trechos: List[str] = []
+    atual: List[str] = []
+    tokens_atual = 0
+
+    for paragrafo in paragrafos:
+        tokens = contar_tokens(paragrafo, modelo)
+        if atual and tokens_atual + tokens > max_tokens:
+            trechos.append("\n\n".join(atual))
+            atual, tokens_atual = [], 0
+
+        atual.append(paragrafo)
+        tokens_atual += tokens
+
+        if tokens_atual >= minimo and _fronteira(paragrafo):
+            trechos.append("\n\n".join(atual))
+            atual, tokens_atual = [], 0
+
+    if atual:
+        trechos.append("\n\n".join(atual))
+    return trechos
@@ -0,0 +1,168 @@
+# app/services/fair_queue.py - FILA JUSTA (DRR POR ESCRITÓRIO) PARA AS VAGAS DO PROVEDOR
+"""
+Ordem de atendimento das chamadas que esperam vaga de concorrência no gateway.
+
+- Classes de prioridade (FILA_CLASSE_METODO): "interativa" (consultas),
+  "padrao" e "lote" (petições). Entre classes, round robin ponderado por
+  FILA_PESOS_CLASSE: a interativa passa na frente sem deixar o lote parado.
+- Dentro da classe, Deficit Round Robin por escritório (firm_name): cada
+  escritório ganha FILA_QUANTUM tokens de crédito por rodada (multiplicado
+  pelo peso do plano) e a chamada sai quando o crédito cobre os tokens
+  estimados dela. Uma rajada de petições de um escritório não passa na frente
+  das chamadas dos outros.
+
+Profundidade da fila e tempo de espera por escritório ficam em estatisticas().
+"""
+import asyncio
+import time
+from collections import deque, OrderedDict
+from typing import Dict, Any, Deque, Optional
+from app.core.config import settings
+
+SEM_ESCRITORIO = "sem_escritorio"
+
+
+class Pedido:
+    """Chamada aguardando vaga"""
+
+    __slots__ = ("escritorio", "classe", "custo", "peso", "futuro", "enfileirado_em")
+
+    def __init__(self, escritorio: str, classe: str, custo: int, peso: float, futuro: asyncio.Future):
+        self.escritorio = escritorio
+        self.classe = classe
+        self.custo = max(1, custo)
+        self.peso = peso
+        self.futuro = futuro
+        self.enfileirado_em = time.monotonic()
+
+
+class _ClasseDRR:
+    """Deficit Round Robin entre escritórios de uma classe"""
+
+    def __init__(self):
+        self.filas: "OrderedDict[str, Deque[Pedido]]" = OrderedDict()
+        self.deficit: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return sum(len(fila) for fila in self.filas.values())
+
+    def adicionar(self, pedido: Pedido) -> None:
+        if pedido.escritorio not in self.filas:
+            self.filas[pedido.escritorio] = deque()
+            self.deficit[pedido.escritorio] = 0.0
+        self.filas[pedido.escritorio].append(pedido)
+
+    def remover(self, pedido: Pedido) -> None:
+        fila = self.filas.get(pedido.escritorio)
+        if fila is None:
+            return
+        try:
+            fila.remove(pedido)
+        except ValueError:
+            return
+        if not fila:
+            del self.filas[pedido.escritorio]
+            del self.deficit[pedido.escritorio]
+
+    def proximo(self) -> Optional[Pedido]:
+        while self.filas:
+            escritorio, fila = next(iter(self.filas.items()))
+            pedido = fila[0]
+            if self.deficit[escritorio] < pedido.custo:
+                # Crédito insuficiente: ganha o quantum e vai para o fim da rodada
+                self.deficit[escritorio] += settings.fila_quantum * pedido.peso
+                self.filas.move_to_end(escritorio)
+                continue
+            fila.popleft()
+            self.deficit[escritorio] -= pedido.custo
+            if not fila:
+                # Escritório sem pedidos não acumula crédito
+                del self.filas[escritorio]
+                del self.deficit[escritorio]
+            return pedido
+        return None
+
+
+class FilaJusta:
+
+    def __init__(self):
+        self.pesos_classe: Dict[str, int] = dict(settings.fila_pesos_classe)
+        self._classes: Dict[str, _ClasseDRR] = {classe: _ClasseDRR() for classe in self.pesos_classe}
+        self._creditos: Dict[str, int] = dict(self.pesos_classe)
+        self._esperas: Dict[str, Deque[float]] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(classe) for classe in self._classes.values())
+
+    @staticmethod
+    def classe_do_metodo(metodo: Optional[str]) -> str:
+        return settings.fila_classe_metodo.get(metodo or "", "padrao")
+
+    @staticmethod
+    def peso_do_tier(tier: Optional[str]) -> float:
+        return float(settings.fila_pesos_tier.get(tier or "", 1))
+
+    def enfileirar(self, escritorio: Optional[str], classe: str, custo: int, peso: float) -> Pedido:
+        if classe not in self._classes:
+            classe = "padrao" if "padrao" in self._classes else next(iter(self._classes))
+        pedido = Pedido(escritorio or SEM_ESCRITORIO, classe, custo, peso, asyncio.get_running_loop().create_future())
+        self._classes[classe].adicionar(pedido)
+        self._contadores(pedido.escritorio)["enfileirados"] += 1
+        return pedido
+
+    def registrar_direto(self, escritorio: Optional[str]) -> None:
+        """Chamada que encontrou vaga livre e não entrou na fila"""
+        escritorio = escritorio or SEM_ESCRITORIO
+        self._esperas.setdefault(escritorio, deque(maxlen=500)).append(0.0)
+        self._contadores(escritorio)["atendidos"] += 1
+
+    def remover(self, pedido: Pedido) -> None:
+        """Pedido cancelado enquanto esperava"""
+        self._classes[pedido.classe].remover(pedido)
+        self._contadores(pedido.escritorio)["cancelados"] += 1
+
+    def proximo(self) -> Optional[Pedido]:
+        """Round robin ponderado entre classes não vazias, DRR dentro da classe"""
+        ativas = [classe for classe, fila in self._classes.items() if len(fila)]
+        if not ativas:
+            return None
+        if not any(self._creditos[classe] > 0 for classe in ativas):
+            self._creditos = dict(self.pesos_classe)
+        # Ordem de declaração = prioridade: a primeira classe com crédito é atendida
+        classe = next(c for c in ativas if self._creditos[c] > 0)
+        self._creditos[classe] -= 1
+
+        pedido = self._classes[classe].proximo()
+        espera = time.monotonic() - pedido.enfileirado_em
+        self._esperas.setdefault(pedido.escritorio, deque(maxlen=500)).append(espera)
+        contadores = self._contadores(pedido.escritorio)
+        contadores["atendidos"] += 1
+        contadores["espera_total"] += espera
+        return pedido
+
+    def _contadores(self, escritorio: str) -> Dict[str, Any]:
+        return self.stats.setdefault(escritorio, {"enfileirados": 0, "atendidos": 0, "cancelados": 0, "espera_total": 0.0})
+
+    def estatisticas(self) -> Dict[str, Any]:
+        profundidade: Dict[str, Dict[str, int]] = {}
+        for classe, fila in self._classes.items():
+            for escritorio, pedidos in fila.filas.items():
+                profundidade.setdefault(escritorio, {})[classe] = len(pedidos)
+
+        escritorios = {}
+        for escritorio, contadores in self.stats.items():
+            esperas = sorted(self._esperas.get(escritorio, ()))
+            escritorios[escritorio] = {
+                "na_fila": profundidade.get(escritorio, {}),
+                **{k: v for k, v in contadores.items() if k != "espera_total"},
+                "espera_media": round(contadores["espera_total"] / contadores["atendidos"], 3) if contadores["atendidos"] else 0.0,
+                "espera_p95": round(esperas[int(len(esperas) * 0.95)], 3) if esperas else 0.0,
+                "espera_max": round(esperas[-1], 3) if esperas else 0.0
+            }
+        return {
+            "aguardando": len(self),
+            "por_classe": {classe: len(fila) for classe, fila in self._classes.items()},
+            "pesos_classe": self.pesos_classe,
+            "escritorios": escritorios
+        }
@@ -0,0 +1,139 @@
+# app/services/hedging.py - REQUISIÇÕES "HEDGED" PARA REDUZIR A LATÊNCIA DE CAUDA
+"""
+Hedging opcional (HEDGE_ATIVO) das chamadas ao provedor.
+
+Se a chamada original não entregar o primeiro token (ou, sem streaming, a
+resposta) dentro do percentil HEDGE_PERCENTIL da latência recente daquele
+método/modelo, uma segunda chamada idêntica é disparada, no próximo modelo
+da rota ou no mesmo modelo. A primeira que terminar vence; a outra é cancelada.
+
+O custo extra fica limitado por HEDGE_TAXA_MAXIMA: a fração de chamadas com
+hedge nas últimas HEDGE_JANELA chamadas nunca passa desse limite.
+"""
+import asyncio
+from collections import deque
+from typing import Dict, Any, Callable, Awaitable, Optional, Deque, TypeVar
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """Quando disparar o hedge e quanto ele está custando"""
+
+    def __init__(self):
+        self.ativo = settings.hedge_ativo
+        self.metodos = set(settings.hedge_metodos)
+        self.percentil = settings.hedge_percentil
+        self._latencias: Dict[str, Deque[float]] = {}
+        self._disparos: Deque[bool] = deque(maxlen=settings.hedge_janela)
+        self.stats = {
+            "chamadas": 0,
+            "hedges": 0,
+            "vitorias_hedge": 0,
+            "vitorias_original": 0,
+            "negados_orcamento": 0,
+            "tokens_extra": 0,
+            "custo_extra_usd": 0.0
+        }
+
+    def aplicavel(self, metodo: Optional[str]) -> bool:
+        return self.ativo and metodo in self.metodos
+
+    def registrar_latencia(self, chave: str, latencia: float) -> None:
+        """Latência até o primeiro token (streaming) ou até a resposta (sem streaming)"""
+        self._latencias.setdefault(chave, deque(maxlen=settings.hedge_janela)).append(latencia)
+
+    def atraso(self, chave: str) -> Optional[float]:
+        """Tempo de espera antes do hedge; None enquanto não há amostras suficientes"""
+        latencias = self._latencias.get(chave)
+        if not latencias or len(latencias) < settings.hedge_minimo_amostras:
+            return None
+        ordenadas = sorted(latencias)
+        valor = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * self.percentil))]
+        return max(settings.hedge_atraso_minimo, valor)
+
+    def pode_disparar(self) -> bool:
+        """Respeita o orçamento de hedges na janela recente"""
+        if (sum(self._disparos) + 1) / (len(self._disparos) + 1) > settings.hedge_taxa_maxima:
+            self.stats["negados_orcamento"] += 1
+            return False
+        return True
+
+    def registrar_chamada(self, disparou: bool) -> None:
+        self.stats["chamadas"] += 1
+        self._disparos.append(disparou)
+        if disparou:
+            self.stats["hedges"] += 1
+
+    def registrar_vencedor(self, hedge_venceu: bool, tokens_extra: int, custo_extra: float) -> None:
+        self.stats["vitorias_hedge" if hedge_venceu else "vitorias_original"] += 1
+        self.stats["tokens_extra"] += tokens_extra
+        self.stats["custo_extra_usd"] += custo_extra
+
+    def estatisticas(self) -> Dict[str, Any]:
+        chamadas = self.stats["chamadas"]
+        return {
+            "ativo": self.ativo,
+            "metodos": sorted(self.metodos),
+            "percentil": self.percentil,
+            **self.stats,
+            "custo_extra_usd": round(self.stats["custo_extra_usd"], 6),
+            "taxa_hedge": round(self.stats["hedges"] / chamadas, 4) if chamadas else 0.0,
+            "atrasos": {chave: self.atraso(chave) for chave in self._latencias}
+        }
+
+
+async def disputar(
+    original: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]],
+    atraso: float,
+    pode_disparar: Callable[[], bool],
+    descartar: Optional[Callable[[T], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """
+    Corre a chamada original e, passado `atraso` sem resposta, também o hedge.
+
+    Retorna {"resultado", "hedge_venceu", "disparou", "perdedor"}. "perdedor" é o
+    resultado da chamada perdedora se ela também terminou (já passado a
+    `descartar`), ou None se foi cancelada. Erro em uma das chamadas não
+    encerra a disputa: só se as duas falharem o primeiro erro é propagado.
+    """
+    tarefa_original = asyncio.ensure_future(original())
+    tarefas = {tarefa_original}
+    try:
+        concluidas, _ = await asyncio.wait(tarefas, timeout=atraso)
+        if concluidas or not pode_disparar():
+            return {"resultado": await tarefa_original, "hedge_venceu": False, "disparou": False, "perdedor": None}
+
+        tarefa_hedge = asyncio.ensure_future(hedge())
+        tarefas.add(tarefa_hedge)
+        erro: Optional[BaseException] = None
+        pendentes = set(tarefas)
+        while pendentes:
+            concluidas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+            vencedora = next((t for t in concluidas if not t.cancelled() and t.exception() is None), None)
+            if vencedora is None:
+                erro = erro or next(t.exception() for t in concluidas if not t.cancelled())
+                continue
+
+            perdedora = tarefa_hedge if vencedora is tarefa_original else tarefa_original
+            perdedor = None
+            if perdedora.done() and not perdedora.cancelled() and perdedora.exception() is None:
+                # Terminaram juntas: o resultado que sobrou ainda precisa ser liberado
+                perdedor = perdedora.result()
+                if descartar is not None:
+                    await descartar(perdedor)
+            return {
+                "resultado": vencedora.result(),
+                "hedge_venceu": vencedora is tarefa_hedge,
+                "disparou": True,
+                "perdedor": perdedor
+            }
+        raise erro
+    finally:
+        for tarefa in tarefas:
+            if not tarefa.done():
+                tarefa.cancel()
+        # Aguarda os cancelamentos para liberar vagas do gateway e conexões
+        await asyncio.gather(*tarefas, return_exceptions=True)
@@ -0,0 +1,309 @@
+# app/services/metering_service.py - MEDIÇÃO DE CONSUMO E ORÇAMENTO DE TOKENS POR ESCRITÓRIO
+"""
+Toda chamada paga ao provedor é contabilizada por escritório (firm_name),
+endpoint (método do AIService) e modelo.
+
+- Redis: contadores do dia/mês (consultados antes de cada chamada para aplicar
+  os orçamentos) e o detalhamento diário usado em /analytics/consumo
+- Postgres (tabela consumo_ia): os incrementos pendentes são gravados em lote
+  a cada CONSUMO_FLUSH_INTERVALO segundos (upsert: PostgreSQL ou SQLite; em
+  outro dialeto o flush fica desativado e o consumo só no Redis)
+
+Orçamentos (0 = sem limite): ORCAMENTO_TOKENS_DIARIO / ORCAMENTO_TOKENS_MENSAL,
+com valores por escritório em ORCAMENTOS_ESCRITORIO. A verificação soma a
+estimativa da chamada (prompt + max_tokens) ao consumo já registrado; chamadas
+simultâneas podem ultrapassar o limite em no máximo uma chamada cada.
+"""
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+from app.core.config import settings
+from app.services.cache_service import CacheService
+
+SEM_ESCRITORIO = "sem_escritorio"
+
+
+class OrcamentoExcedido(Exception):
+    """O escritório atingiu o orçamento diário ou mensal de tokens"""
+
+    def __init__(self, firm_name: str, periodo: str, limite: int, consumido: int):
+        self.firm_name = firm_name
+        self.periodo = periodo
+        self.limite = limite
+        self.consumido = consumido
+        super().__init__(
+            f"Orçamento {periodo} de tokens do escritório '{firm_name}' atingido "
+            f"({consumido}/{limite} tokens)"
+        )
+
+
+class MeteringService:
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+        self._tarefa_flush: Optional[asyncio.Task] = None
+        self.stats = {"registros": 0, "flushes": 0, "linhas_gravadas": 0, "erros_flush": 0, "bloqueadas": 0}
+
+    @staticmethod
+    def _escritorio(firm_name: Optional[str]) -> str:
+        # "|" separa os campos das chaves no Redis
+        return (firm_name or SEM_ESCRITORIO).replace("|", "/")
+
+    def orcamento(self, firm_name: Optional[str]) -> Dict[str, int]:
+        """Limites diário e mensal do escritório (0 = sem limite)"""
+        especifico = settings.orcamentos_escritorio.get(firm_name or "", {})
+        return {
+            "diario": especifico.get("diario", settings.orcamento_tokens_diario),
+            "mensal": especifico.get("mensal", settings.orcamento_tokens_mensal)
+        }
+
+    async def consumido(self, firm_name: Optional[str], hoje: Optional[date] = None) -> Dict[str, int]:
+        """Tokens já consumidos no dia e no mês"""
+        hoje = hoje or date.today()
+        escritorio = self._escritorio(firm_name)
+        try:
+            diario, mensal = await self.cache.redis_client.mget(
+                f"consumo:total:{escritorio}:{hoje.isoformat()}",
+                f"consumo:total:{escritorio}:{hoje.strftime('%Y-%m')}"
+            )
+        except Exception as e:
+            print(f"Erro ao consultar consumo: {e}")
+            return {"diario": 0, "mensal": 0}
+        return {"diario": int(diario or 0), "mensal": int(mensal or 0)}
+
+    async def verificar_orcamento(self, firm_name: Optional[str], tokens_estimados: int) -> None:
+        """Levanta OrcamentoExcedido se a chamada estourar o orçamento do escritório"""
+        limites = self.orcamento(firm_name)
+        if not limites["diario"] and not limites["mensal"]:
+            return
+
+        consumo = await self.consumido(firm_name)
+        for periodo, nome in (("diario", "diário"), ("mensal", "mensal")):
+            if limites[periodo] and consumo[periodo] + tokens_estimados > limites[periodo]:
+                self.stats["bloqueadas"] += 1
+                raise OrcamentoExcedido(self._escritorio(firm_name), nome, limites[periodo], consumo[periodo])
+
+    async def registrar(self, firm_name: Optional[str], endpoint: str, modelo: str, tokens: int, custo_usd: float) -> None:
+        """Incrementa os contadores do dia/mês, o detalhamento e os pendentes de flush"""
+        hoje = date.today()
+        dia = hoje.isoformat()
+        escritorio = self._escritorio(firm_name)
+        campo = f"{escritorio}|{endpoint}|{modelo}"
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                pipe.incrby(f"consumo:total:{escritorio}:{dia}", tokens)
+                pipe.expire(f"consumo:total:{escritorio}:{dia}", 2 * 86400)
+                pipe.incrby(f"consumo:total:{escritorio}:{hoje.strftime('%Y-%m')}", tokens)
+                pipe.expire(f"consumo:total:{escritorio}:{hoje.strftime('%Y-%m')}", 40 * 86400)
+
+                pipe.hincrby(f"consumo:detalhe:{dia}", f"{campo}|chamadas", 1)
+                pipe.hincrby(f"consumo:detalhe:{dia}", f"{campo}|tokens", tokens)
+                pipe.hincrbyfloat(f"consumo:detalhe:{dia}", f"{campo}|custo", custo_usd)
+                pipe.expire(f"consumo:detalhe:{dia}", 40 * 86400)
+
+                pipe.hincrby("consumo:pendente", f"{dia}|{campo}|chamadas", 1)
+                pipe.hincrby("consumo:pendente", f"{dia}|{campo}|tokens", tokens)
+                pipe.hincrbyfloat("consumo:pendente", f"{dia}|{campo}|custo", custo_usd)
+                await pipe.execute()
+            self.stats["registros"] += 1
+        except Exception as e:
+            print(f"Erro ao registrar consumo: {e}")
+
+    @staticmethod
+    def _agregar(campos: Dict[str, str], prefixo_dia: bool) -> Dict[tuple, Dict[str, float]]:
+        """Converte campos 'chave|métrica' do Redis em {chave: {chamadas, tokens, custo_usd}}"""
+        linhas: Dict[tuple, Dict[str, float]] = {}
+        for campo, valor in campos.items():
+            *chave, metrica = campo.split("|")
+            if len(chave) != (4 if prefixo_dia else 3):
+                continue
+            linha = linhas.setdefault(tuple(chave), {"chamadas": 0, "tokens": 0, "custo_usd": 0.0})
+            if metrica == "custo":
+                linha["custo_usd"] += float(valor)
+            else:
+                linha[metrica] += int(float(valor))
+        return linhas
+
+    async def consumo(self, firm_name: Optional[str] = None, periodo: str = "mes") -> Dict[str, Any]:
+        """Detalhamento do dia ou do mês corrente, a partir do Redis"""
+        hoje = date.today()
+        dias = [hoje] if periodo == "dia" else [
+            hoje.replace(day=d) for d in range(1, hoje.day + 1)
+        ]
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                for dia in dias:
+                    pipe.hgetall(f"consumo:detalhe:{dia.isoformat()}")
+                detalhes = await pipe.execute()
+        except Exception as e:
+            print(f"Erro ao consultar consumo: {e}")
+            detalhes = []
+
+        agregado: Dict[tuple, Dict[str, float]] = {}
+        for campos in detalhes:
+            for chave, linha in self._agregar(campos or {}, prefixo_dia=False).items():
+                total = agregado.setdefault(chave, {"chamadas": 0, "tokens": 0, "custo_usd": 0.0})
+                for metrica, valor in linha.items():
+                    total[metrica] += valor
+
+        escritorios: Dict[str, Dict[str, Any]] = {}
+        for (escritorio, endpoint, modelo), linha in sorted(agregado.items()):
+            if firm_name and escritorio != self._escritorio(firm_name):
+                continue
+            resumo = escritorios.setdefault(escritorio, {"chamadas": 0, "tokens": 0, "custo_usd": 0.0, "detalhes": []})
+            resumo["detalhes"].append({"endpoint": endpoint, "modelo": modelo, **linha, "custo_usd": round(linha["custo_usd"], 6)})
+            resumo["chamadas"] += linha["chamadas"]
+            resumo["tokens"] += linha["tokens"]
+            resumo["custo_usd"] = round(resumo["custo_usd"] + linha["custo_usd"], 6)
+
+        for escritorio, resumo in escritorios.items():
+            nome = None if escritorio == SEM_ESCRITORIO else escritorio
+            resumo["orcamento"] = self.orcamento(nome)
+            resumo["consumido"] = await self.consumido(nome, hoje)
+
+        return {"periodo": periodo, "inicio": dias[0].isoformat(), "fim": hoje.isoformat(), "escritorios": escritorios}
+
+    # ========== FLUSH PARA O POSTGRES ==========
+
+    def iniciar(self) -> None:
+        """Agenda o flush periódico (chamado no lifespan da aplicação)"""
+        from app.core.database import engine, suporta_upsert
+        if not suporta_upsert():
+            # Sem upsert o lote voltaria para o Redis a cada flush, para sempre
+            print(f"⚠️ Aviso: banco {engine.dialect.name} sem upsert - consumo da IA fica só no Redis (flush desativado)")
+            return
+        if self._tarefa_flush is None and settings.consumo_flush_intervalo > 0:
+            self._tarefa_flush = asyncio.create_task(self._loop_flush())
+
+    async def encerrar(self) -> None:
+        """Cancela o flush periódico e grava o que estiver pendente"""
+        if self._tarefa_flush is not None:
+            self._tarefa_flush.cancel()
+            await asyncio.gather(self._tarefa_flush, return_exceptions=True)
+            self._tarefa_flush = None
+        from app.core.database import suporta_upsert
+        if suporta_upsert():
+            await self.flush()
+
+    async def _loop_flush(self) -> None:
+        while True:
+            await asyncio.sleep(settings.consumo_flush_intervalo)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Move os incrementos pendentes do Redis para o Postgres; retorna as linhas gravadas"""
+        redis = self.cache.redis_client
+        lote = f"consumo:pendente:{uuid.uuid4().hex}"
+        try:
+            # RENAME é atômico: incrementos novos vão para um "consumo:pendente" vazio
+            if not await redis.exists("consumo:pendente"):
+                return 0
+            await redis.rename("consumo:pendente", lote)
+            campos = await redis.hgetall(lote)
+        except Exception as e:
+            print(f"Erro ao ler consumo pendente: {e}")
+            return 0
+
+        linhas = self._agregar(campos, prefixo_dia=True)
+        try:
+            await asyncio.to_thread(self._gravar, linhas)
+        except Exception as e:
+            print(f"Erro ao gravar consumo no banco: {e}")
+            self.stats["erros_flush"] += 1
+            await self._devolver(campos)
+            return 0
+        finally:
+            try:
+                await redis.delete(lote)
+            except Exception as e:
+                print(f"Erro ao remover lote de consumo: {e}")
+
+        self.stats["flushes"] += 1
+        self.stats["linhas_gravadas"] += len(linhas)
+        return len(linhas)
+
+    async def _devolver(self, campos: Dict[str, str]) -> None:
+        """Falha no banco: os incrementos voltam para o próximo flush"""
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                for campo, valor in campos.items():
+                    if campo.endswith("|custo"):
+                        pipe.hincrbyfloat("consumo:pendente", campo, float(valor))
+                    else:
+                        pipe.hincrby("consumo:pendente", campo, int(float(valor)))
+                await pipe.execute()
+        except Exception as e:
+            print(f"Erro ao devolver consumo pendente: {e}")
+
+    @staticmethod
+    def _gravar(linhas: Dict[tuple, Dict[str, float]]) -> None:
+        """Upsert somando os incrementos (executado em thread: SQLAlchemy síncrono)"""
+        if not linhas:
+            return
+        from app.core.database import SessionLocal, insert_upsert
+        from app.models.consumo_ia import ConsumoIA
+
+        valores = [
+            {
+                "dia": date.fromisoformat(dia),
+                "firm_name": escritorio,
+                "endpoint": endpoint,
+                "modelo": modelo,
+                "chamadas": int(linha["chamadas"]),
+                "tokens": int(linha["tokens"]),
+                "custo_usd": linha["custo_usd"]
+            }
+            for (dia, escritorio, endpoint, modelo), linha in linhas.items()
+        ]
+        comando = insert_upsert(ConsumoIA).values(valores)
+        comando = comando.on_conflict_do_update(
+            index_elements=["firm_name", "endpoint", "modelo", "dia"],
+            set_={
+                "chamadas": ConsumoIA.chamadas + comando.excluded.chamadas,
+                "tokens": ConsumoIA.tokens + comando.excluded.tokens,
+                "custo_usd": ConsumoIA.custo_usd + comando.excluded.custo_usd,
+                "updated_at": datetime.now()
+            }
+        )
+        db = SessionLocal()
+        try:
+            db.execute(comando)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def historico(dias: int, firm_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Consumo diário gravado no Postgres nos últimos `dias` dias"""
+        from sqlalchemy import func
+        from app.core.database import SessionLocal
+        from app.models.consumo_ia import ConsumoIA
+
+        db = SessionLocal()
+        try:
+            consulta = db.query(
+                ConsumoIA.dia,
+                ConsumoIA.firm_name,
+                func.sum(ConsumoIA.chamadas),
+                func.sum(ConsumoIA.tokens),
+                func.sum(ConsumoIA.custo_usd)
+            ).filter(ConsumoIA.dia >= date.today() - timedelta(days=dias))
+            if firm_name:
+                consulta = consulta.filter(ConsumoIA.firm_name == firm_name)
+            consulta = consulta.group_by(ConsumoIA.dia, ConsumoIA.firm_name).order_by(ConsumoIA.dia)
+            return [
+                {
+                    "dia": dia.isoformat(),
+                    "firm_name": escritorio,
+                    "chamadas": int(chamadas or 0),
+                    "tokens": int(tokens or 0),
+                    "custo_usd": round(float(custo or 0), 6)
+                }
+                for dia, escritorio, chamadas, tokens, custo in consulta.all()
+            ]
+        finally:
+            db.close()
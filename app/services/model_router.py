@@ -0,0 +1,215 @@
+# app/services/model_router.py - ROTEAMENTO DE MODELOS POR CUSTO E LATÊNCIA
+"""
+Escolhe o modelo (e o teto de max_tokens) de cada chamada à IA.
+
+As regras são avaliadas em ordem; a primeira que casar com o método, a área,
+o tamanho do prompt e o plano do escritório define a lista de modelos: o
+primeiro é o preferido e os seguintes são fallback em caso de erro ou timeout.
+"padrao" representa o OPENAI_MODEL configurado.
+
+Cada decisão e o seu resultado (latência, tokens, custo estimado) ficam
+registrados para calibrar as regras.
+"""
+import time
+import uuid
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque, Tuple
+from app.core.config import settings
+from app.services.prompt_compiler import contar_tokens
+
+# Regras padrão (sobrescritas por ROTEAMENTO_REGRAS no .env)
+REGRAS_PADRAO: List[Dict[str, Any]] = [
+    {
+        "nome": "consulta_curta",
+        "metodos": ["consulta"],
+        "max_tokens_prompt": 400,
+        "tiers": ["basico", "profissional"],
+        "modelos": ["gpt-4o-mini", "padrao"],
+        "max_tokens": 800
+    },
+    {"nome": "trechos_documento", "metodos": ["analise_trecho"], "modelos": ["gpt-4o-mini", "padrao"]},
+    {"nome": "resumo_sessao", "metodos": ["resumo_sessao"], "modelos": ["gpt-4o-mini", "padrao"]},
+    {"nome": "plano_premium", "tiers": ["premium"], "modelos": ["padrao", "gpt-4o"]},
+    {"nome": "redacao_juridica", "metodos": ["peticao", "peticao_caso", "peticao_secoes", "peticao_refino", "parecer"], "modelos": ["padrao", "gpt-4o"]},
+    {"nome": "padrao", "modelos": ["padrao", "gpt-4o-mini"]}
+]
+
+# USD por 1K tokens (entrada, saída) - sobrescritos por PRECOS_MODELOS
+# Tokens de entrada servidos pelo cache de prefixo custam FATOR_ENTRADA_CACHE da entrada
+FATOR_ENTRADA_CACHE = 0.5
+PRECOS_PADRAO: Dict[str, Dict[str, float]] = {
+    "gpt-4": {"entrada": 0.03, "saida": 0.06},
+    "gpt-4-turbo": {"entrada": 0.01, "saida": 0.03},
+    "gpt-4o": {"entrada": 0.0025, "saida": 0.01},
+    "gpt-4o-mini": {"entrada": 0.00015, "saida": 0.0006},
+    "gpt-3.5-turbo": {"entrada": 0.0005, "saida": 0.0015}
+}
+
+
+class ModelRouter:
+    """Política de roteamento + registro de decisões e resultados"""
+
+    def __init__(self, modelo_padrao: str):
+        self.modelo_padrao = modelo_padrao
+        self.regras = settings.roteamento_regras or REGRAS_PADRAO
+        self.precos = {**PRECOS_PADRAO, **settings.precos_modelos}
+        self.decisoes: Deque[Dict[str, Any]] = deque(maxlen=settings.roteamento_historico)
+        self._resultados: Dict[str, Dict[str, Any]] = {}
+        self._vazao: Dict[str, Deque[float]] = {}
+
+    def tier(self, firm_name: Optional[str]) -> str:
+        """Plano do escritório (TENANT_TIERS), ou o plano padrão"""
+        return settings.tenant_tiers.get(firm_name or "", settings.tenant_tier_padrao)
+
+    @staticmethod
+    def _casa(regra: Dict[str, Any], metodo: str, area: Optional[str], tier: str, tokens_prompt: int) -> bool:
+        if "metodos" in regra and metodo not in regra["metodos"]:
+            return False
+        if "areas" in regra and (area or "geral") not in regra["areas"]:
+            return False
+        if "tiers" in regra and tier not in regra["tiers"]:
+            return False
+        if "max_tokens_prompt" in regra and tokens_prompt > regra["max_tokens_prompt"]:
+            return False
+        return True
+
+    def decidir(
+        self,
+        metodo: str,
+        chamada: Dict[str, Any],
+        area: Optional[str],
+        firm_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """Retorna a chamada com 'modelos' (preferido + fallbacks), max_tokens ajustado e a 'rota'"""
+        tier = self.tier(firm_name)
+        tokens_prompt = self.tokens_prompt(chamada)
+        regra, modelos = self.regra(metodo, area, tier, tokens_prompt)
+
+        max_tokens = chamada["max_tokens"]
+        if regra.get("max_tokens"):
+            max_tokens = min(max_tokens, regra["max_tokens"])
+
+        rota = {
+            "id": uuid.uuid4().hex[:12],
+            "instante": time.time(),
+            "metodo": metodo,
+            "area": area,
+            "escritorio": firm_name,
+            "tier": tier,
+            "tokens_prompt": tokens_prompt,
+            "regra": regra["nome"],
+            "modelos": modelos,
+            "max_tokens": max_tokens
+        }
+        self.decisoes.append(rota)
+        return {**chamada, "max_tokens": max_tokens, "modelos": modelos, "rota": rota}
+
+    def tokens_prompt(self, chamada: Dict[str, Any]) -> int:
+        return sum(contar_tokens(m["content"], self.modelo_padrao) for m in chamada["messages"])
+
+    def regra(self, metodo: str, area: Optional[str], tier: str, tokens_prompt: int) -> Tuple[Dict[str, Any], List[str]]:
+        """Primeira regra que casa e os modelos dela, sem registrar decisão"""
+        regra = next(
+            (r for r in self.regras if self._casa(r, metodo, area, tier, tokens_prompt)),
+            {"nome": "padrao", "modelos": ["padrao"]}
+        )
+
+        modelos: List[str] = []
+        for modelo in regra["modelos"]:
+            modelo = self.modelo_padrao if modelo == "padrao" else modelo
+            if modelo not in modelos:
+                modelos.append(modelo)
+        return regra, modelos
+
+    def custo(self, modelo: str, tokens_prompt: int, tokens_usados: int, tokens_cache: int = 0) -> float:
+        """Custo estimado em USD (tokens de saída = total - prompt; cache de prefixo com desconto)"""
+        preco = self.precos.get(modelo)
+        if not preco or not tokens_usados:
+            return 0.0
+        saida = max(0, tokens_usados - tokens_prompt)
+        entrada = tokens_usados - saida
+        cache = min(tokens_cache, entrada)
+        preco_cache = preco.get("entrada_cache", preco["entrada"] * FATOR_ENTRADA_CACHE)
+        return ((entrada - cache) * preco["entrada"] + cache * preco_cache + saida * preco["saida"]) / 1000
+
+    def registrar(
+        self,
+        rota: Optional[Dict[str, Any]],
+        modelo: str,
+        status: str,
+        latencia: float,
+        tokens_usados: int = 0,
+        tokens_cache: int = 0
+    ) -> None:
+        """Registra o resultado de uma tentativa (sucesso, erro, timeout ou circuito_aberto) em um modelo"""
+        metodo = rota["metodo"] if rota else "sem_rota"
+        chave = f"{metodo}:{modelo}"
+        resultado = self._resultados.setdefault(chave, {
+            "metodo": metodo,
+            "modelo": modelo,
+            "chamadas": 0,
+            "erros": 0,
+            "timeouts": 0,
+            "circuito_aberto": 0,
+            "fallbacks": 0,
+            "tokens": 0,
+            "tokens_prompt": 0,
+            "tokens_cache": 0,
+            "custo_usd": 0.0,
+            "latencias": deque(maxlen=500)
+        })
+        resultado["chamadas"] += 1
+        if status == "erro":
+            resultado["erros"] += 1
+        elif status == "timeout":
+            resultado["timeouts"] += 1
+        elif status == "circuito_aberto":
+            resultado["circuito_aberto"] += 1
+        else:
+            tokens_prompt = rota["tokens_prompt"] if rota else 0
+            custo = self.custo(modelo, tokens_prompt, tokens_usados, tokens_cache)
+            resultado["tokens"] += tokens_usados
+            resultado["tokens_prompt"] += tokens_prompt
+            resultado["tokens_cache"] += tokens_cache
+            resultado["custo_usd"] += custo
+            resultado["latencias"].append(latencia)
+            saida = tokens_usados - tokens_prompt
+            if saida > 0 and latencia > 0:
+                self._vazao.setdefault(modelo, deque(maxlen=200)).append(saida / latencia)
+            if rota is not None:
+                rota.setdefault("resultado", {}).update({
+                    "modelo": modelo,
+                    "latencia": round(latencia, 3),
+                    "tokens_usados": tokens_usados,
+                    "tokens_cache": tokens_cache,
+                    "custo_usd": round(custo, 6)
+                })
+
+        if rota is not None and modelo != rota["modelos"][0]:
+            resultado["fallbacks"] += 1
+
+    def vazao(self, modelo: str) -> Optional[float]:
+        """Mediana recente de tokens de saída por segundo do modelo (inclui a espera pelo primeiro token)"""
+        amostras = self._vazao.get(modelo)
+        if not amostras:
+            return None
+        return sorted(amostras)[len(amostras) // 2]
+
+    def estatisticas(self, ultimas: int = 20) -> Dict[str, Any]:
+        """Resultados agregados por método/modelo e as últimas decisões"""
+        agregados = []
+        for resultado in self._resultados.values():
+            latencias = sorted(resultado["latencias"])
+            agregados.append({
+                **{k: v for k, v in resultado.items() if k != "latencias"},
+                "custo_usd": round(resultado["custo_usd"], 6),
+                "taxa_cache_prompt": round(resultado["tokens_cache"] / resultado["tokens_prompt"], 4) if resultado["tokens_prompt"] else 0.0,
+                "latencia_p50": round(latencias[len(latencias) // 2], 3) if latencias else None,
+                "latencia_p95": round(latencias[int(len(latencias) * 0.95)], 3) if latencias else None
+            })
+        return {
+            "regras": [r["nome"] for r in self.regras],
+            "vazao_tokens_s": {modelo: round(self.vazao(modelo), 1) for modelo in self._vazao},
+            "resultados": agregados,
+            "ultimas_decisoes": list(self.decisoes)[-ultimas:]
+        }
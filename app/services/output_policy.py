@@ -0,0 +1,208 @@
+# app/services/output_policy.py - TAMANHO DA SAÍDA (MAX_TOKENS DINÂMICO) E PARADA ANTECIPADA
+"""
+Política de saída de cada método, aplicada depois do roteamento:
+
+- max_tokens pela distribuição observada: com SAIDA_MIN_AMOSTRAS respostas
+  do método, o teto passa a ser o percentil SAIDA_PERCENTIL x SAIDA_FOLGA
+  (arredondado em SAIDA_QUANTUM para não mudar a chave de cache a cada
+  chamada), nunca acima do max_tokens fixo do método. Se muitas respostas
+  batem no teto (SAIDA_MAX_TRUNCADAS), volta ao valor fixo.
+- Header X-Tamanho-Resposta: "completo" (padrão) ou "resumido" (instrução
+  de concisão + teto de SAIDA_FATOR_RESUMIDO da resposta típica).
+- Parada antecipada: padrões estruturais em sequência (ex.: "DOS PEDIDOS"
+  e depois a linha da OAB). Emitida a linha do último padrão, o stream é
+  fechado e o que o modelo escreveria depois (observações, ressalvas) não é
+  gerado. Uma amostra das chamadas (SAIDA_PARADA_AMOSTRA) só observa, sem
+  cortar, para medir a cauda evitada em tokens e segundos: a latência
+  economizada por endpoint sai dessa medição.
+"""
+import math
+import random
+import re
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque
+from app.core.config import settings
+from app.core.request_context import tamanho_resposta, endpoint_http
+
+# Padrões em ordem por método (sobrescritos por SAIDA_PARADAS no .env)
+PARADAS_PADRAO: Dict[str, List[str]] = {
+    "peticao": [r"DOS\s+PEDIDOS", r"OAB\s*/"],
+    # Só qualificação e fatos: para no título da primeira seção fixa (já em cache)
+    "peticao_caso": [r"DOS\s+FATOS", r"\n[ \t#*]*[IVX]+\s*[-–.]\s*(?:DO\s+DIREITO|DOS\s+FUNDAMENTOS|DA\s+JURISPRUD|DOS\s+PEDIDOS)"]
+}
+
+INSTRUCAO_RESUMIDO = (
+    "Responda de forma resumida: apenas os pontos essenciais, sem repetir o enunciado, "
+    "em no máximo {palavras} palavras."
+)
+
+# Fração do max_tokens a partir da qual a resposta é considerada cortada pelo teto
+_TRUNCADA = 0.98
+# Caracteres relidos a cada pedaço (um padrão pode começar no pedaço anterior)
+_SOBREPOSICAO = 64
+
+
+class DetectorParada:
+    """Acompanha o texto gerado e indica onde a estrutura esperada terminou"""
+
+    def __init__(self, padroes: List[str], observar: bool = False):
+        self.padroes = [re.compile(p, re.IGNORECASE) for p in padroes]
+        self.observar = observar
+        self.texto = ""
+        self.etapa = 0
+        self._busca = 0
+        self.corte: Optional[int] = None
+        self.instante_corte: Optional[float] = None
+
+    def alimentar(self, pedaco: str) -> Optional[int]:
+        """Acrescenta um pedaço; retorna a posição de corte no texto acumulado quando a estrutura fecha"""
+        self.texto += pedaco
+        if self.corte is not None:
+            return None
+        while self.etapa < len(self.padroes):
+            achado = self.padroes[self.etapa].search(self.texto, self._busca)
+            if achado is None:
+                self._busca = max(self._busca, len(self.texto) - _SOBREPOSICAO)
+                return None
+            self._busca = achado.end()
+            self.etapa += 1
+
+        # Último padrão encontrado: corta no fim da linha dele
+        fim_linha = self.texto.find("\n", self._busca)
+        if fim_linha == -1:
+            return None
+        self.corte = fim_linha
+        self.instante_corte = time.monotonic()
+        return fim_linha
+
+
+def _percentil(valores: List[int], fracao: float) -> int:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * fracao))]
+
+
+class PoliticaSaida:
+
+    def __init__(self):
+        self.paradas = settings.saida_paradas or PARADAS_PADRAO
+        self._saidas: Dict[str, Deque[int]] = {}
+        self._truncadas: Dict[str, Deque[bool]] = {}
+        self._caudas: Dict[str, Deque[Dict[str, float]]] = {}
+        self.cortes: Dict[str, int] = {}
+        self.por_endpoint: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    @staticmethod
+    def _quantizar(tokens: float) -> int:
+        return int(math.ceil(tokens / settings.saida_quantum) * settings.saida_quantum)
+
+    def _endpoint(self, metodo: str) -> Dict[str, int]:
+        endpoint = endpoint_http.get() or "interno"
+        return self.por_endpoint.setdefault(endpoint, {}).setdefault(
+            metodo, {"chamadas": 0, "cortes": 0, "tokens_reserva_economizados": 0}
+        )
+
+    def limite(self, metodo: str, base: int, tamanho: str = "completo") -> int:
+        """max_tokens do método para o tamanho pedido (base = teto fixo do método/regra)"""
+        saidas = self._saidas.get(metodo, ())
+        truncadas = self._truncadas.get(metodo, ())
+        historico = len(saidas) >= settings.saida_min_amostras
+        if truncadas and sum(truncadas) / len(truncadas) > settings.saida_max_truncadas:
+            # O teto dinâmico está cortando respostas: usa o fixo até a janela renovar
+            historico = False
+
+        if tamanho == "resumido":
+            tipica = _percentil(list(saidas), 0.5) if historico else base
+            return min(base, max(settings.saida_min_tokens, self._quantizar(tipica * settings.saida_fator_resumido)))
+        if not historico:
+            return base
+        alvo = _percentil(list(saidas), settings.saida_percentil) * settings.saida_folga
+        return min(base, max(settings.saida_min_tokens, self._quantizar(alvo)))
+
+    def aplicar(self, metodo: str, chamada: Dict[str, Any]) -> Dict[str, Any]:
+        """Ajusta max_tokens da chamada roteada (e a instrução de concisão no modo resumido)"""
+        tamanho = tamanho_resposta.get()
+        base = chamada["max_tokens"]
+        limite = self.limite(metodo, base, tamanho)
+        contadores = self._endpoint(metodo)
+        contadores["chamadas"] += 1
+        contadores["tokens_reserva_economizados"] += base - limite
+        chamada["rota"].update({"max_tokens": limite, "max_tokens_base": base, "tamanho": tamanho})
+
+        messages = chamada["messages"]
+        if tamanho == "resumido":
+            # ~0,75 palavra por token; no fim das mensagens para não mexer no prefixo cacheável
+            instrucao = INSTRUCAO_RESUMIDO.format(palavras=int(limite * 0.75))
+            messages = [*messages, {"role": "system", "content": instrucao}]
+        return {**chamada, "messages": messages, "max_tokens": limite}
+
+    def registrar(self, rota: Optional[Dict[str, Any]], tokens_usados: int) -> bool:
+        """Tamanho de uma resposta completa do método (entra na distribuição); True se ela parou no teto de max_tokens"""
+        if not rota or not tokens_usados:
+            return False
+        metodo = rota["metodo"]
+        saida = max(0, tokens_usados - rota.get("tokens_prompt", 0))
+        truncada = bool(rota.get("max_tokens")) and saida >= rota["max_tokens"] * _TRUNCADA and not rota.get("parada")
+        if rota.get("tamanho", "completo") != "completo":
+            return truncada
+        self._truncadas.setdefault(metodo, deque(maxlen=settings.saida_historico)).append(truncada)
+        if not truncada:
+            # Saída cortada pelo teto não revela o tamanho real
+            self._saidas.setdefault(metodo, deque(maxlen=settings.saida_historico)).append(saida)
+        return truncada
+
+    def detector(self, metodo: str) -> Optional[DetectorParada]:
+        """Detector de parada do método (None se não há padrões), às vezes só em observação"""
+        padroes = self.paradas.get(metodo)
+        if not padroes:
+            return None
+        return DetectorParada(padroes, observar=random.random() < settings.saida_parada_amostra)
+
+    def registrar_corte(self, metodo: str) -> None:
+        self.cortes[metodo] = self.cortes.get(metodo, 0) + 1
+        self._endpoint(metodo)["cortes"] += 1
+
+    def registrar_cauda(self, metodo: str, tokens: int, segundos: float) -> None:
+        """Chamada observada: o que o modelo gerou depois do ponto de corte"""
+        self._caudas.setdefault(metodo, deque(maxlen=200)).append({"tokens": tokens, "segundos": segundos})
+
+    def _cauda_media(self, metodo: str) -> Optional[Dict[str, float]]:
+        caudas = self._caudas.get(metodo)
+        if not caudas:
+            return None
+        return {
+            "tokens": sum(c["tokens"] for c in caudas) / len(caudas),
+            "segundos": sum(c["segundos"] for c in caudas) / len(caudas)
+        }
+
+    def estatisticas(self) -> Dict[str, Any]:
+        metodos = {}
+        for metodo in set(self._saidas) | set(self._truncadas) | set(self.cortes):
+            saidas = list(self._saidas.get(metodo, ()))
+            truncadas = self._truncadas.get(metodo, ())
+            cauda = self._cauda_media(metodo)
+            metodos[metodo] = {
+                "amostras": len(saidas),
+                "saida_p50": _percentil(saidas, 0.5) if saidas else None,
+                "saida_p95": _percentil(saidas, 0.95) if saidas else None,
+                "saida_p99": _percentil(saidas, 0.99) if saidas else None,
+                "taxa_truncadas": round(sum(truncadas) / len(truncadas), 4) if truncadas else 0.0,
+                "cortes": self.cortes.get(metodo, 0),
+                "caudas_observadas": len(self._caudas.get(metodo, ())),
+                "cauda_media_tokens": round(cauda["tokens"], 1) if cauda else None,
+                "cauda_media_segundos": round(cauda["segundos"], 3) if cauda else None
+            }
+
+        endpoints = {}
+        for endpoint, por_metodo in self.por_endpoint.items():
+            economizado = 0.0
+            for metodo, contadores in por_metodo.items():
+                cauda = self._cauda_media(metodo)
+                if cauda:
+                    economizado += contadores["cortes"] * cauda["segundos"]
+            endpoints[endpoint] = {
+                "metodos": por_metodo,
+                # Cortes x cauda média medida nas chamadas observadas
+                "latencia_economizada_s": round(economizado, 3)
+            }
+        return {"metodos": metodos, "endpoints": endpoints, "paradas": self.paradas}
@@ -85,7 +85,7 @@ class PDFService:
             nome_arquivo = f"peticao_{timestamp}.pdf"
         
         # Caminho completo do arquivo
-        pdf_path = os.path.join(settings.PDF_OUTPUT_DIR, nome_arquivo)
+        pdf_path = os.path.join(settings.pdf_output_dir, nome_arquivo)
         
         # Criar documento PDF
         doc = SimpleDocTemplate(
@@ -119,7 +119,7 @@ class PDFService:
         elementos = []
         
         # Logo do escritório (se existir)
-        logo_path = os.path.join(settings.STATIC_DIR, "logo_escritorio.png")
+        logo_path = os.path.join(settings.static_dir, "logo_escritorio.png")
         if os.path.exists(logo_path):
             logo = Image(logo_path, width=3*cm, height=2*cm)
             logo.hAlign = 'CENTER'
@@ -222,7 +222,7 @@ class PDFService:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         nome_arquivo = f"consulta_{timestamp}.pdf"
-        pdf_path = os.path.join(settings.PDF_OUTPUT_DIR, nome_arquivo)
+        pdf_path = os.path.join(settings.pdf_output_dir, nome_arquivo)
         
         doc = SimpleDocTemplate(pdf_path, pagesize=A4)
         story = []
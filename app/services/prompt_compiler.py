@@ -0,0 +1,176 @@
+# app/services/prompt_compiler.py - TEMPLATES DE PROMPT PRÉ-COMPILADOS
+"""
+Registro de templates de prompt compilados uma única vez na inicialização.
+
+Os prompts continuam escritos no código como blocos indentados (legíveis),
+mas a indentação e os espaços redundantes são removidos na compilação,
+de modo que não sejam tokenizados nem cobrados a cada chamada.
+
+Cada template também separa as seções estáticas (sem slots) das que levam
+dados da chamada: o estático vai no início da mensagem, byte a byte igual
+entre chamadas, para acertar o cache de prefixo do provedor.
+"""
+import math
+import re
+from string import Formatter
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:
+    print("⚠️ Aviso: tiktoken não instalado - contagem de tokens será estimada")
+    tiktoken = None
+
+_ENCODINGS: Dict[str, Any] = {}
+_PADRAO_PALAVRAS = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def contar_tokens(texto: str, modelo: Optional[str] = None) -> int:
+    """Conta tokens com o tokenizador local (tiktoken) ou uma estimativa"""
+    modelo = modelo or settings.openai_model
+
+    if tiktoken is not None:
+        if modelo not in _ENCODINGS:
+            try:
+                _ENCODINGS[modelo] = tiktoken.encoding_for_model(modelo)
+            except Exception:
+                try:
+                    _ENCODINGS[modelo] = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _ENCODINGS[modelo] = None
+        encoding = _ENCODINGS[modelo]
+        if encoding is not None:
+            return len(encoding.encode(texto))
+
+    # Estimativa: palavras/pontuação, com piso de ~4 caracteres por token
+    return max(len(_PADRAO_PALAVRAS.findall(texto)), math.ceil(len(texto) / 4))
+
+
+def minificar(texto: str) -> str:
+    """Remove indentação, espaços redundantes e linhas em branco repetidas"""
+    linhas: List[str] = []
+    for linha in texto.strip().splitlines():
+        linha = " ".join(linha.split())
+        if not linha and (not linhas or not linhas[-1]):
+            continue
+        linhas.append(linha)
+    return "\n".join(linhas)
+
+
+class PromptTemplate:
+    """Template compilado: texto minificado + partes literais/slots para preenchimento rápido"""
+
+    def __init__(self, nome: str, secoes: Dict[str, str], versao: str = "1"):
+        self.nome = nome
+        self.versao = versao
+        self.fonte = secoes
+        self.secoes = {secao: minificar(texto) for secao, texto in secoes.items()}
+        self.texto = "\n\n".join(t for t in self.secoes.values() if t)
+        self._partes = self._compilar(self.texto)
+        self.campos = {campo for _, campo, _ in self._partes if campo is not None}
+        self._tokens: Optional[Dict[str, int]] = None
+
+        # Seções sem slots formam o prefixo estático (idêntico em toda chamada, aproveita o
+        # cache de prompt do provedor); as seções com dados da chamada vão para o final
+        estaticas = [t for t in self.secoes.values() if t and not self._tem_slots(t)]
+        dinamicas = [t for t in self.secoes.values() if t and self._tem_slots(t)]
+        self.estatico = "\n\n".join(estaticas)
+        self._partes_dinamicas = self._compilar("\n\n".join(dinamicas))
+
+    @staticmethod
+    def _compilar(texto: str) -> List[Tuple[str, Optional[str], str]]:
+        """Quebra o texto em (literal, campo, formato) uma única vez"""
+        partes = []
+        for literal, campo, formato, _ in Formatter().parse(texto):
+            partes.append((literal, campo if campo else None, formato or ""))
+        return partes
+
+    @staticmethod
+    def _tem_slots(texto: str) -> bool:
+        return any(campo for _, campo, _, _ in Formatter().parse(texto))
+
+    @staticmethod
+    def _preencher_partes(partes: List[Tuple[str, Optional[str], str]], valores: Dict[str, Any]) -> str:
+        saida: List[str] = []
+        for literal, campo, formato in partes:
+            saida.append(literal)
+            if campo is not None:
+                valor = valores[campo]
+                saida.append(format(valor, formato) if formato else str(valor))
+        return "".join(saida)
+
+    def preencher(self, **valores: Any) -> str:
+        """Preenche os slots concatenando as partes pré-compiladas"""
+        return self._preencher_partes(self._partes, valores)
+
+    def preencher_dinamico(self, **valores: Any) -> str:
+        """Preenche só as seções com slots (o sufixo que muda a cada chamada)"""
+        return self._preencher_partes(self._partes_dinamicas, valores)
+
+    def preencher_partes(self, **valores: Any) -> Dict[str, str]:
+        """Prefixo estático + sufixo preenchido, para montar mensagens com o estático primeiro"""
+        return {"estatico": self.estatico, "dinamico": self.preencher_dinamico(**valores)}
+
+    def preencher_fonte(self, **valores: Any) -> str:
+        """Preenche o texto original (indentado), como os f-strings faziam - usado em benchmarks"""
+        return "\n\n".join(texto.format(**valores) for texto in self.fonte.values())
+
+    def tokens_por_secao(self) -> Dict[str, int]:
+        """Tokens estáticos de cada seção (sem o conteúdo dos slots)"""
+        if self._tokens is None:
+            self._tokens = {
+                secao: contar_tokens(Formatter().vformat(texto, (), _SlotsVazios()))
+                for secao, texto in self.secoes.items()
+            }
+        return self._tokens
+
+
+class _SlotsVazios(dict):
+    """Mapeamento que resolve qualquer slot para vazio (contagem de tokens estáticos)"""
+
+    def __missing__(self, chave):
+        return _ValorVazio()
+
+
+class _ValorVazio:
+    def __format__(self, formato: str) -> str:
+        return ""
+
+
+class PromptRegistry:
+    """Registro global de templates compilados"""
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+
+    def registrar(self, nome: str, secoes: Dict[str, str], versao: str = "1") -> PromptTemplate:
+        """Compila e registra um template; retorna o template compilado"""
+        template = PromptTemplate(nome, secoes, versao)
+        self._templates[nome] = template
+        return template
+
+    def obter(self, nome: str) -> PromptTemplate:
+        return self._templates[nome]
+
+    def listar(self) -> List[str]:
+        return sorted(self._templates)
+
+    def relatorio_tokens(self) -> Dict[str, Any]:
+        """Tokens estáticos por template e por seção"""
+        relatorio = {}
+        for nome in self.listar():
+            template = self._templates[nome]
+            secoes = template.tokens_por_secao()
+            relatorio[nome] = {
+                "versao": template.versao,
+                "secoes": secoes,
+                "total": sum(secoes.values()),
+                "prefixo_estatico": contar_tokens(template.estatico),
+                "campos": sorted(template.campos)
+            }
+        return relatorio
+
+
+# Instância global
+prompt_registry = PromptRegistry()
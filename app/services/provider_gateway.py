@@ -0,0 +1,292 @@
+# app/services/provider_gateway.py - GATEWAY DE ACESSO AO PROVEDOR DE IA
+"""
+Controla como as completions chegam ao provedor:
+
+- Limite de concorrência adaptativo (AIMD): cresce +1 a cada janela de
+  sucessos e cai pela metade em 429/sobrecarga ou latência acima do limite
+- Quem espera vaga é atendido pela fila justa (classe de prioridade + DRR
+  por escritório), não por ordem de chegada
+- Retentativas com backoff exponencial e jitter, respeitando Retry-After
+- Limites por modelo de requisições (RPM) e tokens (TPM) por minuto
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Callable, Awaitable, Optional, Deque, List, AsyncIterator, TypeVar
+import httpx
+import openai
+from app.core.config import settings
+from app.services.fair_queue import FilaJusta
+
+_ERROS_CONEXAO = (openai.APIConnectionError, httpx.TransportError, asyncio.TimeoutError)
+
+T = TypeVar("T")
+
+# 408 timeout, 409 conflito, 429 rate limit, 5xx/529 sobrecarga do provedor
+_STATUS_RETENTAVEIS = {408, 409, 429}
+_STATUS_SOBRECARGA = {429, 503, 529}
+
+
+class ProvedorSobrecarregado(Exception):
+    """Retentativas esgotadas por rate limit/sobrecarga do provedor"""
+
+
+def _status_erro(erro: Exception) -> Optional[int]:
+    """Status HTTP de um erro do SDK (ou None para erros sem resposta)"""
+    status = getattr(erro, "status_code", None)
+    if status is None and getattr(erro, "response", None) is not None:
+        status = getattr(erro.response, "status_code", None)
+    return status
+
+
+def eh_retentavel(erro: Exception) -> bool:
+    """Erros transitórios: conexão, timeout, 408/409/429 e 5xx"""
+    if isinstance(erro, _ERROS_CONEXAO):
+        return True
+    status = _status_erro(erro)
+    return status is not None and (status in _STATUS_RETENTAVEIS or status >= 500)
+
+
+def retry_after(erro: Exception) -> Optional[float]:
+    """Segundos pedidos pelo provedor via Retry-After / retry-after-ms"""
+    response = getattr(erro, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        # Retry-After no formato de data HTTP: usar o backoff padrão
+        return None
+    return None
+
+
+class LimitadorAdaptativo:
+    """Semáforo com limite ajustado por AIMD (aumento aditivo, redução multiplicativa)"""
+
+    def __init__(self, inicial: int, minimo: int, maximo: int, latencia_limite: float):
+        self.limite = float(inicial)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.latencia_limite = latencia_limite
+        self.em_uso = 0
+        self.latencia_media: Optional[float] = None
+        self.fila = FilaJusta()
+        self._ultima_reducao = 0.0
+        self.stats = {"aumentos": 0, "reducoes": 0}
+
+    @property
+    def aguardando(self) -> int:
+        return len(self.fila)
+
+    async def adquirir(self, escritorio: Optional[str] = None, classe: str = "padrao", custo: int = 1, peso: float = 1.0) -> None:
+        if self.em_uso < int(self.limite) and not len(self.fila):
+            self.em_uso += 1
+            self.fila.registrar_direto(escritorio)
+            return
+
+        pedido = self.fila.enfileirar(escritorio, classe, custo, peso)
+        try:
+            await pedido.futuro
+        except asyncio.CancelledError:
+            if pedido.futuro.done() and not pedido.futuro.cancelled():
+                # A vaga foi concedida junto com o cancelamento: devolve
+                await self.liberar()
+            else:
+                self.fila.remover(pedido)
+            raise
+
+    async def liberar(self) -> None:
+        self.em_uso -= 1
+        self._despachar()
+
+    def _despachar(self) -> None:
+        """Entrega as vagas livres aos próximos da fila justa"""
+        while self.em_uso < int(self.limite):
+            pedido = self.fila.proximo()
+            if pedido is None:
+                return
+            if pedido.futuro.done():
+                continue  # cancelado enquanto esperava
+            self.em_uso += 1
+            pedido.futuro.set_result(None)
+
+    async def registrar_sucesso(self, latencia: float) -> None:
+        """Sucesso rápido aumenta o limite em ~1 a cada `limite` respostas"""
+        self.latencia_media = latencia if self.latencia_media is None else 0.8 * self.latencia_media + 0.2 * latencia
+        if latencia > self.latencia_limite:
+            self.reduzir()
+            return
+        if self.limite < self.maximo:
+            anterior = int(self.limite)
+            self.limite = min(self.maximo, self.limite + 1 / self.limite)
+            if int(self.limite) > anterior:
+                self.stats["aumentos"] += 1
+                self._despachar()
+
+    def reduzir(self) -> None:
+        """Corta o limite pela metade, no máximo uma vez por segundo (rajadas de 429 contam uma vez)"""
+        agora = time.monotonic()
+        if agora - self._ultima_reducao < 1.0:
+            return
+        self._ultima_reducao = agora
+        self.limite = max(float(self.minimo), self.limite / 2)
+        self.stats["reducoes"] += 1
+
+
+class JanelaPorMinuto:
+    """Limites de requisições e tokens por minuto (janela deslizante de 60s) para um modelo"""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._registros: Deque[List[float]] = deque()  # [instante, tokens]
+        self._lock = asyncio.Lock()
+
+    def _expirar(self, agora: float) -> None:
+        while self._registros and agora - self._registros[0][0] >= 60:
+            self._registros.popleft()
+
+    def _tokens(self) -> int:
+        return int(sum(tokens for _, tokens in self._registros))
+
+    async def aguardar(self, tokens: int) -> List[float]:
+        """Espera haver folga de RPM/TPM e reserva a requisição; retorna o registro para ajuste"""
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self._expirar(agora)
+                excede_rpm = self.rpm and len(self._registros) >= self.rpm
+                # Uma requisição maior que o TPM inteiro passa sozinha na janela
+                excede_tpm = self.tpm and self._registros and self._tokens() + tokens > self.tpm
+                if not excede_rpm and not excede_tpm:
+                    registro = [agora, float(tokens)]
+                    self._registros.append(registro)
+                    return registro
+                await asyncio.sleep(max(0.05, 60 - (agora - self._registros[0][0])))
+
+    def uso(self) -> Dict[str, int]:
+        self._expirar(time.monotonic())
+        return {"rpm_limite": self.rpm, "rpm_uso": len(self._registros), "tpm_limite": self.tpm, "tpm_uso": self._tokens()}
+
+
+class Reserva:
+    """Vaga de concorrência obtida no gateway para uma completion (com retentativas)"""
+
+    def __init__(self, gateway: "ProviderGateway", modelo: str, tokens_estimados: int, espera_fila: float = 0.0):
+        self.gateway = gateway
+        self.modelo = modelo
+        self.tokens_estimados = tokens_estimados
+        # Tempo esperando vaga de concorrência + folga de RPM/TPM (telemetria)
+        self.espera_fila = espera_fila
+        self._registro: Optional[List[float]] = None
+
+    async def executar(self, chamar: Callable[[], Awaitable[T]]) -> T:
+        """Chama o provedor, retentando erros transitórios com backoff exponencial e jitter"""
+        gateway = self.gateway
+        janela = gateway.janela(self.modelo)
+
+        for tentativa in range(settings.gateway_max_tentativas + 1):
+            inicio = time.monotonic()
+            self._registro = await janela.aguardar(self.tokens_estimados)
+            self.espera_fila += time.monotonic() - inicio
+            inicio = time.monotonic()
+            try:
+                resultado = await chamar()
+            except Exception as e:
+                if not eh_retentavel(e):
+                    raise
+                status = _status_erro(e)
+                if status in _STATUS_SOBRECARGA:
+                    gateway.stats["rate_limit"] += 1
+                    gateway.limitador.reduzir()
+                if tentativa == settings.gateway_max_tentativas:
+                    gateway.stats["esgotadas"] += 1
+                    if status in _STATUS_SOBRECARGA:
+                        raise ProvedorSobrecarregado(f"Provedor sobrecarregado após {tentativa + 1} tentativas: {e}") from e
+                    raise
+                gateway.stats["retentativas"] += 1
+                await asyncio.sleep(gateway.espera(tentativa, e))
+                continue
+
+            await gateway.limitador.registrar_sucesso(time.monotonic() - inicio)
+            return resultado
+
+        raise RuntimeError("Laço de retentativas encerrado sem resultado")
+
+    def registrar_tokens(self, tokens: int) -> None:
+        """Troca a estimativa de tokens da janela TPM pelo consumo real"""
+        if self._registro is not None and tokens:
+            self._registro[1] = float(tokens)
+
+
+class ProviderGateway:
+    """Ponto único de saída das completions para o provedor"""
+
+    def __init__(self, chaves: int = 1):
+        # Com várias chaves de API, RPM/TPM e o teto de concorrência escalam com o pool
+        self.chaves = max(1, chaves)
+        self.limitador = LimitadorAdaptativo(
+            inicial=settings.gateway_concorrencia_inicial,
+            minimo=settings.gateway_concorrencia_min,
+            maximo=settings.gateway_concorrencia_max * self.chaves,
+            latencia_limite=settings.gateway_latencia_limite
+        )
+        self._janelas: Dict[str, JanelaPorMinuto] = {}
+        self.stats = {"chamadas": 0, "retentativas": 0, "rate_limit": 0, "esgotadas": 0}
+
+    def janela(self, modelo: str) -> JanelaPorMinuto:
+        if modelo not in self._janelas:
+            limites = settings.gateway_limites_modelo.get(modelo, {})
+            self._janelas[modelo] = JanelaPorMinuto(
+                rpm=limites.get("rpm", 0) * self.chaves,
+                tpm=limites.get("tpm", 0) * self.chaves
+            )
+        return self._janelas[modelo]
+
+    @staticmethod
+    def espera(tentativa: int, erro: Exception) -> float:
+        """Retry-After do provedor ou backoff exponencial com jitter completo"""
+        pedido = retry_after(erro)
+        if pedido is not None:
+            return min(pedido, settings.gateway_backoff_max)
+        teto = min(settings.gateway_backoff_max, settings.gateway_backoff_base * (2 ** tentativa))
+        return random.uniform(0, teto)
+
+    @asynccontextmanager
+    async def reservar(
+        self,
+        modelo: str,
+        tokens_estimados: int,
+        escritorio: Optional[str] = None,
+        classe: str = "padrao",
+        peso: float = 1.0
+    ) -> AsyncIterator[Reserva]:
+        """Ocupa uma vaga de concorrência enquanto a completion (ou o stream) durar"""
+        inicio = time.monotonic()
+        await self.limitador.adquirir(escritorio, classe, tokens_estimados, peso)
+        self.stats["chamadas"] += 1
+        try:
+            yield Reserva(self, modelo, tokens_estimados, time.monotonic() - inicio)
+        finally:
+            await self.limitador.liberar()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "concorrencia": {
+                "limite": int(self.limitador.limite),
+                "em_uso": self.limitador.em_uso,
+                "aguardando": self.limitador.aguardando,
+                "latencia_media": round(self.limitador.latencia_media or 0.0, 3),
+                **self.limitador.stats
+            },
+            "chaves_api": self.chaves,
+            "modelos": {modelo: janela.uso() for modelo, janela in self._janelas.items()},
+            **self.stats
+        }
@@ -0,0 +1,28 @@
+# app/services/providers/__init__.py - PROVEDORES DE LLM SELECIONÁVEIS VIA AI_PROVIDER
+from .base import LLMProvider
+from .openai_provider import OpenAIProvider
+from .mock_provider import MockProvider
+from .key_pool import PoolDeChaves
+
+PROVEDORES = {
+    OpenAIProvider.nome: OpenAIProvider,
+    MockProvider.nome: MockProvider
+}
+
+
+def criar_provedor(nome: str) -> LLMProvider:
+    """Instancia o provedor configurado (AI_PROVIDER=openai|mock)"""
+    try:
+        return PROVEDORES[nome.lower()]()
+    except KeyError:
+        raise ValueError(f"Provedor de IA desconhecido: {nome}. Opções: {', '.join(PROVEDORES)}")
+
+
+__all__ = [
+    "LLMProvider",
+    "OpenAIProvider",
+    "MockProvider",
+    "PoolDeChaves",
+    "PROVEDORES",
+    "criar_provedor"
+]
@@ -0,0 +1,64 @@
+# app/services/providers/base.py - INTERFACE DOS PROVEDORES DE LLM
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, AsyncIterator
+
+
+class LLMProvider(ABC):
+    """
+    Contrato mínimo que o AIService espera de um provedor de LLM.
+
+    - completar: completion inteira -> {"conteudo", "tokens_usados"}
+    - abrir_stream: estabelece a chamada (ponto em que erros de rate limit
+      aparecem e podem ser retentados) e devolve um iterador de eventos
+      {"tipo": "token", "conteudo"} seguidos de {"tipo": "uso", "tokens_usados"}
+
+    Opcionalmente, "tokens_prompt" (tokens de entrada) e "tokens_cache"
+    (tokens do prompt servidos pelo cache de prefixo do provedor) acompanham
+    "tokens_usados".
+    """
+
+    nome = "base"
+
+    @property
+    def configurado(self) -> bool:
+        """Indica se o provedor tem o necessário (credenciais etc.) para atender chamadas"""
+        return True
+
+    @property
+    def iniciado(self) -> bool:
+        return True
+
+    @property
+    def total_chaves(self) -> int:
+        """Chaves de API em rotação (os limites RPM/TPM do gateway são por chave)"""
+        return 1
+
+    def estatisticas_chaves(self) -> Dict[str, Any]:
+        """Utilização por chave de API, quando o provedor usa um pool de chaves"""
+        return {}
+
+    async def iniciar(self) -> None:
+        """Cria recursos compartilhados (pools, clientes)"""
+
+    async def encerrar(self) -> None:
+        """Libera os recursos criados em iniciar()"""
+
+    @abstractmethod
+    async def completar(
+        self,
+        modelo: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def abrir_stream(
+        self,
+        modelo: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncIterator[Dict[str, Any]]:
+        ...
@@ -0,0 +1,166 @@
+# app/services/providers/key_pool.py - POOL DE CHAVES DE API DO PROVEDOR
+"""
+Distribui as chamadas entre várias chaves de API (OPENAI_API_KEYS), cada uma
+com os próprios limites de requisições e tokens por minuto.
+
+- Folga de cada chave por modelo lida dos headers x-ratelimit-* das respostas
+  (limite, restante e tempo até o reset), descontadas as chamadas que ainda
+  não receberam os headers.
+- A chamada vai para a chave com mais folga; 429 ejeta a chave pelo
+  Retry-After (ou CHAVES_EJECAO_PADRAO) e a chamada tenta outra chave.
+- Utilização por chave em estatisticas() (a chave aparece só pelo final).
+"""
+import re
+import time
+from typing import Dict, Any, List, Optional
+from app.core.config import settings
+
+_DURACAO = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIDADES = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _segundos(valor: Optional[str]) -> Optional[float]:
+    """Converte durações do header de reset ("1s", "6m0s", "20ms") em segundos"""
+    if not valor:
+        return None
+    partes = _DURACAO.findall(valor)
+    if not partes:
+        try:
+            return float(valor)
+        except ValueError:
+            return None
+    return sum(float(numero) * _UNIDADES[unidade] for numero, unidade in partes)
+
+
+def _inteiro(valor: Optional[str]) -> Optional[int]:
+    try:
+        return int(valor) if valor is not None else None
+    except ValueError:
+        return None
+
+
+class _LimitesModelo:
+    """Último retrato dos limites de uma chave para um modelo"""
+
+    def __init__(self):
+        self.limite = {"requests": None, "tokens": None}
+        self.restante = {"requests": None, "tokens": None}
+        self.reset_em = {"requests": 0.0, "tokens": 0.0}
+
+    def atualizar(self, headers, agora: float) -> None:
+        for tipo in ("requests", "tokens"):
+            limite = _inteiro(headers.get(f"x-ratelimit-limit-{tipo}"))
+            restante = _inteiro(headers.get(f"x-ratelimit-remaining-{tipo}"))
+            if limite is not None:
+                self.limite[tipo] = limite
+            if restante is not None:
+                self.restante[tipo] = restante
+                self.reset_em[tipo] = agora + (_segundos(headers.get(f"x-ratelimit-reset-{tipo}")) or 60.0)
+
+    def fracao(self, tipo: str, em_voo: float, agora: float) -> float:
+        """Fração livre do limite (1.0 enquanto não há headers)"""
+        limite = self.limite[tipo]
+        restante = self.restante[tipo]
+        if not limite or restante is None:
+            return 1.0
+        if agora >= self.reset_em[tipo]:
+            # A janela já reabasteceu desde a última leitura
+            restante = limite
+        return max(0.0, (restante - em_voo) / limite)
+
+
+class ChaveAPI:
+
+    def __init__(self, indice: int, segredo: str):
+        self.nome = f"chave-{indice + 1}"
+        self.segredo = segredo
+        self.cliente = None
+        self.em_uso = 0
+        self.tokens_em_voo = 0
+        self.ejetada_ate = 0.0
+        self.limites: Dict[str, _LimitesModelo] = {}
+        self.stats = {"chamadas": 0, "erros_429": 0, "ejecoes": 0, "failovers": 0}
+
+    def folga(self, modelo: str, agora: float) -> float:
+        limites = self.limites.get(modelo)
+        if limites is None:
+            return 1.0
+        return min(
+            limites.fracao("requests", self.em_uso, agora),
+            limites.fracao("tokens", self.tokens_em_voo, agora)
+        )
+
+    def ejetada(self, agora: float) -> bool:
+        return agora < self.ejetada_ate
+
+
+class PoolDeChaves:
+
+    def __init__(self, segredos: List[str]):
+        # dict.fromkeys: remove chaves repetidas mantendo a ordem
+        self.chaves = [ChaveAPI(i, segredo) for i, segredo in enumerate(dict.fromkeys(s for s in segredos if s))]
+        self.stats = {"todas_ejetadas": 0}
+
+    def __len__(self) -> int:
+        return len(self.chaves)
+
+    def escolher(self, modelo: str, excluir: Optional[List[ChaveAPI]] = None) -> Optional[ChaveAPI]:
+        """Chave com mais folga para o modelo; None se todas (fora as excluídas) estão ejetadas"""
+        agora = time.monotonic()
+        candidatas = [c for c in self.chaves if not c.ejetada(agora) and c not in (excluir or [])]
+        if not candidatas:
+            return None
+        return max(candidatas, key=lambda c: (c.folga(modelo, agora), -c.em_uso))
+
+    def primeira_a_voltar(self) -> ChaveAPI:
+        """Todas ejetadas: usa a que volta primeiro (o 429 seguinte fica com o backoff do gateway)"""
+        self.stats["todas_ejetadas"] += 1
+        return min(self.chaves, key=lambda c: c.ejetada_ate)
+
+    @staticmethod
+    def ocupar(chave: ChaveAPI, tokens: int) -> None:
+        chave.em_uso += 1
+        chave.tokens_em_voo += tokens
+        chave.stats["chamadas"] += 1
+
+    @staticmethod
+    def liberar(chave: ChaveAPI, tokens: int) -> None:
+        chave.em_uso -= 1
+        chave.tokens_em_voo -= tokens
+
+    @staticmethod
+    def registrar_headers(chave: ChaveAPI, modelo: str, headers) -> None:
+        if headers is None:
+            return
+        chave.limites.setdefault(modelo, _LimitesModelo()).atualizar(headers, time.monotonic())
+
+    def ejetar(self, chave: ChaveAPI, modelo: str, headers, espera: Optional[float]) -> None:
+        """429: tira a chave da rotação até o Retry-After"""
+        self.registrar_headers(chave, modelo, headers)
+        chave.stats["erros_429"] += 1
+        chave.stats["ejecoes"] += 1
+        chave.ejetada_ate = time.monotonic() + (espera if espera is not None else settings.chaves_ejecao_padrao)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        agora = time.monotonic()
+        chaves = {}
+        for chave in self.chaves:
+            chaves[chave.nome] = {
+                "final": f"...{chave.segredo[-4:]}",
+                "em_uso": chave.em_uso,
+                "tokens_em_voo": chave.tokens_em_voo,
+                "ejetada": chave.ejetada(agora),
+                "volta_em": round(chave.ejetada_ate - agora, 1) if chave.ejetada(agora) else None,
+                "modelos": {
+                    modelo: {
+                        "limite_rpm": limites.limite["requests"],
+                        "restante_rpm": limites.restante["requests"],
+                        "limite_tpm": limites.limite["tokens"],
+                        "restante_tpm": limites.restante["tokens"],
+                        "utilizacao": round(1 - chave.folga(modelo, agora), 4)
+                    }
+                    for modelo, limites in chave.limites.items()
+                },
+                **chave.stats
+            }
+        return {"total": len(self.chaves), **self.stats, "chaves": chaves}
@@ -0,0 +1,136 @@
+# app/services/providers/mock_provider.py - PROVEDOR LOCAL DETERMINÍSTICO (SEM REDE)
+"""
+Provedor para testes de carga e benchmarks offline.
+
+A resposta é determinística (semente = hash do modelo + mensagens): o mesmo
+prompt gera sempre o mesmo texto. O texto segue a estrutura de uma petição,
+com os placeholders que o pós-processamento previdenciário substitui, para
+que as etapas seguintes (preenchimento, pedidos, PDF, banco) tenham carga
+realista.
+
+Configuração (.env):
+- MOCK_TOKENS_RESPOSTA: tamanho da resposta em tokens (limitado a max_tokens)
+- MOCK_LATENCIA_PRIMEIRO_TOKEN / MOCK_LATENCIA_POR_TOKEN: latência simulada
+- MOCK_TOKENS_CAUDA: observações depois da assinatura (exercita a parada antecipada)
+
+O cache de prefixo do provedor é simulado como na OpenAI: a partir da
+segunda chamada com a mesma primeira mensagem (>= 1024 tokens), os tokens
+dela são reportados em "tokens_cache", em blocos de 128.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+from typing import Dict, Any, List, AsyncIterator
+from app.core.config import settings
+from app.services.prompt_compiler import contar_tokens
+from .base import LLMProvider
+
+_CABECALHO = [
+    "EXCELENTÍSSIMO(A) SENHOR(A) DOUTOR(A) JUIZ(A) FEDERAL DA VARA DA [INSERIR COMARCA]",
+    "[NOME DO AUTOR], brasileiro(a), inscrito(a) no CPF sob o nº [CPF], residente em [INSERIR ENDEREÇO COMPLETO], "
+    "por seu advogado, vem propor a presente AÇÃO PREVIDENCIÁRIA em face do INSTITUTO NACIONAL DO SEGURO SOCIAL - INSS, "
+    "com endereço em [INSERIR ENDEREÇO DO INSS], pelos fatos e fundamentos a seguir expostos."
+]
+_SECOES = ["I - DOS FATOS", "II - DO DIREITO", "III - DA JURISPRUDÊNCIA", "IV - DOS PEDIDOS"]
+_ENCERRAMENTO = [
+    "Nestes termos, pede deferimento.",
+    "[INSERIR LOCAL E DATA]",
+    "[NOME DO ADVOGADO]\nOAB/[UF] [NÚMERO]"
+]
+_VOCABULARIO = (
+    "segurado benefício previdenciário INSS requerimento administrativo indeferimento carência qualidade "
+    "contribuição Lei 8.213/91 art. 42 art. 59 EC 103/2019 jurisprudência STJ TNU STF tutela antecipada "
+    "perícia médica incapacidade laboral tempo especial PPP LTCAT CNIS DER DIB valor da causa parcelas "
+    "vencidas correção monetária juros de mora honorários justiça gratuita comprovação documental laudo"
+).split()
+
+_PEDACOS = re.compile(r"\S+\s*")
+
+
+class MockProvider(LLMProvider):
+    """Completions determinísticas com tamanho e latência configuráveis"""
+
+    nome = "mock"
+
+    def __init__(self):
+        self.tokens_resposta = settings.mock_tokens_resposta
+        self.latencia_primeiro_token = settings.mock_latencia_primeiro_token
+        self.latencia_por_token = settings.mock_latencia_por_token
+        self.tokens_cauda = settings.mock_tokens_cauda
+        self._prefixos_vistos: set = set()
+
+    @staticmethod
+    def _semente(modelo: str, messages: List[Dict[str, str]]) -> int:
+        conteudo = json.dumps({"modelo": modelo, "messages": messages}, sort_keys=True, ensure_ascii=False)
+        return int(hashlib.sha256(conteudo.encode()).hexdigest()[:16], 16)
+
+    def _gerar_texto(self, modelo: str, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """Petição sintética com cerca de `min(MOCK_TOKENS_RESPOSTA, max_tokens)` palavras"""
+        alvo = max(1, min(self.tokens_resposta, max_tokens))
+        rng = random.Random(self._semente(modelo, messages))
+
+        fixos = sum(len(bloco.split()) for bloco in _CABECALHO + _SECOES + _ENCERRAMENTO) + self.tokens_cauda + 1
+        por_secao = max(0, alvo - fixos) // len(_SECOES)
+
+        blocos = list(_CABECALHO)
+        for secao in _SECOES:
+            blocos.append(secao)
+            if por_secao:
+                palavras = [rng.choice(_VOCABULARIO) for _ in range(por_secao)]
+                blocos.append(" ".join(palavras).capitalize() + ".")
+        blocos.extend(_ENCERRAMENTO)
+        if self.tokens_cauda:
+            blocos.append("Observações: " + " ".join(rng.choice(_VOCABULARIO) for _ in range(self.tokens_cauda)) + ".")
+
+        # Respostas curtas (max_tokens baixo) são cortadas na contagem de palavras
+        palavras = "\n\n".join(blocos).split(" ")
+        return " ".join(palavras[:alvo]) if len(palavras) > alvo else "\n\n".join(blocos)
+
+    @staticmethod
+    def _tokens_prompt(messages: List[Dict[str, str]]) -> int:
+        return sum(contar_tokens(m["content"]) for m in messages)
+
+    def _uso(self, messages: List[Dict[str, str]], conteudo: str) -> int:
+        return self._tokens_prompt(messages) + len(_PEDACOS.findall(conteudo))
+
+    def _tokens_cache(self, messages: List[Dict[str, str]]) -> int:
+        if not messages:
+            return 0
+        prefixo = messages[0]["content"]
+        tokens = contar_tokens(prefixo)
+        chave = hashlib.sha256(prefixo.encode()).hexdigest()
+        if chave not in self._prefixos_vistos:
+            self._prefixos_vistos.add(chave)
+            return 0
+        return tokens // 128 * 128 if tokens >= 1024 else 0
+
+    async def completar(self, modelo: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> Dict[str, Any]:
+        conteudo = self._gerar_texto(modelo, messages, max_tokens)
+        pedacos = len(_PEDACOS.findall(conteudo))
+        await asyncio.sleep(self.latencia_primeiro_token + self.latencia_por_token * pedacos)
+        return {
+            "conteudo": conteudo,
+            "tokens_usados": self._uso(messages, conteudo),
+            "tokens_prompt": self._tokens_prompt(messages),
+            "tokens_cache": self._tokens_cache(messages)
+        }
+
+    async def abrir_stream(self, modelo: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> AsyncIterator[Dict[str, Any]]:
+        conteudo = self._gerar_texto(modelo, messages, max_tokens)
+        await asyncio.sleep(self.latencia_primeiro_token)
+        return self._transmitir(messages, conteudo)
+
+    async def _transmitir(self, messages: List[Dict[str, str]], conteudo: str) -> AsyncIterator[Dict[str, Any]]:
+        for i, pedaco in enumerate(_PEDACOS.findall(conteudo)):
+            if i and self.latencia_por_token:
+                await asyncio.sleep(self.latencia_por_token)
+            yield {"tipo": "token", "conteudo": pedaco}
+
+        yield {
+            "tipo": "uso",
+            "tokens_usados": self._uso(messages, conteudo),
+            "tokens_prompt": self._tokens_prompt(messages),
+            "tokens_cache": self._tokens_cache(messages)
+        }
@@ -0,0 +1,161 @@
+# app/services/providers/openai_provider.py - PROVEDOR OPENAI (API OU COMPATÍVEL)
+import os
+from typing import Dict, Any, List, AsyncIterator, Optional, Callable, Awaitable
+import httpx
+import openai
+from openai import AsyncOpenAI
+from app.core.config import settings
+from app.services.provider_gateway import retry_after
+from .base import LLMProvider
+from .key_pool import PoolDeChaves, ChaveAPI
+
+
+class OpenAIProvider(LLMProvider):
+    """Chat completions via AsyncOpenAI com pool HTTP compartilhado e pool de chaves de API"""
+
+    nome = "openai"
+
+    def __init__(self):
+        self.api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
+        # OPENAI_API_KEY entra no pool junto com OPENAI_API_KEYS (cada uma com seus limites)
+        self.chaves = PoolDeChaves([self.api_key, *settings.openai_api_keys])
+
+        # Clientes assíncronos (um por chave) e pool HTTP são criados no lifespan da aplicação
+        self.client: Optional[AsyncOpenAI] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def configurado(self) -> bool:
+        return len(self.chaves) > 0
+
+    @property
+    def total_chaves(self) -> int:
+        return max(1, len(self.chaves))
+
+    @property
+    def iniciado(self) -> bool:
+        return self.client is not None
+
+    async def iniciar(self) -> None:
+        """Cria o pool HTTP compartilhado e um cliente assíncrono da OpenAI por chave"""
+        if self.client is not None or not self.configurado:
+            return
+
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections
+            ),
+            timeout=httpx.Timeout(settings.openai_timeout, connect=10.0)
+        )
+        for chave in self.chaves.chaves:
+            # Os clientes compartilham o mesmo pool de conexões
+            chave.cliente = AsyncOpenAI(
+                api_key=chave.segredo,
+                base_url=settings.openai_base_url,
+                http_client=self._http_client,
+                max_retries=0  # retentativas ficam a cargo do gateway
+            )
+        self.client = self.chaves.chaves[0].cliente
+
+    async def encerrar(self) -> None:
+        """Fecha o pool HTTP compartilhado"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        for chave in self.chaves.chaves:
+            chave.cliente = None
+        self.client = None
+        self._http_client = None
+
+    def estatisticas_chaves(self) -> Dict[str, Any]:
+        return self.chaves.estatisticas()
+
+    async def _chamar(self, modelo: str, tokens: int, criar: Callable[[ChaveAPI], Awaitable[Any]]):
+        """
+        Executa a chamada na chave com mais folga. Em 429 a chave é ejetada e a
+        chamada passa para a próxima; sem chave livre o erro sobe para o gateway.
+
+        A chave conta como ocupada só até os headers chegarem: daí em diante o
+        x-ratelimit-remaining já desconta a requisição (e o stream em andamento).
+        """
+        tentadas: List[ChaveAPI] = []
+        erro: Optional[Exception] = None
+        while True:
+            chave = self.chaves.escolher(modelo, tentadas)
+            if chave is None:
+                if erro is not None:
+                    raise erro
+                chave = self.chaves.primeira_a_voltar()
+            self.chaves.ocupar(chave, tokens)
+            try:
+                bruta = await criar(chave)
+            except openai.APIStatusError as e:
+                if e.status_code != 429 or len(self.chaves) == 1:
+                    self.chaves.registrar_headers(chave, modelo, e.response.headers)
+                    raise
+                self.chaves.ejetar(chave, modelo, e.response.headers, retry_after(e))
+                chave.stats["failovers"] += 1
+                tentadas.append(chave)
+                erro = e
+                continue
+            finally:
+                self.chaves.liberar(chave, tokens)
+            self.chaves.registrar_headers(chave, modelo, bruta.headers)
+            return bruta
+
+    @staticmethod
+    def _estimar_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Estimativa barata (~4 caracteres por token) para descontar da folga da chave"""
+        return sum(len(m["content"]) for m in messages) // 4 + max_tokens
+
+    async def completar(self, modelo: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> Dict[str, Any]:
+        tokens = self._estimar_tokens(messages, max_tokens)
+        bruta = await self._chamar(modelo, tokens, lambda chave: chave.cliente.chat.completions.with_raw_response.create(
+            model=modelo,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        ))
+        response = bruta.parse()
+        return {
+            "conteudo": response.choices[0].message.content,
+            "tokens_usados": response.usage.total_tokens if response.usage else 0,
+            "tokens_prompt": response.usage.prompt_tokens if response.usage else 0,
+            "tokens_cache": self._tokens_cache(response.usage)
+        }
+
+    async def abrir_stream(self, modelo: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> AsyncIterator[Dict[str, Any]]:
+        tokens = self._estimar_tokens(messages, max_tokens)
+        bruta = await self._chamar(modelo, tokens, lambda chave: chave.cliente.chat.completions.with_raw_response.create(
+            model=modelo,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        ))
+        return self._ler_stream(bruta.parse())
+
+    @staticmethod
+    def _tokens_cache(usage) -> int:
+        """Tokens do prompt atendidos pelo cache de prefixo (usage.prompt_tokens_details.cached_tokens)"""
+        detalhes = getattr(usage, "prompt_tokens_details", None) if usage else None
+        return getattr(detalhes, "cached_tokens", 0) or 0
+
+    async def _ler_stream(self, stream) -> AsyncIterator[Dict[str, Any]]:
+        tokens_usados = 0
+        tokens_prompt = 0
+        tokens_cache = 0
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield {"tipo": "token", "conteudo": chunk.choices[0].delta.content}
+                if chunk.usage:
+                    tokens_usados = chunk.usage.total_tokens
+                    tokens_prompt = chunk.usage.prompt_tokens
+                    tokens_cache = self._tokens_cache(chunk.usage)
+        finally:
+            # Stream abandonado (hedge perdedor, cliente desconectado): fecha a conexão já
+            await stream.close()
+
+        yield {"tipo": "uso", "tokens_usados": tokens_usados, "tokens_prompt": tokens_prompt, "tokens_cache": tokens_cache}
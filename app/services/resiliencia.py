@@ -0,0 +1,205 @@
+# app/services/resiliencia.py - FALLBACK ENTRE MODELOS, CIRCUIT BREAKER, HEDGING E PRAZO
+"""
+O que decide se, quando e em qual modelo uma chamada ao provedor é tentada,
+igual para completion e streaming:
+
+- Modelos da rota em ordem; erro, timeout (ROTEAMENTO_TIMEOUT) ou circuito
+  aberto passam para o próximo. No streaming o fallback só vale antes do
+  primeiro token (quem chama passa a abertura do stream)
+- Circuit breaker por modelo: só erros do provedor contam como falha
+- Hedge opcional (HEDGE_ATIVO) para o mesmo modelo ou o próximo da rota
+- Prazo da requisição: limita o timeout de cada tentativa e o max_tokens
+"""
+import asyncio
+import time
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
+from app.core.config import settings
+from app.core.request_context import tempo_restante, PrazoEsgotado
+from app.services.circuit_breaker import CircuitBreaker, CircuitoAberto
+from app.services.hedging import HedgePolicy, disputar
+from app.services.model_router import ModelRouter
+from app.services.provider_gateway import ProvedorSobrecarregado, eh_retentavel
+from app.services.prompt_compiler import contar_tokens
+
+Chamar = Callable[[str], Awaitable[Dict[str, Any]]]
+Descartar = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class Resiliencia:
+
+    def __init__(self, roteador: ModelRouter):
+        self.roteador = roteador
+
+        # Circuit breaker por modelo; com o circuito aberto, resposta antiga ou de contingência
+        self.disjuntores: Dict[str, CircuitBreaker] = {}
+
+        # Hedging opcional contra a latência de cauda (HEDGE_ATIVO)
+        self.hedge = HedgePolicy()
+
+        # Prazo da requisição: max_tokens reduzidos e chamadas interrompidas
+        self.prazo_stats = {"max_tokens_reduzidos": 0, "esgotados": 0, "streams_interrompidos": 0}
+
+    async def tentar(
+        self,
+        modelos: List[str],
+        rota: Optional[Dict[str, Any]],
+        messages: List[Dict[str, str]],
+        chamar: Chamar,
+        descartar: Optional[Descartar] = None,
+        aguardando: str = "o provedor"
+    ) -> Tuple[Dict[str, Any], float]:
+        """
+        Resultado de chamar(modelo) no primeiro modelo da rota que responder
+        (com "modelo" = quem respondeu) e o instante em que a tentativa começou.
+        Sem nenhum modelo disponível, levanta o último erro ou CircuitoAberto.
+        """
+        erro: Optional[BaseException] = None
+        for indice, modelo in enumerate(modelos):
+            limite, pelo_prazo = self.limite_tentativa(indice == len(modelos) - 1)
+            disjuntor = self.disjuntor(modelo)
+            if not disjuntor.permitir():
+                self.roteador.registrar(rota, modelo, "circuito_aberto", 0.0)
+                continue
+
+            inicio = time.monotonic()
+            try:
+                chamada = self.chamar_com_hedge(rota, modelo, self.modelo_hedge(modelos, indice), messages, chamar, descartar)
+                resultado = await (chamada if limite is None else asyncio.wait_for(chamada, limite))
+            except asyncio.TimeoutError as e:
+                if pelo_prazo:
+                    # Quem esgotou foi o prazo da requisição, não o provedor
+                    disjuntor.liberar()
+                    raise PrazoEsgotado(f"Prazo da requisição esgotado aguardando {aguardando}") from e
+                disjuntor.registrar_falha()
+                self.roteador.registrar(rota, modelo, "timeout", time.monotonic() - inicio)
+                erro = e
+                continue
+            except Exception as e:
+                self.registrar_erro_disjuntor(disjuntor, e)
+                self.roteador.registrar(rota, modelo, "erro", time.monotonic() - inicio)
+                erro = e
+                continue
+            except BaseException:
+                # Cancelamento (cliente desconectou): não diz nada sobre a saúde do provedor
+                disjuntor.liberar()
+                raise
+
+            # No streaming a saúde do provedor é medida até o primeiro token
+            disjuntor.registrar_sucesso(time.monotonic() - inicio)
+            return resultado, inicio
+
+        raise erro or CircuitoAberto(f"Circuito aberto para {', '.join(modelos)}")
+
+    @staticmethod
+    def limite_tentativa(ultimo: bool) -> Tuple[Optional[float], bool]:
+        """
+        Timeout da tentativa em um modelo e se ele vem do prazo da requisição.
+        Sem prazo vale ROTEAMENTO_TIMEOUT (o último modelo não tem para onde cair:
+        só o timeout do provedor); com prazo, o menor dos dois.
+        """
+        limite = None if ultimo else settings.roteamento_timeout
+        restante = tempo_restante()
+        if restante is None or (limite is not None and limite <= restante):
+            return limite, False
+        if restante <= 0:
+            raise PrazoEsgotado("Prazo da requisição esgotado")
+        return restante, True
+
+    def aplicar_prazo(self, chamada: Dict[str, Any]) -> Dict[str, Any]:
+        """Com prazo apertado, reduz max_tokens ao que o modelo consegue gerar no tempo restante"""
+        restante = tempo_restante()
+        if restante is None:
+            return chamada
+        if restante < settings.prazo_minimo_chamada:
+            self.prazo_stats["esgotados"] += 1
+            raise PrazoEsgotado(f"Prazo da requisição insuficiente para chamar a IA ({max(0.0, restante):.1f}s restantes)")
+
+        vazao = self.roteador.vazao(chamada["modelos"][0]) or settings.prazo_vazao_padrao
+        limite = max(settings.prazo_min_tokens, int(restante * settings.prazo_fracao_geracao * vazao))
+        if limite >= chamada["max_tokens"]:
+            return chamada
+
+        self.prazo_stats["max_tokens_reduzidos"] += 1
+        chamada["rota"].update({"max_tokens": limite, "max_tokens_prazo": chamada["max_tokens"]})
+        return {**chamada, "max_tokens": limite}
+
+    def modelo_hedge(self, modelos: List[str], indice: int) -> str:
+        """Destino do hedge: o próximo modelo da rota (se saudável) ou o mesmo modelo"""
+        if settings.hedge_modelo_alternativo and indice + 1 < len(modelos):
+            alternativo = modelos[indice + 1]
+            if self.disjuntor(alternativo).estado == "fechado":
+                return alternativo
+        return modelos[indice]
+
+    async def chamar_com_hedge(
+        self,
+        rota: Optional[Dict[str, Any]],
+        modelo: str,
+        alternativo: str,
+        messages: List[Dict[str, str]],
+        chamar: Chamar,
+        descartar: Optional[Descartar] = None
+    ) -> Dict[str, Any]:
+        """Executa chamar(modelo); com hedge ativo para o método, dispara chamar(alternativo) se demorar"""
+        metodo = rota["metodo"] if rota else None
+        if not self.hedge.aplicavel(metodo):
+            return await chamar(modelo)
+
+        chave = f"{metodo}:{modelo}"
+        atraso = self.hedge.atraso(chave)
+        inicio = time.monotonic()
+        if atraso is None:
+            # Ainda sem histórico suficiente para estimar o percentil
+            resultado = await chamar(modelo)
+            self.hedge.registrar_chamada(False)
+        else:
+            disputa = await disputar(
+                lambda: chamar(modelo),
+                lambda: chamar(alternativo),
+                atraso,
+                self.hedge.pode_disparar,
+                descartar
+            )
+            resultado = disputa["resultado"]
+            self.hedge.registrar_chamada(disputa["disparou"])
+            if disputa["disparou"]:
+                self._contabilizar_hedge(disputa, alternativo if disputa["hedge_venceu"] else modelo, messages)
+
+        self.hedge.registrar_latencia(chave, time.monotonic() - inicio)
+        return resultado
+
+    def _contabilizar_hedge(self, disputa: Dict[str, Any], modelo_perdedor: str, messages: List[Dict[str, str]]) -> None:
+        """Custo extra do hedge: a chamada perdedora (cancelada, paga ao menos o prompt)"""
+        tokens_prompt = sum(contar_tokens(m["content"], modelo_perdedor) for m in messages)
+        perdedor = disputa["perdedor"] or {}
+        tokens = perdedor.get("tokens_usados") or tokens_prompt
+        self.hedge.registrar_vencedor(
+            disputa["hedge_venceu"],
+            tokens,
+            self.roteador.custo(modelo_perdedor, tokens_prompt, tokens)
+        )
+
+    def disjuntor(self, modelo: str) -> CircuitBreaker:
+        """Circuit breaker do modelo (criado sob demanda)"""
+        if modelo not in self.disjuntores:
+            self.disjuntores[modelo] = CircuitBreaker(
+                modelo,
+                taxa_falhas=settings.circuito_taxa_falhas,
+                janela=settings.circuito_janela,
+                minimo_chamadas=settings.circuito_minimo_chamadas,
+                latencia_limite=settings.circuito_latencia_limite,
+                tempo_aberto=settings.circuito_tempo_aberto
+            )
+        return self.disjuntores[modelo]
+
+    @staticmethod
+    def registrar_erro_disjuntor(disjuntor: CircuitBreaker, erro: Exception) -> None:
+        """Só erros do provedor (transitórios/sobrecarga) contam; erro da requisição (400, 401) não"""
+        if isinstance(erro, ProvedorSobrecarregado) or eh_retentavel(erro):
+            disjuntor.registrar_falha()
+        else:
+            disjuntor.liberar()
+
+    def estado_circuitos(self) -> Dict[str, Any]:
+        """Estado dos circuit breakers por modelo (exposto no /health)"""
+        return {modelo: disjuntor.estado_publico() for modelo, disjuntor in self.disjuntores.items()}
@@ -0,0 +1,67 @@
+# app/services/roteamento.py - ROTA DE CADA CHAMADA: MODELOS, MAX_TOKENS, FILA E CONSUMO
+"""
+Antes da chamada: modelos e max_tokens (ModelRouter + PoliticaSaida), orçamento
+do escritório e lugar na fila justa do gateway. Depois: consumo do escritório
+e tamanho de saída do método.
+"""
+from typing import Dict, Any, Optional, List
+from app.services.fair_queue import FilaJusta
+from app.services.metering_service import MeteringService
+from app.services.model_router import ModelRouter
+from app.services.output_policy import PoliticaSaida
+from app.services.prompt_compiler import contar_tokens
+
+
+class Roteamento:
+
+    def __init__(self, roteador: ModelRouter, saida: PoliticaSaida, medidor: MeteringService):
+        self.roteador = roteador
+        self.saida = saida
+        self.medidor = medidor
+
+    def rotear(self, metodo: str, chamada: Dict[str, Any], area: Optional[str], escritorio: Optional[str]) -> Dict[str, Any]:
+        """Aplica a política de roteamento (modelos + max_tokens) e de tamanho de saída à chamada"""
+        return self.saida.aplicar(metodo, self.roteador.decidir(metodo, chamada, area, escritorio))
+
+    def modelos(self, metodo: str, chamada: Dict[str, Any], area: Optional[str], escritorio: Optional[str]) -> List[str]:
+        """Modelos que a rota daria à chamada (preferido + fallbacks), sem registrar decisão"""
+        tier = self.roteador.tier(escritorio)
+        return self.roteador.regra(metodo, area, tier, self.roteador.tokens_prompt(chamada))[1]
+
+    async def verificar_orcamento(self, chamada: Dict[str, Any]) -> None:
+        """Bloqueia a chamada antes do provedor se o escritório estourou o orçamento"""
+        await self.medidor.verificar_orcamento(
+            chamada["rota"].get("escritorio"),
+            self.estimar_tokens(chamada["rota"], chamada["modelos"][0], chamada["messages"], chamada["max_tokens"])
+        )
+
+    async def medir(self, rota: Optional[Dict[str, Any]], modelo: str, tokens_usados: int) -> bool:
+        """
+        Contabiliza a chamada paga no consumo do escritório e no tamanho de saída do método.
+        Retorna se a resposta parou no teto de max_tokens (truncada).
+        """
+        truncada = self.saida.registrar(rota, tokens_usados)
+        rota = rota or {}
+        custo = rota.get("resultado", {}).get("custo_usd", 0.0)
+        await self.medidor.registrar(rota.get("escritorio"), rota.get("metodo", "sem_rota"), modelo, tokens_usados, custo)
+        return truncada
+
+    @staticmethod
+    def fila(rota: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Escritório, classe de prioridade (pelo método) e peso (pelo plano) na fila justa do gateway"""
+        rota = rota or {}
+        return {
+            "escritorio": rota.get("escritorio"),
+            "classe": FilaJusta.classe_do_metodo(rota.get("metodo")),
+            "peso": FilaJusta.peso_do_tier(rota.get("tier"))
+        }
+
+    @staticmethod
+    def estimar_tokens(rota: Optional[Dict[str, Any]], modelo: str, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """
+        Tokens reservados na janela TPM antes da chamada (prompt + máximo de saída).
+        O prompt já foi contado pelo ModelRouter na rota; só se conta de novo sem rota.
+        """
+        if rota and "tokens_prompt" in rota:
+            return rota["tokens_prompt"] + max_tokens
+        return sum(contar_tokens(m["content"], modelo) for m in messages) + max_tokens
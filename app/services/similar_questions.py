@@ -0,0 +1,232 @@
+# app/services/similar_questions.py - ÍNDICE DE PERGUNTAS QUASE DUPLICADAS (MINHASH + LSH)
+"""
+Reaproveita a resposta de uma consulta anterior quando a pergunta nova é uma
+paráfrase próxima ("prazo para recorrer do INSS" x "qual o prazo de recurso
+no INSS?"), coisa que o cache exato não pega.
+
+- Normalização: minúsculas, sem acentos, sem stopwords; shingles = palavras +
+  n-gramas de caracteres de cada palavra (pega variações como recurso/recursal)
+- Polaridade: negação e "com"/"sem" não são stopwords e, além disso, precisam
+  coincidir. "Posso ... trabalhar?" x "Não posso ..." ou "com carência" x "sem
+  carência" diferem em um ou dois shingles (Jaccard alto) e pedem respostas
+  opostas: com polaridade diferente a similaridade é 0
+- Assinatura MinHash de uma permutação (one permutation hashing): um único
+  hash por shingle, distribuído em SIMILARES_PERMUTACOES compartimentos; custo
+  linear no tamanho da pergunta, sem dependências além da stdlib
+- LSH por bandas sobre a assinatura encontra candidatos em O(bandas); a
+  similaridade final é o Jaccard exato dos shingles, comparado com
+  SIMILARES_LIMIAR
+
+Partições por área jurídica + branding (escritório, advogado, assinatura,
+persona): a resposta de um escritório nunca é servida com a assinatura de
+outro. O índice é carregado das consultas salvas (tabela consultas) no
+início e atualizado a cada resposta nova.
+"""
+import re
+import time
+import unicodedata
+import zlib
+from collections import deque, Counter
+from typing import Dict, Any, List, Optional, Tuple, Set, Deque, FrozenSet
+from app.core.config import settings
+
+_PALAVRAS = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das no na nos nas em por para pra pelo pela pelos pelas
+que qual quais quando como onde e ou se ao aos meu minha meus minhas seu sua seus suas
+eu voce ele ela nos eles elas isso isto esse essa este esta ja sim mais muito muita ter tem
+ha sao ser foi posso pode devo deve sobre entre ate apos
+""".split())
+# Palavras que invertem o sentido da pergunta: nunca ignoradas e obrigatoriamente iguais
+_POLARIDADE = frozenset("nao sem com nunca nem jamais nenhum nenhuma".split())
+_VAZIO = 0xFFFFFFFF
+
+
+def normalizar(texto: str) -> List[str]:
+    """Palavras relevantes da pergunta, sem acentos nem stopwords"""
+    sem_acento = unicodedata.normalize("NFKD", texto.lower()).encode("ascii", "ignore").decode()
+    return [p for p in _PALAVRAS.findall(sem_acento) if p not in _STOPWORDS]
+
+
+def polaridade(texto: str) -> FrozenSet[str]:
+    """Palavras de negação/polaridade presentes na pergunta"""
+    return frozenset(p for p in normalizar(texto) if p in _POLARIDADE)
+
+
+def shingles(texto: str) -> Set[int]:
+    """Palavras e n-gramas de caracteres (com bordas), como hashes de 32 bits"""
+    n = settings.similares_ngrama
+    conjunto: Set[int] = set()
+    for palavra in normalizar(texto):
+        conjunto.add(zlib.crc32(palavra.encode()))
+        marcada = f"^{palavra}$"
+        for i in range(max(1, len(marcada) - n + 1)):
+            conjunto.add(zlib.crc32(("#" + marcada[i:i + n]).encode()))
+    return conjunto
+
+
+def assinatura(conjunto: Set[int], compartimentos: int) -> Tuple[int, ...]:
+    """MinHash de uma permutação: o menor hash de cada compartimento (_VAZIO se não houver)"""
+    minimos = [_VAZIO] * compartimentos
+    for h in conjunto:
+        # Mistura o hash antes de escolher o compartimento (crc32 tem bits baixos correlacionados)
+        h = (h * 0x9E3779B1) & 0xFFFFFFFF
+        i = h % compartimentos
+        valor = h // compartimentos
+        if valor < minimos[i]:
+            minimos[i] = valor
+    return tuple(minimos)
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    intersecao = len(a & b)
+    return intersecao / (len(a) + len(b) - intersecao)
+
+
+class _Particao:
+    """Perguntas de uma área + branding, com as tabelas LSH"""
+
+    def __init__(self, bandas: int):
+        self.itens: Dict[int, Dict[str, Any]] = {}
+        self.por_texto: Dict[Tuple[str, ...], int] = {}
+        self.tabelas: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bandas)]
+
+
+class IndiceSimilares:
+
+    def __init__(self):
+        self.compartimentos = settings.similares_permutacoes
+        self.linhas = settings.similares_linhas_banda
+        self.bandas = self.compartimentos // self.linhas
+        self._particoes: Dict[str, _Particao] = {}
+        self._proximo_id = 0
+        self._tempos: Deque[float] = deque(maxlen=1000)
+        self.stats = {"itens": 0, "buscas": 0, "reusos": 0, "carregados_banco": 0}
+
+    @staticmethod
+    def particao(area: Optional[str], branding: Optional[Dict[str, Optional[str]]] = None) -> str:
+        """Área + branding: só reaproveita respostas com a mesma assinatura e persona"""
+        campos = branding or {}
+        marca = "|".join(campos.get(c) or "" for c in ("firm_name", "lawyer_name", "signature_text", "ai_persona"))
+        return f"{(area or 'geral').lower()}|{marca}"
+
+    def _bandas(self, sig: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [sig[b * self.linhas:(b + 1) * self.linhas] for b in range(self.bandas)]
+
+    def adicionar(
+        self,
+        area: Optional[str],
+        branding: Optional[Dict[str, Optional[str]]],
+        pergunta: str,
+        resposta: str,
+        consulta_id: Optional[int] = None,
+        modelo: Optional[str] = None
+    ) -> None:
+        """Indexa uma pergunta respondida (a mesma pergunta normalizada substitui a anterior)"""
+        conjunto = shingles(pergunta)
+        if not conjunto or not resposta:
+            return
+        particao = self._particoes.setdefault(self.particao(area, branding), _Particao(self.bandas))
+        texto = tuple(normalizar(pergunta))
+        existente = particao.por_texto.get(texto)
+        if existente is not None:
+            item = particao.itens[existente]
+            item.update({"resposta": resposta, "consulta_id": consulta_id or item["consulta_id"], "modelo": modelo or item["modelo"]})
+            return
+
+        self._proximo_id += 1
+        item_id = self._proximo_id
+        sig = assinatura(conjunto, self.compartimentos)
+        particao.itens[item_id] = {
+            "pergunta": pergunta,
+            "resposta": resposta,
+            "consulta_id": consulta_id,
+            "modelo": modelo,
+            "shingles": conjunto,
+            "polaridade": polaridade(pergunta)
+        }
+        particao.por_texto[texto] = item_id
+        for tabela, banda in zip(particao.tabelas, self._bandas(sig)):
+            if all(v == _VAZIO for v in banda):
+                continue  # compartimentos vazios não provam semelhança
+            tabela.setdefault(banda, []).append(item_id)
+        self.stats["itens"] += 1
+
+    def buscar(
+        self,
+        area: Optional[str],
+        branding: Optional[Dict[str, Optional[str]]],
+        pergunta: str
+    ) -> Optional[Dict[str, Any]]:
+        """Pergunta indexada mais parecida acima de SIMILARES_LIMIAR, com a similaridade"""
+        inicio = time.perf_counter()
+        self.stats["buscas"] += 1
+        try:
+            particao = self._particoes.get(self.particao(area, branding))
+            conjunto = shingles(pergunta)
+            if particao is None or not conjunto:
+                return None
+
+            sentido = polaridade(pergunta)
+            sig = assinatura(conjunto, self.compartimentos)
+            votos: Counter = Counter()
+            for tabela, banda in zip(particao.tabelas, self._bandas(sig)):
+                votos.update(tabela.get(banda, ()))
+
+            # Jaccard exato só nos candidatos que mais colidiram
+            melhor: Optional[Tuple[float, int]] = None
+            for item_id, _ in votos.most_common(settings.similares_max_candidatos):
+                item = particao.itens[item_id]
+                # Mesmas palavras com sentido oposto ("com" x "sem", "posso" x "não posso")
+                similaridade = jaccard(conjunto, item["shingles"]) if item["polaridade"] == sentido else 0.0
+                if melhor is None or similaridade > melhor[0]:
+                    melhor = (similaridade, item_id)
+
+            if melhor is None or melhor[0] < settings.similares_limiar:
+                return None
+            item = particao.itens[melhor[1]]
+            self.stats["reusos"] += 1
+            return {
+                "resposta": item["resposta"],
+                "pergunta_similar": item["pergunta"],
+                "consulta_id": item["consulta_id"],
+                "modelo": item["modelo"],
+                "similaridade": round(melhor[0], 4)
+            }
+        finally:
+            self._tempos.append(time.perf_counter() - inicio)
+
+    def carregar_do_banco(self) -> int:
+        """Indexa as consultas salvas (sem branding: a tabela não guarda escritório). Roda fora do event loop."""
+        from app.core.database import SessionLocal
+        from app.models.consulta import Consulta
+
+        db = SessionLocal()
+        try:
+            linhas = (
+                db.query(Consulta.id, Consulta.pergunta, Consulta.resposta, Consulta.area_juridica)
+                .filter(Consulta.resposta.isnot(None))
+                .order_by(Consulta.id.desc())
+                .limit(settings.similares_max_carga)
+                .all()
+            )
+        finally:
+            db.close()
+
+        # Mais antigas primeiro: a resposta mais recente da mesma pergunta prevalece
+        for consulta_id, pergunta, resposta, area in reversed(linhas):
+            self.adicionar(getattr(area, "value", area), None, pergunta, resposta, consulta_id)
+        self.stats["carregados_banco"] += len(linhas)
+        return len(linhas)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        tempos = sorted(self._tempos)
+        return {
+            **self.stats,
+            "particoes": len(self._particoes),
+            "limiar": settings.similares_limiar,
+            "busca_p50_ms": round(tempos[len(tempos) // 2] * 1000, 4) if tempos else None,
+            "busca_p99_ms": round(tempos[int(len(tempos) * 0.99)] * 1000, 4) if tempos else None
+        }
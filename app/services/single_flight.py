@@ -0,0 +1,110 @@
+# app/services/single_flight.py - COALESCÊNCIA DE CHAMADAS IDÊNTICAS À IA
+import asyncio
+import uuid
+from typing import Dict, Any, Callable, Awaitable, Optional, Tuple
+from app.core.config import settings
+from app.services.cache_service import CacheService
+
+class SingleFlight:
+    """
+    Garante que prompts idênticos em voo gerem uma única chamada ao provedor.
+
+    - No mesmo processo: chamadas duplicadas aguardam a mesma task
+    - Entre workers: um lock no Redis elege o líder; os demais aguardam o
+      resultado aparecer no cache de respostas
+    """
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+        self._em_voo: Dict[str, asyncio.Task] = {}
+        self._aguardando: Dict[asyncio.Task, int] = {}
+        self.stats = {"lider": 0, "coalescidas_local": 0, "coalescidas_redis": 0}
+
+    async def executar(
+        self,
+        chave: str,
+        chamar_provedor: Callable[[], Awaitable[Dict[str, Any]]],
+        ler_resultado: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Executa `chamar_provedor` uma única vez por chave.
+        Retorna (resultado, papel) onde papel é 'lider', 'local' ou 'redis'.
+        """
+        task = self._em_voo.get(chave)
+        if task is None:
+            task = asyncio.create_task(self._executar_distribuido(chave, chamar_provedor, ler_resultado))
+            task.add_done_callback(lambda t, c=chave: self._finalizar(c, t))
+            self._em_voo[chave] = task
+            seguidor = False
+        else:
+            self.stats["coalescidas_local"] += 1
+            seguidor = True
+
+        self._aguardando[task] = self._aguardando.get(task, 0) + 1
+        try:
+            # shield: o cancelamento de um chamador não derruba os demais
+            resultado, papel = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._liberar_espera(task) and not task.done():
+                # Ninguém mais espera pela resposta: cancelar a chamada ao provedor
+                task.cancel()
+            raise
+        except Exception:
+            self._liberar_espera(task)
+            raise
+
+        self._liberar_espera(task)
+        return resultado, "local" if seguidor else papel
+
+    def _liberar_espera(self, task: asyncio.Task) -> bool:
+        """Decrementa os chamadores da task; retorna True se não restou nenhum"""
+        restantes = self._aguardando.get(task, 1) - 1
+        if restantes <= 0:
+            self._aguardando.pop(task, None)
+            return True
+        self._aguardando[task] = restantes
+        return False
+
+    def _finalizar(self, chave: str, task: asyncio.Task) -> None:
+        """Remove a chave do mapa de chamadas em voo"""
+        if self._em_voo.get(chave) is task:
+            del self._em_voo[chave]
+        if not task.cancelled():
+            task.exception()  # evita aviso de exceção não recuperada
+
+    async def _executar_distribuido(
+        self,
+        chave: str,
+        chamar_provedor: Callable[[], Awaitable[Dict[str, Any]]],
+        ler_resultado: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """Elege um líder entre os workers via lock no Redis"""
+        nome_lock = f"singleflight:{chave}"
+        token = uuid.uuid4().hex
+
+        adquirido = await self.cache.adquirir_lock(nome_lock, token, settings.single_flight_lock_ttl)
+
+        # Redis indisponível ou lock obtido: este worker chama o provedor
+        if adquirido is None or adquirido:
+            self.stats["lider"] += 1
+            try:
+                return await chamar_provedor(), "lider"
+            finally:
+                if adquirido:
+                    await self.cache.liberar_lock(nome_lock, token)
+
+        # Outro worker já está chamando o provedor: aguardar o resultado no cache
+        loop = asyncio.get_running_loop()
+        limite = loop.time() + settings.single_flight_espera_max
+        while loop.time() < limite:
+            await asyncio.sleep(settings.single_flight_intervalo)
+            resultado = await ler_resultado()
+            if resultado is not None:
+                self.stats["coalescidas_redis"] += 1
+                return resultado, "redis"
+            if not await self.cache.lock_ativo(nome_lock):
+                # Líder terminou sem gravar (erro): não ficar esperando
+                break
+
+        self.stats["lider"] += 1
+        return await chamar_provedor(), "lider"
@@ -0,0 +1,195 @@
+# app/services/telemetry.py - TELEMETRIA DAS CHAMADAS À IA (HISTOGRAMAS + LOG ESTRUTURADO)
+"""
+Cada chamada ao provedor feita pelo AIService gera uma medição com:
+
+- espera_fila: tempo aguardando vaga no gateway (fila justa + janelas RPM/TPM)
+- primeiro_token: tempo até o primeiro token (só em streaming)
+- latencia: tempo total da chamada, incluindo a fila
+- tokens_prompt / tokens_resposta e tokens_por_segundo (geração, sem a fila)
+- método, modelo, escritório e endpoint HTTP
+
+Exportação:
+- histogramas no formato texto do Prometheus (GET /metrics)
+- um evento JSON por linha no log (TELEMETRIA_LOG)
+- resumo p50/p95/p99 por método na janela recente (TELEMETRIA_JANELA_SEGUNDOS)
+"""
+import json
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque, Tuple
+from app.core.config import settings
+from app.core.request_context import endpoint_http
+
+SEM_ESCRITORIO = "sem_escritorio"
+
+_SEGUNDOS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120]
+_TOKENS = [64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384]
+_TOKENS_S = [5, 10, 20, 40, 60, 80, 120, 160, 250]
+
+# medida -> (nome da métrica, descrição, buckets)
+METRICAS: Dict[str, Tuple[str, str, List[float]]] = {
+    "espera_fila": ("lawclerk_ia_espera_fila_segundos", "Espera por vaga no gateway do provedor", _SEGUNDOS),
+    "primeiro_token": ("lawclerk_ia_primeiro_token_segundos", "Tempo até o primeiro token (streaming)", _SEGUNDOS),
+    "latencia": ("lawclerk_ia_latencia_segundos", "Latência total da chamada, incluindo a fila", _SEGUNDOS),
+    "tokens_prompt": ("lawclerk_ia_tokens_prompt", "Tokens de entrada por chamada", _TOKENS),
+    "tokens_resposta": ("lawclerk_ia_tokens_resposta", "Tokens gerados por chamada", _TOKENS),
+    "tokens_por_segundo": ("lawclerk_ia_tokens_por_segundo", "Vazão de geração (tokens de saída por segundo)", _TOKENS_S)
+}
+
+_ROTULOS = ("metodo", "modelo", "escritorio")
+_INFINITO = 'le="+Inf"'
+
+
+class Histograma:
+    """Buckets cumulativos por combinação de rótulos"""
+
+    def __init__(self, limites: List[float]):
+        self.limites = limites
+        self.series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    def observar(self, rotulos: Tuple[str, ...], valor: float) -> None:
+        serie = self.series.setdefault(rotulos, {"buckets": [0] * len(self.limites), "soma": 0.0, "total": 0})
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                serie["buckets"][i] += 1
+        serie["soma"] += valor
+        serie["total"] += 1
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _rotulos_prometheus(nomes: Tuple[str, ...], valores: Tuple[str, ...], extra: str = "") -> str:
+    pares = ['%s="%s"' % (nome, _escapar(valor)) for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}"
+
+
+def _percentil(ordenados: List[float], fracao: float) -> Optional[float]:
+    if not ordenados:
+        return None
+    return round(ordenados[min(len(ordenados) - 1, int(len(ordenados) * fracao))], 3)
+
+
+class Telemetria:
+
+    def __init__(self):
+        self.histogramas = {medida: Histograma(buckets) for medida, (_, _, buckets) in METRICAS.items()}
+        self.chamadas: Dict[Tuple[str, ...], int] = {}  # (metodo, modelo, escritorio, status) -> total
+        self._recentes: Deque[Dict[str, Any]] = deque(maxlen=settings.telemetria_max_eventos)
+
+    def _rotulos(self, rota: Optional[Dict[str, Any]], modelo: str) -> Tuple[str, ...]:
+        rota = rota or {}
+        escritorio = rota.get("escritorio") or SEM_ESCRITORIO
+        if not settings.telemetria_rotulo_escritorio:
+            # Muitos escritórios = muitas séries no Prometheus; o log mantém o detalhe
+            escritorio = "todos"
+        return (rota.get("metodo", "sem_rota"), modelo, escritorio)
+
+    def registrar(
+        self,
+        rota: Optional[Dict[str, Any]],
+        modelo: str,
+        inicio: float,
+        fim: float,
+        espera_fila: float,
+        response: Dict[str, Any],
+        primeiro_token: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Registra uma chamada bem-sucedida (instantes em time.monotonic())"""
+        tokens_usados = response.get("tokens_usados", 0)
+        tokens_prompt = response.get("tokens_prompt") or (rota or {}).get("tokens_prompt", 0)
+        tokens_resposta = max(0, tokens_usados - tokens_prompt)
+        # Geração: do primeiro token (ou do fim da fila, sem streaming) até o fim
+        geracao = fim - (primeiro_token if primeiro_token is not None else inicio + espera_fila)
+        medidas = {
+            "espera_fila": espera_fila,
+            "primeiro_token": primeiro_token - inicio if primeiro_token is not None else None,
+            "latencia": fim - inicio,
+            "tokens_prompt": tokens_prompt,
+            "tokens_resposta": tokens_resposta,
+            "tokens_por_segundo": tokens_resposta / geracao if tokens_resposta and geracao > 0 else None
+        }
+        rotulos = self._rotulos(rota, modelo)
+        for medida, valor in medidas.items():
+            if valor is not None:
+                self.histogramas[medida].observar(rotulos, valor)
+        return self._evento(rota, modelo, "sucesso", medidas, response.get("tokens_cache", 0))
+
+    def registrar_falha(self, rota: Optional[Dict[str, Any]], modelo: str, inicio: float, status: str) -> None:
+        """Chamada com erro ou cancelada: conta e loga, sem entrar nos histogramas"""
+        self._evento(rota, modelo, status, {"latencia": time.monotonic() - inicio})
+
+    def _evento(self, rota: Optional[Dict[str, Any]], modelo: str, status: str, medidas: Dict[str, Any], tokens_cache: int = 0) -> Dict[str, Any]:
+        rota = rota or {}
+        chave = (*self._rotulos(rota, modelo), status)
+        self.chamadas[chave] = self.chamadas.get(chave, 0) + 1
+
+        evento = {
+            "evento": "chamada_ia",
+            "instante": time.time(),
+            "status": status,
+            "metodo": rota.get("metodo", "sem_rota"),
+            "modelo": modelo,
+            "escritorio": rota.get("escritorio") or SEM_ESCRITORIO,
+            "endpoint": endpoint_http.get(),
+            "rota_id": rota.get("id"),
+            **{medida: round(valor, 4) if isinstance(valor, float) else valor for medida, valor in medidas.items()},
+            "tokens_cache": tokens_cache
+        }
+        self._recentes.append(evento)
+        if settings.telemetria_log:
+            print(json.dumps(evento, ensure_ascii=False))
+        return evento
+
+    def prometheus(self) -> str:
+        """Histogramas e contadores no formato texto de exposição do Prometheus"""
+        linhas: List[str] = []
+        for medida, (nome, descricao, _) in METRICAS.items():
+            histograma = self.histogramas[medida]
+            linhas.append(f"# HELP {nome} {descricao}")
+            linhas.append(f"# TYPE {nome} histogram")
+            for rotulos, serie in histograma.series.items():
+                for limite, quantidade in zip(histograma.limites, serie["buckets"]):
+                    le = 'le="%s"' % limite
+                    linhas.append(f"{nome}_bucket{_rotulos_prometheus(_ROTULOS, rotulos, le)} {quantidade}")
+                linhas.append(f"{nome}_bucket{_rotulos_prometheus(_ROTULOS, rotulos, _INFINITO)} {serie['total']}")
+                sufixo = _rotulos_prometheus(_ROTULOS, rotulos)
+                linhas.append(f"{nome}_sum{sufixo} {serie['soma']}")
+                linhas.append(f"{nome}_count{sufixo} {serie['total']}")
+
+        linhas.append("# HELP lawclerk_ia_chamadas_total Chamadas ao provedor por status")
+        linhas.append("# TYPE lawclerk_ia_chamadas_total counter")
+        for chave, total in self.chamadas.items():
+            linhas.append(f"lawclerk_ia_chamadas_total{_rotulos_prometheus((*_ROTULOS, 'status'), chave)} {total}")
+        return "\n".join(linhas) + "\n"
+
+    def resumo(self, janela_segundos: Optional[float] = None) -> Dict[str, Any]:
+        """p50/p95/p99 de cada medida por método, nas chamadas da janela recente"""
+        janela = janela_segundos or settings.telemetria_janela_segundos
+        desde = time.time() - janela
+        por_metodo: Dict[str, List[Dict[str, Any]]] = {}
+        for evento in self._recentes:
+            if evento["instante"] >= desde:
+                por_metodo.setdefault(evento["metodo"], []).append(evento)
+
+        metodos = {}
+        for metodo, eventos in por_metodo.items():
+            sucessos = [e for e in eventos if e["status"] == "sucesso"]
+            medidas = {}
+            for medida in METRICAS:
+                valores = sorted(e[medida] for e in sucessos if e.get(medida) is not None)
+                medidas[medida] = {
+                    "p50": _percentil(valores, 0.50),
+                    "p95": _percentil(valores, 0.95),
+                    "p99": _percentil(valores, 0.99)
+                }
+            metodos[metodo] = {
+                "chamadas": len(eventos),
+                "falhas": len(eventos) - len(sucessos),
+                "modelos": sorted({e["modelo"] for e in eventos}),
+                **medidas
+            }
+        return {"janela_segundos": janela, "metodos": metodos}
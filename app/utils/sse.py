@@ -0,0 +1,27 @@
+# app/utils/sse.py - RESPOSTAS EM STREAMING (SERVER-SENT EVENTS)
+import json
+from typing import AsyncIterator, Dict, Any
+from fastapi.responses import StreamingResponse
+
+# Evita que proxies (nginx/Railway) acumulem o corpo antes de repassar
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+def formatar_evento_sse(evento: Dict[str, Any]) -> str:
+    """Serializa um evento no formato SSE (event + data)"""
+    nome = evento.get("evento", "mensagem")
+    dados = json.dumps(evento, ensure_ascii=False)
+    return f"event: {nome}\ndata: {dados}\n\n"
+
+def resposta_sse(eventos: AsyncIterator[Dict[str, Any]], extras_fim: Dict[str, Any] = None) -> StreamingResponse:
+    """Cria StreamingResponse SSE; `extras_fim` é mesclado ao evento final"""
+
+    async def gerar():
+        async for evento in eventos:
+            if extras_fim and evento.get("evento") == "fim":
+                evento = {**extras_fim, **evento}
+            yield formatar_evento_sse(evento)
+
+    return StreamingResponse(gerar(), media_type="text/event-stream", headers=SSE_HEADERS)
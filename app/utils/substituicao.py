@@ -0,0 +1,112 @@
+# app/utils/substituicao.py - REMOÇÃO POR PADRÕES EM ORDEM E SUBSTITUIÇÃO EM STREAMING
+"""
+- RemocaoSequencial: o re.sub de cada padrão, em ordem (o que um padrão
+  remove pode juntar um trecho que o seguinte remove), tentando a regex só
+  onde aparece o trecho literal com que ela começa. Com IGNORECASE o re não
+  tem atalho nenhum e tentaria a regex em cada posição do texto.
+- PassadaIncremental: aplica uma substituição a um texto que chega em pedaços.
+"""
+import re
+from typing import Callable, Dict, List, Optional
+
+_METACARACTERES = frozenset("\\.^$*+?{}[]()|")
+_QUANTIFICADORES = frozenset("*+?{")
+
+# Letras que o re com IGNORECASE iguala a "i" e "s" e que str.lower() não converte
+_CAIXA_ESPECIAL = ("ı", "ſ")
+
+
+def prefixo_literal(padrao: str) -> str:
+    """Trecho literal com que toda ocorrência da regex começa ("" se não houver)"""
+    if "|" in padrao:
+        return ""  # alternativa pode começar por outro trecho
+    fim = 0
+    while fim < len(padrao) and padrao[fim] not in _METACARACTERES:
+        fim += 1
+    if fim < len(padrao) and padrao[fim] in _QUANTIFICADORES:
+        fim -= 1  # o último caractere é opcional/repetido
+    return padrao[:max(fim, 0)]
+
+
+class RemocaoSequencial:
+    """re.sub(padrão, "", texto) de cada regra em ordem, tentado só onde a âncora literal da regra aparece"""
+
+    def __init__(self, regras: Dict[str, str], flags: int = 0):
+        self.regras = dict(regras)
+        self._ignorar_caixa = bool(flags & re.IGNORECASE)
+        self._compiladas = []
+        for padrao in self.regras.values():
+            ancora = prefixo_literal(padrao)
+            self._compiladas.append((re.compile(padrao, flags), ancora.lower() if self._ignorar_caixa else ancora))
+
+    def _base(self, texto: str) -> Optional[str]:
+        """Texto em que as âncoras são procuradas; None se as posições não corresponderem às do re"""
+        if not self._ignorar_caixa:
+            return texto
+        base = texto.lower()
+        if len(base) != len(texto) or any(letra in texto for letra in _CAIXA_ESPECIAL):
+            return None
+        return base
+
+    def aplicar(self, texto: str) -> str:
+        base: Optional[str] = None
+        for regra, ancora in self._compiladas:
+            if base is None and ancora:
+                base = self._base(texto)
+            if base is None or not ancora:
+                texto = regra.sub("", texto)
+                base = None
+                continue
+
+            partes: List[str] = []
+            copiado = 0
+            inicio = base.find(ancora)
+            while inicio != -1:
+                achado = regra.match(texto, inicio)
+                if achado is None:
+                    inicio = base.find(ancora, inicio + 1)
+                    continue
+                partes.append(texto[copiado:inicio])
+                copiado = achado.end()
+                inicio = base.find(ancora, copiado)
+            if partes:
+                partes.append(texto[copiado:])
+                texto = "".join(partes)
+                base = None
+        return texto
+
+
+class PassadaIncremental:
+    """
+    Aplica uma substituição a um texto que chega em pedaços (stream do modelo).
+
+    Os últimos `janela` caracteres ficam retidos (um placeholder pode estar
+    pela metade). O que vem antes deles só sai se processá-lo separado do
+    resto do buffer der o mesmo que processar o buffer inteiro; senão o corte
+    espera o próximo pedaço. Um trecho reconhecido maior que a janela ainda
+    pode divergir do processamento do texto inteiro: quem usa confere no fim.
+    """
+
+    def __init__(self, aplicar: Callable[[str], str], janela: int, passo: int = 32):
+        self.aplicar = aplicar
+        self.janela = janela
+        self.passo = passo
+        self.buffer = ""
+
+    def alimentar(self, pedaco: str) -> str:
+        """Texto já processado que não muda mais com o resto do stream ("" enquanto o buffer é pequeno)"""
+        self.buffer += pedaco
+        if len(self.buffer) < self.janela + self.passo:
+            return ""
+        corte = len(self.buffer) - self.janela
+        saida = self.aplicar(self.buffer[:corte])
+        if saida + self.aplicar(self.buffer[corte:]) != self.aplicar(self.buffer):
+            return ""
+        self.buffer = self.buffer[corte:]
+        return saida
+
+    def finalizar(self) -> str:
+        """Processa o que sobrou no buffer (fim do stream)"""
+        saida = self.aplicar(self.buffer) if self.buffer else ""
+        self.buffer = ""
+        return saida
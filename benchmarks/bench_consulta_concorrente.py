@@ -0,0 +1,77 @@
+# benchmarks/bench_consulta_concorrente.py
+"""
+Benchmark de concorrência do /api/v1/consulta contra um provedor mock local.
+
+Com o cliente assíncrono, N consultas simultâneas devem levar aproximadamente
+a latência de UMA completion (o throughput escala com a concorrência). Com o
+cliente síncrono antigo, o event loop ficava bloqueado e o tempo crescia
+linearmente com N.
+
+Cada consulta leva X-Cache-Bypass e uma pergunta numerada: o que se mede é a
+chamada ao provedor, não o cache exato, o índice de perguntas similares ou a
+coalescência de chamadas idênticas.
+
+Uso:
+    python -m benchmarks.bench_consulta_concorrente --latencia 0.5 --niveis 1 4 16 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_provider import iniciar_mock_em_thread
+
+
+async def executar_nivel(client, concorrencia: int) -> float:
+    """Dispara `concorrencia` consultas simultâneas e retorna o tempo total"""
+    payloads = [
+        {"pergunta": f"Qual o prazo para recorrer de decisão do INSS? (consulta {i})", "area": "previdenciario"}
+        for i in range(concorrencia)
+    ]
+
+    inicio = time.perf_counter()
+    respostas = await asyncio.gather(*[
+        client.post("/api/v1/consulta", json=payload, headers={"X-Cache-Bypass": "true"}) for payload in payloads
+    ])
+    duracao = time.perf_counter() - inicio
+
+    falhas = [r for r in respostas if r.status_code != 200 or r.json().get("status") != "sucesso"]
+    if falhas:
+        print(f"  ⚠️ {len(falhas)} falhas: {falhas[0].text[:200]}")
+    return duracao
+
+
+async def main(args):
+    servidor = iniciar_mock_em_thread(porta=args.porta, latencia=args.latencia)
+
+    # Configurar o AIService para o mock ANTES de importar a aplicação
+    os.environ["OPENAI_API_KEY"] = "sk-mock"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.porta}/v1"
+
+    import httpx
+    from app.main import app
+
+    print(f"Provedor mock: latência {args.latencia:.2f}s por completion\n")
+    print(f"{'concorrência':>12} | {'tempo (s)':>9} | {'req/s':>8} | {'vs serial':>9}")
+    print("-" * 48)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            for concorrencia in args.niveis:
+                duracao = await executar_nivel(client, concorrencia)
+                serial = concorrencia * args.latencia
+                print(f"{concorrencia:>12} | {duracao:>9.2f} | {concorrencia / duracao:>8.1f} | {serial / duracao:>8.1f}x")
+
+    servidor.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência do /api/v1/consulta")
+    parser.add_argument("--latencia", type=float, default=0.5, help="Latência simulada do provedor (s)")
+    parser.add_argument("--niveis", type=int, nargs="+", default=[1, 4, 16, 64], help="Níveis de concorrência")
+    parser.add_argument("--porta", type=int, default=8089, help="Porta do provedor mock")
+    asyncio.run(main(parser.parse_args()))
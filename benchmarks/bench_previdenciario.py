@@ -0,0 +1,94 @@
+# benchmarks/bench_previdenciario.py
+"""
+Benchmark offline das rotas /api/v1/previdenciario/* com o provedor mock.
+
+Com AI_PROVIDER=mock e latência zero, o tempo medido é só o do nosso
+pipeline: montagem do prompt, pós-processamento (placeholders, pedidos,
+disclaimer) e, na rota de PDF, a geração do arquivo. Não usa rede nem chave.
+
+Uso:
+    python -m benchmarks.bench_previdenciario --repeticoes 20 --tokens 1500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TIPOS = [
+    "aposentadoria-invalidez", "revisao-vida-toda", "aposentadoria-tempo-contribuicao",
+    "auxilio-doenca", "pensao-morte", "aposentadoria-especial", "bpc-loas",
+    "aposentadoria-rural", "salario-maternidade", "revisao-beneficio"
+]
+
+DADOS = {
+    "tipo_beneficio": "Aposentadoria",
+    "der": "10/01/2024",
+    "motivo_recusa": "Falta de tempo de contribuição",
+    "nome": "Maria da Silva",
+    "cpf": "123.456.789-09",
+    "endereco_completo": "Rua das Flores, 100, Centro, Juazeiro do Norte/CE",
+    "tempo_contribuicao_total": 380,
+    "historico_laboral": "Auxiliar de produção em indústria metalúrgica",
+    "informacoes_medicas": "Lombalgia crônica com limitação funcional",
+    "cid_principal": "M54.5",
+    "laudos_medicos": ["Laudo ortopédico 2023"],
+    "atividade_especial": True,
+    "exposicao_agentes_nocivos": "Ruído acima de 85 dB",
+    "valor_causa": 45000.0
+}
+
+
+def percentil(amostras, p: float) -> float:
+    ordenadas = sorted(amostras)
+    return ordenadas[min(len(ordenadas) - 1, int(round(p * (len(ordenadas) - 1))))]
+
+
+async def medir_rota(client, url: str, repeticoes: int):
+    duracoes = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resposta = await client.post(url, json=DADOS, headers={"X-Cache-Bypass": "1"})
+        duracoes.append((time.perf_counter() - inicio) * 1000)
+        if resposta.status_code != 200:
+            print(f"  ⚠️ {url}: {resposta.status_code} {resposta.text[:200]}")
+            break
+    return duracoes
+
+
+async def main(args):
+    # Configurar antes de importar a aplicação
+    os.environ["AI_PROVIDER"] = "mock"
+    os.environ["MOCK_TOKENS_RESPOSTA"] = str(args.tokens)
+    os.environ["MOCK_LATENCIA_PRIMEIRO_TOKEN"] = "0"
+    os.environ["MOCK_LATENCIA_POR_TOKEN"] = "0"
+    os.environ["PDF_OUTPUT_DIR"] = tempfile.mkdtemp(prefix="bench_pdfs_")
+
+    import httpx
+    from app.main import app
+
+    print(f"{'rota':48} {'p50 ms':>8} {'p95 ms':>8} {'média ms':>9}")
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for tipo in TIPOS:
+                for url in (f"/api/v1/previdenciario/peticao-{tipo}", f"/api/v1/previdenciario/peticao-pdf/{tipo}"):
+                    if not args.pdf and "peticao-pdf" in url:
+                        continue
+                    duracoes = await medir_rota(client, url, args.repeticoes)
+                    if duracoes:
+                        print(f"{url.replace('/api/v1/previdenciario/', ''):48} "
+                              f"{percentil(duracoes, 0.5):>8.1f} {percentil(duracoes, 0.95):>8.1f} "
+                              f"{statistics.mean(duracoes):>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline do pipeline previdenciário")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=1500, help="Tamanho da resposta do provedor mock")
+    parser.add_argument("--sem-pdf", dest="pdf", action="store_false", help="Não medir as rotas de PDF")
+    asyncio.run(main(parser.parse_args()))
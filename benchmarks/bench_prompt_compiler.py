@@ -0,0 +1,87 @@
+# benchmarks/bench_prompt_compiler.py
+"""
+Benchmark dos templates de prompt pré-compilados.
+
+Para cada template registrado compara o texto original (indentado, como os
+f-strings montavam) com o texto compilado/minificado:
+- tokens enviados ao provedor (tokenizador local)
+- tempo de montagem do prompt
+
+Os prompts previdenciários são medidos já envolvidos pela persona
+especializada, que é o que de fato vai para o provedor.
+
+Uso:
+    python -m benchmarks.bench_prompt_compiler --repeticoes 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.prompt_compiler import prompt_registry, contar_tokens
+from app.services import ai_prompts  # noqa: F401 - registra os templates do AIService
+from app.modules.previdenciario.prompts import PERSONA_TAREFA
+
+
+def valores_exemplo(template) -> dict:
+    """Valores fictícios para cada slot (número quando o slot tem formato numérico)"""
+    valores = {}
+    for _, campo, formato in template._partes:
+        if campo is None:
+            continue
+        valores[campo] = 45678.9 if formato.endswith("f") else f"<{campo}>"
+    return valores
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Tempo médio por chamada em microssegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1_000_000
+
+
+def main(args):
+    print(f"{'template':48} {'tok antes':>9} {'tok depois':>10} {'economia':>9} {'µs antes':>9} {'µs depois':>9}")
+
+    total_antes = total_depois = 0
+    for nome in prompt_registry.listar():
+        template = prompt_registry.obter(nome)
+        if template is PERSONA_TAREFA:
+            continue
+        valores = valores_exemplo(template)
+
+        if nome.startswith("previdenciario."):
+            def antes():
+                return PERSONA_TAREFA.preencher_fonte(tarefa=template.preencher_fonte(**valores))
+
+            def depois():
+                return PERSONA_TAREFA.preencher(tarefa=template.preencher(**valores))
+        else:
+            def antes():
+                return template.preencher_fonte(**valores)
+
+            def depois():
+                return template.preencher(**valores)
+
+        tokens_antes = contar_tokens(antes())
+        tokens_depois = contar_tokens(depois())
+        total_antes += tokens_antes
+        total_depois += tokens_depois
+        economia = 100 * (tokens_antes - tokens_depois) / tokens_antes
+
+        print(
+            f"{nome:48} {tokens_antes:>9} {tokens_depois:>10} {economia:>8.1f}% "
+            f"{medir(antes, args.repeticoes):>9.1f} {medir(depois, args.repeticoes):>9.1f}"
+        )
+
+    print(f"\nTotal: {total_antes} → {total_depois} tokens "
+          f"({100 * (total_antes - total_depois) / total_antes:.1f}% a menos por rodada de prompts)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos templates de prompt compilados")
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,131 @@
+# benchmarks/bench_substituicao.py
+"""
+Benchmark do preenchimento de placeholders e da remoção da assinatura da IA
+nas petições previdenciárias.
+
+Compara, em petições de 15 a 30 KB (texto do provedor mock com os
+placeholders que os modelos costumam deixar espalhados pelo corpo):
+- antes: str.replace de cada chave da tabela em ordem + um re.sub por padrão
+  de assinatura (cada passo relê e copia o texto inteiro)
+- depois: PrevidenciarioService._preencher_template + _remover_assinatura_ia
+  (o mesmo replace em ordem; cada padrão de assinatura só é tentado onde
+  aparece o trecho literal com que começa - RemocaoSequencial)
+e confere se as saídas são iguais.
+
+Uso:
+    python -m benchmarks.bench_substituicao --peticoes 50 --repeticoes 20
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AI_PROVIDER", "mock")
+
+from app.modules.previdenciario.schemas import DadosPrevidenciarios
+from app.modules.previdenciario.service import PrevidenciarioService, _ASSINATURA_IA
+from app.services.providers.mock_provider import MockProvider
+
+# Placeholders e vícios de redação vistos nas respostas dos modelos
+PLACEHOLDERS = [
+    "[INSERIR NOME DO REQUERENTE]", "CPF nº [inserir número]", "RG nº [número do RG]", "[INSERIR DER]",
+    "residente e domiciliado na [inserir endereço completo]", "[INSERIR ENDEREÇO DO INSS]", "[INSERIR VALOR]",
+    "[nacionalidade]", "[estado civil]", "[profissão]", "XXX", "30 meses de contribuição", "com sede na [INSERIR ENDEREÇO]",
+    "[INSERIR CIDADE/ESTADO]", "NOME DO REQUERENTE", "(valor a ser calculado conforme a planilha anexa)",
+]
+ENCERRAMENTOS = [
+    "Atenciosamente,\n[NOME DO ADVOGADO]\nOAB/[UF] [NÚMERO]",
+    "[Local], [data]\n\n_________________________________\n[NOME DO ADVOGADO]\nOAB/[INSERIR UF] [Nº DA INSCRIÇÃO NA OAB]",
+    "Local e data\n\nDr. [NOME DO ADVOGADO]\nOAB/UF nº _________",
+]
+
+DADOS = DadosPrevidenciarios(
+    tipo_beneficio="Aposentadoria por tempo de contribuição",
+    der="10/01/2024",
+    motivo_recusa="Falta de tempo de contribuição",
+    nome="Maria da Silva",
+    cpf="12345678909",
+    endereco_completo="Rua das Flores, 100, Centro, Juazeiro do Norte/CE",
+    tempo_contribuicao_total=380,
+    historico_laboral="Auxiliar de produção",
+    valor_causa=45000.0,
+    tutela_antecipada=False
+)
+
+
+def gerar_peticoes(quantidade: int, semente: int):
+    """Petições do provedor mock entre 15 e 30 KB, com placeholders no corpo (~1 por KB)"""
+    rng = random.Random(semente)
+    provedor = MockProvider()
+    provedor.tokens_resposta = 10 ** 6
+    provedor.tokens_cauda = 0
+    peticoes = []
+    for i in range(quantidade):
+        alvo = rng.randint(15, 30) * 1024
+        # ~8 caracteres por palavra no vocabulário do mock
+        texto = provedor._gerar_texto("mock", [{"role": "user", "content": f"peticao {i}"}], alvo // 8)
+        corpo, _, _ = texto.rpartition("\n\nNestes termos")
+        palavras = corpo.split(" ")
+        for _ in range(alvo // 1024):
+            palavras.insert(rng.randrange(40, len(palavras)), rng.choice(PLACEHOLDERS))
+        peticoes.append(" ".join(palavras) + "\n\nNestes termos, pede deferimento.\n\n" + rng.choice(ENCERRAMENTOS))
+    return peticoes
+
+
+def sequencial(service: PrevidenciarioService, texto: str) -> str:
+    """Como era: um str.replace por chave e um re.sub por padrão de assinatura"""
+    for chave, valor in service._tabela_preenchimento(DADOS).items():
+        texto = texto.replace(chave, valor)
+    for padrao in _ASSINATURA_IA.regras.values():
+        texto = re.sub(padrao, "", texto, flags=re.MULTILINE | re.IGNORECASE)
+    return texto.strip()
+
+
+def em_ordem(service: PrevidenciarioService, texto: str) -> str:
+    return service._remover_assinatura_ia(service._preencher_template(texto, DADOS))
+
+
+def medir(funcao, texto: str, repeticoes: int) -> float:
+    """Mediana em microssegundos"""
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(texto)
+        amostras.append((time.perf_counter() - inicio) * 1_000_000)
+    return statistics.median(amostras)
+
+
+def main(args):
+    service = PrevidenciarioService()
+    peticoes = gerar_peticoes(args.peticoes, args.semente)
+    em_ordem(service, peticoes[0])  # aquecimento (tabela, padrões de assinatura)
+
+    por_faixa = {}
+    iguais = 0
+    for texto in peticoes:
+        antes = medir(lambda t: sequencial(service, t), texto, args.repeticoes)
+        depois = medir(lambda t: em_ordem(service, t), texto, args.repeticoes)
+        faixa = f"{len(texto) // 5120 * 5}-{len(texto) // 5120 * 5 + 5} KB"
+        por_faixa.setdefault(faixa, []).append((antes, depois))
+        iguais += sequencial(service, texto) == em_ordem(service, texto)
+
+    print(f"{'tamanho':10} {'petições':>8} {'µs antes':>9} {'µs depois':>10} {'speedup':>8}")
+    for faixa in sorted(por_faixa, key=lambda f: int(f.split("-")[0])):
+        medidas = por_faixa[faixa]
+        antes = statistics.median(m[0] for m in medidas)
+        depois = statistics.median(m[1] for m in medidas)
+        print(f"{faixa:10} {len(medidas):>8} {antes:>9.0f} {depois:>10.0f} {antes / depois:>7.1f}x")
+    print(f"\nSaídas iguais ao replace em sequência: {iguais}/{len(peticoes)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do preenchimento de placeholders e da remoção de assinatura")
+    parser.add_argument("--peticoes", type=int, default=50)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--semente", type=int, default=42)
+    main(parser.parse_args())
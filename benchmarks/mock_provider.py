@@ -0,0 +1,94 @@
+# benchmarks/mock_provider.py - PROVEDOR LOCAL COMPATÍVEL COM A API DA OPENAI
+"""
+Servidor HTTP local que imita o endpoint /v1/chat/completions da OpenAI.
+Usado pelos benchmarks para medir o pipeline sem rede e sem custo.
+"""
+import asyncio
+import json
+import threading
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def criar_app_mock(latencia: float = 0.5, tokens_resposta: int = 200) -> FastAPI:
+    """Cria a aplicação mock com latência fixa por completion"""
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        corpo = await request.json()
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in corpo.get("messages", []))
+
+        if corpo.get("stream"):
+            return StreamingResponse(
+                _transmitir_chunks(corpo.get("model", "mock"), prompt_tokens),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(latencia)
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": corpo.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "Resposta simulada. " * (tokens_resposta // 3)},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": tokens_resposta,
+                "total_tokens": prompt_tokens + tokens_resposta
+            }
+        }
+
+    async def _transmitir_chunks(modelo: str, prompt_tokens: int):
+        # Primeiro token rápido, restante distribuído ao longo da latência total
+        pausa = latencia / max(tokens_resposta, 1)
+        for i in range(tokens_resposta):
+            await asyncio.sleep(pausa)
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": modelo,
+                "choices": [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+
+        final = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": modelo,
+            "choices": [],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": tokens_resposta,
+                "total_tokens": prompt_tokens + tokens_resposta
+            }
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return app
+
+
+def iniciar_mock_em_thread(porta: int = 8089, latencia: float = 0.5, tokens_resposta: int = 200) -> uvicorn.Server:
+    """Sobe o provedor mock em uma thread e aguarda ficar pronto"""
+    config = uvicorn.Config(
+        criar_app_mock(latencia, tokens_resposta),
+        host="127.0.0.1",
+        port=porta,
+        log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.05)
+    return server
@@ -0,0 +1,35 @@
+# tests/test_similares.py - PARÁFRASES NEGADAS NÃO REAPROVEITAM A RESPOSTA
+import os
+
+os.environ.setdefault("AI_PROVIDER", "mock")
+
+import pytest
+
+from app.core.config import settings
+from app.services.similar_questions import IndiceSimilares, jaccard, shingles
+
+PARES_OPOSTOS = [
+    ("Aposentadoria por idade com carência cumprida", "Aposentadoria por idade sem carência cumprida"),
+    ("Posso receber auxílio-doença e trabalhar ao mesmo tempo?", "Não posso receber auxílio-doença e trabalhar ao mesmo tempo?"),
+    ("O INSS pode cortar o BPC de quem tem renda?", "O INSS nunca pode cortar o BPC de quem tem renda?"),
+]
+
+
+@pytest.mark.parametrize("original,negada", PARES_OPOSTOS)
+def test_parafrase_negada_fica_abaixo_do_limiar(original, negada):
+    indice = IndiceSimilares()
+    indice.adicionar("previdenciario", None, original, "resposta do original")
+    assert indice.buscar("previdenciario", None, negada) is None
+    assert indice.buscar("previdenciario", None, original)["resposta"] == "resposta do original"
+
+
+@pytest.mark.parametrize("original,negada", PARES_OPOSTOS)
+def test_palavras_de_polaridade_entram_nos_shingles(original, negada):
+    assert jaccard(shingles(original), shingles(negada)) < 1.0
+
+
+def test_parafrase_com_mesma_polaridade_ainda_reaproveita():
+    indice = IndiceSimilares()
+    indice.adicionar("previdenciario", None, "Qual o prazo para recorrer do INSS sem advogado?", "resposta")
+    similar = indice.buscar("previdenciario", None, "qual o prazo pra recorrer no INSS sem advogado")
+    assert similar is not None and similar["similaridade"] >= settings.similares_limiar
@@ -0,0 +1,124 @@
+# tests/test_substituicao.py - PREENCHIMENTO E REMOÇÃO DE ASSINATURA x SEQUÊNCIA ORIGINAL
+"""
+O preenchimento de placeholders e a remoção da assinatura da IA têm de dar
+exatamente o que dava a sequência original: str.replace de cada chave da
+tabela em ordem e um re.sub por padrão de assinatura, em ordem.
+"""
+import os
+import random
+import re
+
+os.environ.setdefault("AI_PROVIDER", "mock")
+
+import pytest
+
+from app.modules.previdenciario.schemas import DadosPrevidenciarios
+from app.modules.previdenciario.service import PrevidenciarioService, PeticaoIncremental, _ASSINATURA_IA
+from app.utils.substituicao import RemocaoSequencial
+
+service = PrevidenciarioService()
+
+
+def _dados(**campos) -> DadosPrevidenciarios:
+    base = dict(
+        tipo_beneficio="Aposentadoria por tempo de contribuição",
+        der="10/01/2024",
+        motivo_recusa="Falta de tempo de contribuição",
+        nome="Maria da Silva",
+        cpf="12345678909",
+        endereco_completo="Rua das Flores, 100, Centro, Icó/CE",
+        tempo_contribuicao_total=380,
+        historico_laboral="Auxiliar de produção",
+        valor_causa=45000.0,
+        tutela_antecipada=False
+    )
+    base.update(campos)
+    return DadosPrevidenciarios(**base)
+
+
+DADOS = [
+    _dados(),
+    _dados(endereco_completo="Av. Paulista, 1000, São Paulo/SP", tempo_contribuicao_total=30),
+    _dados(endereco_completo="", tempo_contribuicao_total=None, tutela_antecipada=True),
+]
+
+
+def preencher_antigo(texto: str, dados: DadosPrevidenciarios) -> str:
+    """Como era: um str.replace por chave da tabela, em ordem"""
+    if dados.tutela_antecipada and "tutela antecipada" not in texto.lower():
+        texto = service._inserir_tutela_antecipada(texto, dados.tipo_beneficio)
+    for chave, valor in service._tabela_preenchimento(dados).items():
+        texto = texto.replace(chave, valor)
+    return texto
+
+
+def remover_antigo(texto: str) -> str:
+    """Como era: um re.sub por padrão de assinatura, em ordem"""
+    for padrao in _ASSINATURA_IA.regras.values():
+        texto = re.sub(padrao, "", texto, flags=re.MULTILINE | re.IGNORECASE)
+    return texto.strip()
+
+
+def _pecas(dados: DadosPrevidenciarios) -> list:
+    """Chaves, valores, pedaços de chaves e trechos de assinatura para montar textos que formam cadeias"""
+    tabela = service._tabela_preenchimento(dados)
+    pecas = list(tabela) + list(tabela.values())
+    for chave in tabela:
+        meio = len(chave) // 2
+        pecas += [chave[:meio], chave[meio:]]
+    pecas += [
+        "Atenciosamente,", "Dr. ", "OAB/CE ", "OAB/SP ", "[NÚMERO]", "[NÚMERO OAB]", "Icó/CE, 10 de janeiro de 2024",
+        "ATENCIOSAMENTE,", "dr. [nome do advogado]", "ſ", "ı", "X", "_", "\n", "\n\n", " ", ", ", "petição", "INSS"
+    ]
+    return pecas
+
+
+@pytest.mark.parametrize("texto", [
+    "Icó/CE, 10 de janeiro de 2024\n\nAtenciosamente,\nDr. [NOME DO ADVOGADO]\nOAB/CE [NÚMERO]",
+    "[Local], [Data]\n_____________\nNOME DO ADVOGADO\nOAB/UF nº ___",
+    "Nestes termos,\npede deferimento.\n\nXXXXXXX\nOAB/XX nº XXXX",
+    "CAMPO A PREENCHER_____________\nDr. [NOME DO ADVOGADO]_\nDr. [NOME DO ADVOGADO]",
+])
+@pytest.mark.parametrize("dados", DADOS)
+def test_cadeias_conhecidas(texto, dados):
+    preenchido = service._preencher_template(texto, dados)
+    assert preenchido == preencher_antigo(texto, dados)
+    assert service._remover_assinatura_ia(preenchido) == remover_antigo(preenchido)
+
+
+@pytest.mark.parametrize("dados", DADOS)
+def test_textos_aleatorios(dados):
+    rng = random.Random(2024)
+    pecas = _pecas(dados)
+    for _ in range(2000):
+        texto = "".join(rng.choice(pecas) for _ in range(rng.randint(1, 30)))
+        preenchido = service._preencher_template(texto, dados)
+        assert preenchido == preencher_antigo(texto, dados), texto
+        assert service._remover_assinatura_ia(preenchido) == remover_antigo(preenchido), preenchido
+
+
+def test_remocao_sem_ignorecase_e_sem_ancora():
+    remocao = RemocaoSequencial({"a": r"[0-9]+x", "b": r"foo\s*bar"})
+    texto = "12x foo\n bar 1x2xfoobar"
+    esperado = re.sub(r"foo\s*bar", "", re.sub(r"[0-9]+x", "", texto))
+    assert remocao.aplicar(texto) == esperado
+
+
+@pytest.mark.parametrize("dados", DADOS)
+def test_stream_igual_ao_texto_inteiro(dados):
+    rng = random.Random(11)
+    corpo = " ".join(rng.choice(["o segurado", "requer", "[INSERIR DER]", "XXX", "nos termos da lei", "30 meses"]) for _ in range(600))
+    for fim in (
+        "Icó/CE, 10 de janeiro de 2024\n\nAtenciosamente,\nDr. [NOME DO ADVOGADO]\nOAB/CE [NÚMERO]",
+        "[Local], [Data]\n_____________\nNOME DO ADVOGADO\nOAB/UF nº ___",
+    ):
+        texto = f"{corpo}\n\nNestes termos,\npede deferimento.\n\n{fim}"
+        incremental = PeticaoIncremental(service, dados)
+        saida = []
+        posicao = 0
+        while posicao < len(texto):
+            passo = rng.randint(1, 40)
+            saida.append(incremental.alimentar(texto[posicao:posicao + passo]))
+            posicao += passo
+        saida.append(incremental.finalizar())
+        assert "".join(saida) == service._pos_processar(texto, dados)